@@ -0,0 +1,4 @@
+"""Battle calculations for Pokemon data.
+
+タイプ相性など、対戦で使う計算をポケモンデータ全体に対してまとめて行うモジュール群。
+"""
@@ -0,0 +1,386 @@
+"""ダメージ計算のバッチエンジン.
+
+攻撃側×防御側×技のダメージ範囲（乱数85〜100%）を、NumPyのブロードキャストで
+まとめて計算します。全ポケモン×全ポケモン×全技のような大きな格子は、要素数が
+上限を超えないよう攻撃側を分割したブロック単位で順に計算します。
+
+計算式は第5世代以降のもの:
+
+    基礎 = floor(floor(floor(2 × レベル / 5 + 2) × 威力 × 攻撃 / 防御) / 50) + 2
+    ダメージ = 基礎 × 乱数(85〜100)/100 → タイプ一致補正（五捨五超入）→ タイプ相性（切り捨て）
+
+急所・天候・特性・持ち物・ランク補正などは考慮しない。威力が定まらない技
+（power が NULL）と変化技は計算対象外とする。
+
+Example:
+    calculator = DamageCalculator.from_csv_dir(Path("data/csv_files"))
+    result = calculator.damage_range("ガブリアス", "じしん")
+    result.max_percent()  # 全ポケモンに対する最大ダメージ割合
+"""
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+from app.query.tables import Tables, load_tables_from_builder, load_tables_from_csv
+
+from .stats import StatSpec, calc_hp, calc_stat
+from .type_chart import TYPE_CHART, TYPE_INDEX
+
+# damage_class -> 攻撃・防御に使う能力の列（0: 物理 = 攻撃/防御, 1: 特殊 = 特攻/特防）
+_DAMAGE_CLASSES = {"physical": 0, "special": 1}
+
+# 1ブロックあたりの最大要素数（攻撃側×防御側×技）。int64の中間配列数本で数百MB以内に収まる
+DEFAULT_BLOCK_ELEMENTS = 2_000_000
+
+# 既定の計算条件（攻撃側は攻撃努力値252・補正あり、防御側は無振り）
+DEFAULT_ATTACKER_SPEC = StatSpec(ev=252, nature=1.1)
+DEFAULT_DEFENDER_SPEC = StatSpec()
+
+
+@dataclass(frozen=True, slots=True)
+class DamageBlock:
+    """ダメージ計算結果のブロック.
+
+    各配列の形は (攻撃側数, 防御側数, 技数)。
+
+    Attributes:
+        attackers: 攻撃側の行インデックス
+        defenders: 防御側の行インデックス
+        moves: 技の行インデックス
+        min_damage: 最低乱数（85%）のダメージ
+        max_damage: 最高乱数（100%）のダメージ
+        defender_hp: 防御側のHP実数値（防御側数,）
+    """
+
+    attackers: np.ndarray
+    defenders: np.ndarray
+    moves: np.ndarray
+    min_damage: np.ndarray
+    max_damage: np.ndarray
+    defender_hp: np.ndarray
+
+    def min_percent(self) -> np.ndarray:
+        """最低ダメージの防御側HPに対する割合（%）を返す."""
+        return self.min_damage * 100.0 / self.defender_hp[None, :, None]
+
+    def max_percent(self) -> np.ndarray:
+        """最高ダメージの防御側HPに対する割合（%）を返す."""
+        return self.max_damage * 100.0 / self.defender_hp[None, :, None]
+
+    def guaranteed_ko(self) -> np.ndarray:
+        """最低乱数でも一撃で倒せる組み合わせのマスクを返す."""
+        return self.min_damage >= self.defender_hp[None, :, None]
+
+
+class DamageCalculator:
+    """ダメージ計算エンジン.
+
+    ポケモン・技を行インデックスで扱い、種族値・タイプ・技の威力と分類を配列で保持する。
+    """
+
+    def __init__(self, tables: Tables) -> None:
+        """初期化.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（tables.py の形式）
+        """
+        pokemon_columns = {column: i for i, column in enumerate(TABLE_COLUMNS["pokemon"])}
+        pokemon_rows = tables["pokemon"]
+
+        def pokemon_column(name: str) -> list:
+            i = pokemon_columns[name]
+            return [row[i] for row in pokemon_rows]
+
+        self.pokemon_names: list[str] = pokemon_column("name_ja")
+        self.pokemon_index: dict[str, int] = {name: i for i, name in enumerate(self.pokemon_names)}
+        # 種族値 (ポケモン数, 6): HP, 攻撃, 防御, 特攻, 特防, 素早さ
+        self.base_stats = np.array(
+            [
+                pokemon_column(name)
+                for name in ("base_hp", "base_atk", "base_def", "base_spa", "base_spd", "base_spe")
+            ],
+            dtype=np.int32,
+        ).T
+        # タイプ (ポケモン数, 2)。単タイプのタイプ2は相性表の範囲外のインデックス（18）
+        no_type = len(TYPE_INDEX)
+        self.pokemon_types = np.array(
+            [
+                (TYPE_INDEX[primary], no_type if secondary is None else TYPE_INDEX[secondary])
+                for primary, secondary in zip(
+                    pokemon_column("type_primary"), pokemon_column("type_secondary"), strict=True
+                )
+            ],
+            dtype=np.intp,
+        ).reshape(-1, 2)
+
+        move_columns = {column: i for i, column in enumerate(TABLE_COLUMNS["moves"])}
+        damaging_moves = [
+            row
+            for row in tables["moves"]
+            if row[move_columns["damage_class"]] in _DAMAGE_CLASSES
+            and row[move_columns["power"]] is not None
+        ]
+        self.move_names: list[str] = [row[move_columns["name_ja"]] for row in damaging_moves]
+        self.move_index: dict[str, int] = {name: i for i, name in enumerate(self.move_names)}
+        self.move_power = np.array(
+            [row[move_columns["power"]] for row in damaging_moves], dtype=np.int64
+        )
+        self.move_class = np.array(
+            [_DAMAGE_CLASSES[row[move_columns["damage_class"]]] for row in damaging_moves],
+            dtype=np.intp,
+        )
+        self.move_type = np.array(
+            [TYPE_INDEX[row[move_columns["type_name"]]] for row in damaging_moves], dtype=np.intp
+        )
+
+        # 防御側から見た相性表（[防御タイプ, 攻撃タイプ]）。タイプ2なしの行は全て等倍
+        self._defense_chart = np.vstack([TYPE_CHART.T, np.ones(len(TYPE_INDEX), dtype=np.float32)])
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path) -> "DamageCalculator":
+        """CSV生成ツールの出力ディレクトリから構築する."""
+        return cls(load_tables_from_csv(csv_dir))
+
+    @classmethod
+    def from_builder(cls, builder: CSVBuilder) -> "DamageCalculator":
+        """collect_data() 済みのCSVBuilderから構築する."""
+        return cls(load_tables_from_builder(builder))
+
+    # ========================================
+    # 計算
+    # ========================================
+
+    def damage_range(
+        self,
+        attacker: str,
+        move: str,
+        defenders: Sequence[str] | None = None,
+        *,
+        attacker_spec: StatSpec = DEFAULT_ATTACKER_SPEC,
+        defender_hp_spec: StatSpec = DEFAULT_DEFENDER_SPEC,
+        defender_spec: StatSpec = DEFAULT_DEFENDER_SPEC,
+        stab: float = 1.5,
+    ) -> DamageBlock:
+        """1体の攻撃側・1つの技から、防御側全体（既定は全ポケモン）へのダメージを計算する.
+
+        Args:
+            attacker: 攻撃側のポケモン名
+            move: 技名
+            defenders: 防御側のポケモン名（省略時は全ポケモン）
+            attacker_spec: 攻撃側の攻撃/特攻の計算条件
+            defender_hp_spec: 防御側のHPの計算条件
+            defender_spec: 防御側の防御/特防の計算条件
+            stab: タイプ一致補正（テラスタルで一致タイプを強化する場合は2.0）
+
+        Returns:
+            形が (1, 防御側数, 1) のDamageBlock
+        """
+        defender_indexes = (
+            np.arange(len(self.pokemon_names))
+            if defenders is None
+            else self._pokemon_indexes(defenders)
+        )
+        return self.compute_block(
+            self._pokemon_indexes([attacker]),
+            defender_indexes,
+            self._move_indexes([move]),
+            attacker_spec=attacker_spec,
+            defender_hp_spec=defender_hp_spec,
+            defender_spec=defender_spec,
+            stab=stab,
+        )
+
+    def iter_blocks(
+        self,
+        attackers: Sequence[str] | None = None,
+        defenders: Sequence[str] | None = None,
+        moves: Sequence[str] | None = None,
+        *,
+        attacker_spec: StatSpec = DEFAULT_ATTACKER_SPEC,
+        defender_hp_spec: StatSpec = DEFAULT_DEFENDER_SPEC,
+        defender_spec: StatSpec = DEFAULT_DEFENDER_SPEC,
+        stab: float = 1.5,
+        max_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    ) -> Iterator[DamageBlock]:
+        """攻撃側×防御側×技の格子を、要素数の上限を守るブロックに分けて順に計算する.
+
+        攻撃側を分割し、1ブロックの要素数（攻撃側数×防御側数×技数）が max_elements 以下に
+        なるようにする（防御側×技だけで上限を超える場合は攻撃側1体ずつ）。
+
+        Args:
+            attackers: 攻撃側のポケモン名（省略時は全ポケモン）
+            defenders: 防御側のポケモン名（省略時は全ポケモン）
+            moves: 技名（省略時は威力のある全ての攻撃技）
+            attacker_spec: 攻撃側の攻撃/特攻の計算条件
+            defender_hp_spec: 防御側のHPの計算条件
+            defender_spec: 防御側の防御/特防の計算条件
+            stab: タイプ一致補正
+            max_elements: 1ブロックの最大要素数
+
+        Yields:
+            DamageBlock
+        """
+        all_pokemon = np.arange(len(self.pokemon_names))
+        attacker_indexes = all_pokemon if attackers is None else self._pokemon_indexes(attackers)
+        defender_indexes = all_pokemon if defenders is None else self._pokemon_indexes(defenders)
+        move_indexes = (
+            np.arange(len(self.move_names)) if moves is None else self._move_indexes(moves)
+        )
+
+        per_attacker = max(len(defender_indexes) * len(move_indexes), 1)
+        chunk = max(max_elements // per_attacker, 1)
+        for start in range(0, len(attacker_indexes), chunk):
+            yield self.compute_block(
+                attacker_indexes[start : start + chunk],
+                defender_indexes,
+                move_indexes,
+                attacker_spec=attacker_spec,
+                defender_hp_spec=defender_hp_spec,
+                defender_spec=defender_spec,
+                stab=stab,
+            )
+
+    def best_percent(
+        self,
+        attackers: Sequence[str] | None = None,
+        defenders: Sequence[str] | None = None,
+        moves: Sequence[str] | None = None,
+        **options: object,
+    ) -> np.ndarray:
+        """攻撃側×防御側ごとに、技の中で最大の最高ダメージ割合（%）を求める.
+
+        全ポケモン総当たりのように技の次元まで保持できない格子でも、ブロックごとに
+        技の次元を縮約するため、メモリ使用量は (攻撃側数, 防御側数) の結果配列と
+        1ブロック分に収まる。
+
+        Args:
+            attackers: 攻撃側のポケモン名（省略時は全ポケモン）
+            defenders: 防御側のポケモン名（省略時は全ポケモン）
+            moves: 技名（省略時は威力のある全ての攻撃技）
+            **options: iter_blocks() のキーワード引数
+
+        Returns:
+            形が (攻撃側数, 防御側数) の配列
+        """
+        results = [
+            block.max_percent().max(axis=2, initial=0.0)
+            for block in self.iter_blocks(attackers, defenders, moves, **options)
+        ]
+        if not results:
+            return np.zeros((0, 0))
+        return np.concatenate(results, axis=0)
+
+    def compute_block(
+        self,
+        attackers: np.ndarray,
+        defenders: np.ndarray,
+        moves: np.ndarray,
+        *,
+        attacker_spec: StatSpec = DEFAULT_ATTACKER_SPEC,
+        defender_hp_spec: StatSpec = DEFAULT_DEFENDER_SPEC,
+        defender_spec: StatSpec = DEFAULT_DEFENDER_SPEC,
+        stab: float = 1.5,
+    ) -> DamageBlock:
+        """行インデックスで指定した攻撃側×防御側×技のダメージを計算する.
+
+        Args:
+            attackers: 攻撃側の行インデックス
+            defenders: 防御側の行インデックス
+            moves: 技の行インデックス
+            attacker_spec: 攻撃側の攻撃/特攻の計算条件（レベルはダメージ計算式にも使う）
+            defender_hp_spec: 防御側のHPの計算条件
+            defender_spec: 防御側の防御/特防の計算条件
+            stab: タイプ一致補正
+
+        Returns:
+            DamageBlock
+        """
+        move_class = self.move_class[moves]
+        move_type = self.move_type[moves]
+
+        # 攻撃 (攻撃側数, 技数) / 防御 (防御側数, 技数): 技の分類で攻撃/特攻・防御/特防を選ぶ
+        attacker_base = self.base_stats[attackers]
+        attack_stats = np.stack(
+            [
+                calc_stat(attacker_base[:, 1], attacker_spec),
+                calc_stat(attacker_base[:, 3], attacker_spec),
+            ],
+            axis=1,
+        )[:, move_class].astype(np.int64)
+        defender_base = self.base_stats[defenders]
+        defense_stats = np.stack(
+            [
+                calc_stat(defender_base[:, 2], defender_spec),
+                calc_stat(defender_base[:, 4], defender_spec),
+            ],
+            axis=1,
+        )[:, move_class].astype(np.int64)
+        defender_hp = calc_hp(defender_base[:, 0], defender_hp_spec)
+
+        level_factor = 2 * attacker_spec.level // 5 + 2
+        base_damage = (
+            level_factor
+            * self.move_power[moves][None, None, :]
+            * attack_stats[:, None, :]
+            // defense_stats[None, :, :]
+            // 50
+            + 2
+        )
+
+        # タイプ一致 (攻撃側数, 技数): 4096分率で五捨五超入（0.5ちょうどは切り捨て）
+        attacker_types = self.pokemon_types[attackers]
+        is_stab = (attacker_types[:, 0:1] == move_type[None, :]) | (
+            attacker_types[:, 1:2] == move_type[None, :]
+        )
+        stab_4096 = round(stab * 4096)
+
+        # タイプ相性 (防御側数, 技数) を4倍した整数で持ち、切り捨てを整数演算で行う
+        defender_types = self.pokemon_types[defenders]
+        multiplier = (
+            self._defense_chart[defender_types[:, 0]][:, move_type]
+            * self._defense_chart[defender_types[:, 1]][:, move_type]
+        )
+        multiplier_x4 = np.rint(multiplier * 4).astype(np.int64)[None, :, :]
+
+        def finish(random_percent: int) -> np.ndarray:
+            damage = base_damage * random_percent // 100
+            damage = np.where(is_stab[:, None, :], (damage * stab_4096 + 2047) // 4096, damage)
+            damage = damage * multiplier_x4 // 4
+            # 相性が無効でなければ最低1ダメージ
+            damage = np.where((damage == 0) & (multiplier_x4 > 0), 1, damage)
+            return damage.astype(np.int32)
+
+        return DamageBlock(
+            attackers=np.asarray(attackers),
+            defenders=np.asarray(defenders),
+            moves=np.asarray(moves),
+            min_damage=finish(85),
+            max_damage=finish(100),
+            defender_hp=defender_hp,
+        )
+
+    # ========================================
+    # 内部処理
+    # ========================================
+
+    def _pokemon_indexes(self, names: Sequence[str]) -> np.ndarray:
+        """ポケモン名を行インデックスに変換する. 未知の名前の場合はKeyErrorを送出する."""
+        return np.array(
+            [_lookup(self.pokemon_index, name, "ポケモン") for name in names], dtype=np.intp
+        )
+
+    def _move_indexes(self, names: Sequence[str]) -> np.ndarray:
+        """技名を行インデックスに変換する. 計算対象外の技の場合はKeyErrorを送出する."""
+        return np.array([_lookup(self.move_index, name, "攻撃技") for name in names], dtype=np.intp)
+
+
+def _lookup(name_to_index: dict[str, int], name: str, label: str) -> int:
+    """名前から行インデックスを引く. 未知の名前の場合はKeyErrorを送出する."""
+    if name not in name_to_index:
+        msg = f"未知の{label}です: {name}"
+        raise KeyError(msg)
+    return name_to_index[name]
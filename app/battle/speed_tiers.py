@@ -0,0 +1,167 @@
+"""素早さ順（スピードティア）表.
+
+全ポケモン×素早さプリセット（最速・準速・無振り・最遅・スカーフ）の実数値を一括計算し、
+素早さでソートした表を作ります。「Xより速い/遅いポケモン」は、ソート済み配列に対する
+二分探索とスライスで求まります。
+
+Example:
+    tiers = SpeedTierTable.from_csv_dir(Path("data/csv_files"))
+    # 最速ガブリアス（169）を抜ける準速以上のポケモン
+    tiers.faster_than(tiers.speed("ガブリアス", "fastest"), presets=("max", "fastest"))
+"""
+
+import csv
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+from app.query.tables import Tables, load_tables_from_builder, load_tables_from_csv
+
+from .stats import SPEED_PRESETS, SpeedPreset, calc_speed
+
+# 出力CSVのカラム定義（sv.speed_tiers と同じ）
+SPEED_TIER_COLUMNS: tuple[str, ...] = ("pokemon_id", "preset", "speed")
+
+
+@dataclass(frozen=True, slots=True)
+class SpeedTier:
+    """素早さ順表の1行."""
+
+    pokemon_id: int
+    name_ja: str
+    preset: str
+    speed: int
+
+
+class SpeedTierTable:
+    """素早さ順表.
+
+    (ポケモン, プリセット) の全組み合わせを素早さの昇順に並べた配列で保持する。
+    """
+
+    def __init__(self, tables: Tables, presets: Mapping[str, SpeedPreset] = SPEED_PRESETS) -> None:
+        """初期化.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（tables.py の形式）
+            presets: プリセット名 -> 素早さプリセット
+        """
+        columns = TABLE_COLUMNS["pokemon"]
+        rows = tables["pokemon"]
+        ids = np.array([row[columns.index("id")] for row in rows], dtype=np.int32)
+        base_spe = np.array([row[columns.index("base_spe")] for row in rows], dtype=np.int32)
+
+        self.presets = dict(presets)
+        self.preset_names: list[str] = list(self.presets)
+        self.pokemon_names: list[str] = [row[columns.index("name_ja")] for row in rows]
+        self._pokemon_index = {name: i for i, name in enumerate(self.pokemon_names)}
+
+        # 実数値 (ポケモン数, プリセット数)
+        self.speed_matrix = np.stack(
+            [calc_speed(base_spe, preset) for preset in self.presets.values()], axis=1
+        ).reshape(len(rows), len(self.presets))
+
+        # 全組み合わせを素早さの昇順（同速はポケモンIDの降順。逆順に読むと速い順・ID順）に並べる
+        pokemon_rows = np.repeat(np.arange(len(rows)), len(self.presets))
+        preset_rows = np.tile(np.arange(len(self.presets)), len(rows))
+        speeds = self.speed_matrix.ravel()
+        order = np.lexsort((-ids[pokemon_rows], speeds))
+        self.speeds = speeds[order]
+        self.ids = ids[pokemon_rows[order]]
+        self._pokemon_rows = pokemon_rows[order]
+        self._preset_rows = preset_rows[order]
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path) -> "SpeedTierTable":
+        """CSV生成ツールの出力ディレクトリから構築する."""
+        return cls(load_tables_from_csv(csv_dir))
+
+    @classmethod
+    def from_builder(cls, builder: CSVBuilder) -> "SpeedTierTable":
+        """collect_data() 済みのCSVBuilderから構築する."""
+        return cls(load_tables_from_builder(builder))
+
+    def __len__(self) -> int:
+        """行数（ポケモン数×プリセット数）を返す."""
+        return len(self.speeds)
+
+    def speed(self, pokemon_name: str, preset: str) -> int:
+        """ポケモン・プリセットの素早さ実数値を返す.
+
+        Raises:
+            KeyError: 未知のポケモン名・プリセット名が指定された場合
+        """
+        if pokemon_name not in self._pokemon_index:
+            msg = f"未知のポケモンです: {pokemon_name}"
+            raise KeyError(msg)
+        return int(
+            self.speed_matrix[self._pokemon_index[pokemon_name], self._preset_position(preset)]
+        )
+
+    def faster_than(self, speed: int, presets: Iterable[str] | None = None) -> list[SpeedTier]:
+        """素早さが speed を上回る（先手を取れる）行を速い順に返す."""
+        start = int(np.searchsorted(self.speeds, speed, side="right"))
+        return self._tiers(range(len(self.speeds) - 1, start - 1, -1), presets)
+
+    def slower_than(self, speed: int, presets: Iterable[str] | None = None) -> list[SpeedTier]:
+        """素早さが speed を下回る（トリックルーム下で先手を取れる）行を遅い順に返す."""
+        end = int(np.searchsorted(self.speeds, speed, side="left"))
+        return self._tiers(range(end), presets)
+
+    def ties(self, speed: int, presets: Iterable[str] | None = None) -> list[SpeedTier]:
+        """素早さが speed と同じ（同速）行を返す."""
+        start = int(np.searchsorted(self.speeds, speed, side="left"))
+        end = int(np.searchsorted(self.speeds, speed, side="right"))
+        return self._tiers(range(start, end), presets)
+
+    def count_faster_than(self, speed: int) -> int:
+        """素早さが speed を上回る行数を返す（二分探索のみ）."""
+        return len(self.speeds) - int(np.searchsorted(self.speeds, speed, side="right"))
+
+    def tiers(self) -> list[SpeedTier]:
+        """全行を速い順に返す."""
+        return self._tiers(range(len(self.speeds) - 1, -1, -1), None)
+
+    def _preset_position(self, preset: str) -> int:
+        """プリセット名を列位置に変換する. 未知の名前の場合はKeyErrorを送出する."""
+        if preset not in self.presets:
+            msg = f"未知のプリセットです: {preset}"
+            raise KeyError(msg)
+        return self.preset_names.index(preset)
+
+    def _tiers(self, positions: Iterable[int], presets: Iterable[str] | None) -> list[SpeedTier]:
+        """位置の列を SpeedTier に変換する（presets 指定時はそのプリセットのみ）."""
+        allowed = None if presets is None else {self._preset_position(preset) for preset in presets}
+        return [
+            SpeedTier(
+                pokemon_id=int(self.ids[i]),
+                name_ja=self.pokemon_names[self._pokemon_rows[i]],
+                preset=self.preset_names[self._preset_rows[i]],
+                speed=int(self.speeds[i]),
+            )
+            for i in positions
+            if allowed is None or self._preset_rows[i] in allowed
+        ]
+
+
+def write_speed_tiers_csv(table: SpeedTierTable, output_path: Path) -> Path:
+    """素早さ順表を速い順のCSVに出力する.
+
+    カラムは sv.speed_tiers と同じ (pokemon_id, preset, speed)。
+
+    Args:
+        table: 素早さ順表
+        output_path: 出力先のCSVファイルパス
+
+    Returns:
+        生成されたファイルパス
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SPEED_TIER_COLUMNS)
+        writer.writerows((tier.pokemon_id, tier.preset, tier.speed) for tier in table.tiers())
+    return output_path
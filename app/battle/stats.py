@@ -0,0 +1,116 @@
+"""実数値（能力値）の計算.
+
+種族値の配列から、レベル・個体値・努力値・性格補正を指定して実数値をまとめて計算します。
+計算式は第3世代以降のもの（端数はすべて切り捨て）です。
+
+    HP   = floor((2 × 種族値 + 個体値 + floor(努力値 / 4)) × レベル / 100) + レベル + 10
+    HP以外 = floor((floor((2 × 種族値 + 個体値 + floor(努力値 / 4)) × レベル / 100) + 5) × 性格補正)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# 性格補正（10倍した整数で扱い、浮動小数点の誤差を避ける）
+_NATURE_TENTHS: dict[float, int] = {0.9: 9, 1.0: 10, 1.1: 11}
+
+
+@dataclass(frozen=True, slots=True)
+class StatSpec:
+    """実数値の計算条件.
+
+    Attributes:
+        level: レベル（1〜100）
+        iv: 個体値（0〜31）
+        ev: 努力値（0〜252）
+        nature: 性格補正（0.9 / 1.0 / 1.1）。HPには適用しない
+    """
+
+    level: int = 50
+    iv: int = 31
+    ev: int = 0
+    nature: float = 1.0
+
+    def __post_init__(self) -> None:
+        """値の範囲を検証する."""
+        if not 1 <= self.level <= 100:
+            msg = f"レベルは1〜100で指定してください: {self.level}"
+            raise ValueError(msg)
+        if not 0 <= self.iv <= 31:
+            msg = f"個体値は0〜31で指定してください: {self.iv}"
+            raise ValueError(msg)
+        if not 0 <= self.ev <= 252:
+            msg = f"努力値は0〜252で指定してください: {self.ev}"
+            raise ValueError(msg)
+        if self.nature not in _NATURE_TENTHS:
+            msg = f"性格補正は 0.9 / 1.0 / 1.1 で指定してください: {self.nature}"
+            raise ValueError(msg)
+
+
+def calc_hp(base: np.ndarray, spec: StatSpec) -> np.ndarray:
+    """HPの実数値を計算する.
+
+    Args:
+        base: HP種族値の配列
+        spec: 計算条件（性格補正は無視する）
+
+    Returns:
+        実数値の配列（int32）
+    """
+    base = np.asarray(base, dtype=np.int32)
+    return (2 * base + spec.iv + spec.ev // 4) * spec.level // 100 + spec.level + 10
+
+
+def calc_stat(base: np.ndarray, spec: StatSpec) -> np.ndarray:
+    """HP以外の実数値を計算する.
+
+    Args:
+        base: 種族値の配列
+        spec: 計算条件
+
+    Returns:
+        実数値の配列（int32）
+    """
+    base = np.asarray(base, dtype=np.int32)
+    raw = (2 * base + spec.iv + spec.ev // 4) * spec.level // 100 + 5
+    return raw * _NATURE_TENTHS[spec.nature] // 10
+
+
+@dataclass(frozen=True, slots=True)
+class SpeedPreset:
+    """素早さの計算プリセット.
+
+    Attributes:
+        label: 表示名
+        spec: 実数値の計算条件
+        item_tenths: 持ち物補正を10倍した整数（こだわりスカーフは15）
+    """
+
+    label: str
+    spec: StatSpec
+    item_tenths: int = 10
+
+
+# 対戦でよく使う素早さのプリセット（レベル50）
+# supabase/migrations の sv.speed_tiers と同じ定義
+SPEED_PRESETS: dict[str, SpeedPreset] = {
+    "fastest": SpeedPreset("最速", StatSpec(ev=252, nature=1.1)),
+    "max": SpeedPreset("準速", StatSpec(ev=252)),
+    "neutral": SpeedPreset("無振り", StatSpec()),
+    "slowest": SpeedPreset("最遅", StatSpec(iv=0, nature=0.9)),
+    "fastest_scarf": SpeedPreset("最速スカーフ", StatSpec(ev=252, nature=1.1), item_tenths=15),
+    "max_scarf": SpeedPreset("準速スカーフ", StatSpec(ev=252), item_tenths=15),
+}
+
+
+def calc_speed(base: np.ndarray, preset: SpeedPreset) -> np.ndarray:
+    """素早さの実数値を持ち物補正込みで計算する.
+
+    Args:
+        base: 素早さ種族値の配列
+        preset: 計算プリセット
+
+    Returns:
+        実数値の配列（int32）
+    """
+    return calc_stat(base, preset.spec) * preset.item_tenths // 10
@@ -0,0 +1,528 @@
+"""チームのカバー範囲・対策ポケモンの探索.
+
+「仮想敵（脅威）のリストに対して、どの6匹のチームが最も多くの脅威に対応できるか」
+「この脅威のリストに対応できるのはどのポケモンか」を求めます。
+
+各ポケモンが各脅威に対して次の条件を満たすかを事前に計算し、脅威の数だけのビットを持つ
+整数（ビットベクトル）として保持します。チームが対応できる脅威はメンバーのビットベクトルの
+OR、対応数はそのビット数です。
+
+- 攻撃（offense）: 覚える攻撃技（威力のある物理・特殊技）のタイプに、脅威へ効果抜群のものがある
+- 防御（defense）: 脅威のタイプ（タイプ一致技のタイプ）をすべて半減以下で受けられる
+- 素早さ（speed）: 素早さ種族値が脅威より高い
+
+最良のチームは分枝限定法で探索します。対応できる脅威の集合が同じ候補は1つのクラスに
+まとめてクラス単位で探索し、上位 k 件を埋めるときにクラスのメンバーへ展開します。
+対応できる脅威の集合が k 匹以上の他の候補の部分集合になっているクラスは除外し、残りの
+枠で増やせる対応数の上限（未対応の脅威に対する増分の大きい順に枠の数だけ足した値）が、
+見つかっている k 番目のチームの対応数以下の枝は探索しません。
+
+Example:
+    search = TeamSearch.from_csv_dir(Path("data/csv_files"), threats=["ガブリアス", "サーフゴー"])
+    search.answers(ANSWER)
+    search.best_teams(k=3, coverage=OFFENSE, workers=4)
+"""
+
+import heapq
+import math
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice, product
+from pathlib import Path
+
+import numpy as np
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+from app.query.tables import Tables, load_tables_from_builder, load_tables_from_csv
+
+from .type_chart import TYPE_INDEX, defense_profiles
+
+# 攻撃技として扱う damage_class（変化技と威力が NULL の技は除く）
+_DAMAGE_CLASSES = frozenset(("physical", "special"))
+
+DEFAULT_TEAM_SIZE = 6
+
+
+@dataclass(frozen=True, slots=True)
+class Coverage:
+    """脅威に「対応できる」とみなす条件（指定した条件をすべて満たす場合に対応できる）.
+
+    Attributes:
+        offense: 脅威に効果抜群の攻撃技を覚える
+        defense: 脅威のタイプ一致技をすべて半減以下で受けられる
+        speed: 素早さ種族値が脅威より高い
+    """
+
+    offense: bool = True
+    defense: bool = False
+    speed: bool = False
+
+    def __post_init__(self) -> None:
+        """条件が1つも指定されていない場合は ValueError を送出する."""
+        if not (self.offense or self.defense or self.speed):
+            msg = "対応の条件を1つ以上指定してください"
+            raise ValueError(msg)
+
+
+OFFENSE = Coverage(offense=True)
+DEFENSE = Coverage(offense=False, defense=True)
+# 効果抜群を取れて、タイプ一致技を半減以下で受けられる（対策ポケモン）
+ANSWER = Coverage(offense=True, defense=True)
+
+
+@dataclass(frozen=True, slots=True)
+class Answer:
+    """脅威に対応できるポケモン.
+
+    Attributes:
+        name_ja: ポケモン名
+        threats: 対応できる脅威（脅威リストの順）
+    """
+
+    name_ja: str
+    threats: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Team:
+    """探索したチーム.
+
+    Attributes:
+        members: メンバー（枠が余った場合は team_size より少ない）
+        covered: 対応できる脅威の数
+        uncovered: 対応できない脅威（脅威リストの順）
+    """
+
+    members: tuple[str, ...]
+    covered: int
+    uncovered: tuple[str, ...]
+
+
+class TeamSearch:
+    """チームのカバー範囲・対策ポケモンの探索エンジン.
+
+    ポケモンの並びは pokemon テーブル（PokemonQueryEngine・DefenseProfiles）と同じため、
+    候補を絞り込む真偽値マスクは PokemonQueryEngine のマスクをそのまま渡せる。
+    """
+
+    def __init__(self, tables: Tables, threats: Sequence[str] | None = None) -> None:
+        """初期化.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（tables.py の形式）
+            threats: 脅威のポケモン名（省略時は全ポケモン）
+
+        Raises:
+            KeyError: 未知のポケモン名が指定された場合
+        """
+        columns = {column: i for i, column in enumerate(TABLE_COLUMNS["pokemon"])}
+        rows = tables["pokemon"]
+        self.pokemon_names: list[str] = [row[columns["name_ja"]] for row in rows]
+        self.pokemon_index: dict[str, int] = {name: i for i, name in enumerate(self.pokemon_names)}
+        self.threat_names: list[str] = (
+            list(threats) if threats is not None else list(self.pokemon_names)
+        )
+        threat_rows = self._indexes(self.threat_names)
+
+        primary = [row[columns["type_primary"]] for row in rows]
+        secondary = [row[columns["type_secondary"]] for row in rows]
+        # (ポケモン数, 18): 攻撃タイプから受ける倍率
+        multipliers = defense_profiles(primary, secondary)
+
+        # 攻撃: (ポケモン数, 18) の攻撃技のタイプ × (18, 脅威数) の効果抜群
+        move_columns = {column: i for i, column in enumerate(TABLE_COLUMNS["moves"])}
+        damaging_types = {
+            row[move_columns["id"]]: TYPE_INDEX[row[move_columns["type_name"]]]
+            for row in tables["moves"]
+            if row[move_columns["damage_class"]] in _DAMAGE_CLASSES
+            and row[move_columns["power"]] is not None
+        }
+        id_to_row = {row[columns["id"]]: i for i, row in enumerate(rows)}
+        move_types = np.zeros((len(rows), len(TYPE_INDEX)), dtype=np.int32)
+        for pokemon_id, move_id in tables["pokemon_moves"]:
+            type_index = damaging_types.get(move_id)
+            if type_index is not None:
+                move_types[id_to_row[pokemon_id], type_index] = 1
+        super_effective = (multipliers[threat_rows] >= 2.0).astype(np.int32)
+        offense = move_types @ super_effective.T > 0
+
+        # 防御: 脅威のタイプのうち半減以下で受けられないものが1つもない
+        threat_types = np.zeros((len(threat_rows), len(TYPE_INDEX)), dtype=np.int32)
+        for position, row_index in enumerate(threat_rows):
+            threat_types[position, TYPE_INDEX[primary[row_index]]] = 1
+            if secondary[row_index] is not None:
+                threat_types[position, TYPE_INDEX[secondary[row_index]]] = 1
+        not_resisted = (multipliers > 0.5).astype(np.int32)
+        defense = not_resisted @ threat_types.T == 0
+
+        # 素早さ: 種族値の比較
+        base_spe = np.array([row[columns["base_spe"]] for row in rows], dtype=np.int32)
+        speed = base_spe[:, None] > base_spe[threat_rows][None, :]
+
+        self._bits = {
+            "offense": _pack_rows(offense),
+            "defense": _pack_rows(defense),
+            "speed": _pack_rows(speed),
+        }
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path, threats: Sequence[str] | None = None) -> "TeamSearch":
+        """CSV生成ツールの出力ディレクトリから構築する."""
+        return cls(load_tables_from_csv(csv_dir), threats)
+
+    @classmethod
+    def from_builder(
+        cls, builder: CSVBuilder, threats: Sequence[str] | None = None
+    ) -> "TeamSearch":
+        """collect_data() 済みのCSVBuilderから構築する."""
+        return cls(load_tables_from_builder(builder), threats)
+
+    # ========================================
+    # 探索
+    # ========================================
+
+    def coverage_bits(self, coverage: Coverage = OFFENSE) -> list[int]:
+        """各ポケモンが対応できる脅威のビットベクトル.
+
+        Args:
+            coverage: 対応の条件
+
+        Returns:
+            ポケモンごとの整数（ビット i が脅威リストの i 番目に対応できるか）
+        """
+        selected = [
+            self._bits[name]
+            for name, enabled in (
+                ("offense", coverage.offense),
+                ("defense", coverage.defense),
+                ("speed", coverage.speed),
+            )
+            if enabled
+        ]
+        bits = list(selected[0])
+        for other in selected[1:]:
+            bits = [a & b for a, b in zip(bits, other, strict=True)]
+        return bits
+
+    def answers(
+        self,
+        coverage: Coverage = ANSWER,
+        candidates: np.ndarray | None = None,
+        limit: int | None = None,
+    ) -> list[Answer]:
+        """脅威に対応できるポケモンを、対応できる脅威の多い順に返す.
+
+        Args:
+            coverage: 対応の条件（既定は効果抜群かつタイプ一致技を半減以下）
+            candidates: 候補のマスク（pokemon テーブルと同じ並びの真偽値配列）
+            limit: 返す件数の上限
+
+        Returns:
+            対応できる脅威が1つ以上あるポケモン
+        """
+        bits = self.coverage_bits(coverage)
+        ranked = sorted(
+            (index for index in self._candidate_indexes(candidates) if bits[index]),
+            key=lambda index: (-bits[index].bit_count(), index),
+        )
+        return [
+            Answer(self.pokemon_names[index], self._threats_in(bits[index]))
+            for index in ranked[:limit]
+        ]
+
+    def best_teams(
+        self,
+        k: int = 1,
+        team_size: int = DEFAULT_TEAM_SIZE,
+        coverage: Coverage = OFFENSE,
+        candidates: np.ndarray | None = None,
+        include: Sequence[str] = (),
+        workers: int = 1,
+    ) -> list[Team]:
+        """対応できる脅威の多いチームを上位 k 件探索する.
+
+        未対応の脅威の集合が同じ候補を1つのクラスにまとめ、クラスの代表（pokemon テーブルで
+        先の候補）だけで探索する。代表のチームはクラスのメンバーを入れ替えた数だけの同じ
+        対応数のチームを表すため、その数を合わせて k 件に達した時点の対応数で枝刈りし、
+        最後にメンバーへ展開して上位 k 件を返す。
+
+        集合が k 匹以上の他の候補の集合の真部分集合になっているクラス（支配されるクラス）は
+        除外する。そのようなクラスを含むチームは、支配する候補に入れ替えた k 件以上の
+        チームより対応数が多くならないため、上位 k 件の対応数は変わらない。
+
+        Args:
+            k: 返すチームの数
+            team_size: チームの人数
+            coverage: 対応の条件（既定は効果抜群を取れる）
+            candidates: 候補のマスク（pokemon テーブルと同じ並びの真偽値配列）
+            include: 必ずチームに入れるポケモン
+            workers: 2以上の場合は最初のメンバーの選び方ごとに複数プロセスで探索する
+
+        Returns:
+            対応できる脅威の多い順のチーム
+
+        Raises:
+            KeyError: include に未知のポケモン名が指定された場合
+            ValueError: k・team_size が1未満、または include が team_size を超える場合
+        """
+        if k < 1 or team_size < 1:
+            msg = f"k と team_size は1以上を指定してください: k={k}, team_size={team_size}"
+            raise ValueError(msg)
+        included = self._indexes(include).tolist()
+        if len(included) > team_size:
+            msg = f"include が team_size を超えています: {len(included)} > {team_size}"
+            raise ValueError(msg)
+
+        bits = self.coverage_bits(coverage)
+        covered = 0
+        for index in included:
+            covered |= bits[index]
+        pool = [
+            index
+            for index in self._candidate_indexes(candidates)
+            if index not in included and bits[index] & ~covered
+        ]
+        classes = _non_dominated(_coverage_classes(pool, bits, covered, k), bits, covered, k)
+        weights = {representative: len(members) for representative, members in classes.items()}
+        pool = sorted(classes)
+        slots = team_size - len(included)
+
+        if workers > 1 and slots > 1 and len(pool) > 1:
+            roots = _ranked(pool, bits, covered)
+            tasks = [
+                (tuple(included), covered, first, [index for index, _ in roots[i + 1 :]], slots, k)
+                for i, (first, _) in enumerate(roots)
+            ]
+            found: list[tuple[int, tuple[int, ...]]] = []
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(bits, weights)
+            ) as executor:
+                for result in executor.map(_search_subtree, tasks, chunksize=4):
+                    found.extend(result)
+            found.sort(key=lambda item: (item[0], _negated(item[1])), reverse=True)
+            best: list[tuple[int, tuple[int, ...]]] = []
+            count = 0
+            for item in found:
+                if count >= k:
+                    break
+                best.append(item)
+                count += _team_weight(item[1], weights)
+        else:
+            best = _BranchAndBound(bits, k, weights).run(tuple(included), covered, pool, slots)
+
+        return [
+            Team(
+                tuple(self.pokemon_names[index] for index in members),
+                score,
+                self._threats_in(~self._team_bits(bits, members)),
+            )
+            for score, members in _expand(best, classes, k)
+        ]
+
+    # ========================================
+    # 内部処理
+    # ========================================
+
+    def _indexes(self, names: Sequence[str]) -> np.ndarray:
+        """ポケモン名を行インデックスに変換する. 未知の名前の場合はKeyErrorを送出する."""
+        indexes = []
+        for name in names:
+            if name not in self.pokemon_index:
+                msg = f"未知のポケモンです: {name}"
+                raise KeyError(msg)
+            indexes.append(self.pokemon_index[name])
+        return np.array(indexes, dtype=np.intp)
+
+    def _candidate_indexes(self, candidates: np.ndarray | None) -> list[int]:
+        """候補のマスクを行インデックスのリストにする（省略時は全ポケモン）."""
+        if candidates is None:
+            return list(range(len(self.pokemon_names)))
+        return np.flatnonzero(candidates).tolist()
+
+    def _threats_in(self, bits: int) -> tuple[str, ...]:
+        """ビットベクトルに含まれる脅威の名前."""
+        return tuple(name for i, name in enumerate(self.threat_names) if bits >> i & 1)
+
+    @staticmethod
+    def _team_bits(bits: list[int], members: Sequence[int]) -> int:
+        """メンバーのビットベクトルの OR."""
+        covered = 0
+        for index in members:
+            covered |= bits[index]
+        return covered
+
+
+class _BranchAndBound:
+    """上位 k 件のチームの分枝限定探索.
+
+    各ノードで、残りの候補を未対応の脅威に対する増分の大きい順に並べて分枝する。
+    兄弟より後の分枝では先の兄弟を候補から外すため、同じメンバーの組は1回だけ探索される。
+    候補はクラスの代表で、見つけたチームはメンバーの重み（クラスの人数）の積の数だけの
+    チームとして数える。
+    """
+
+    def __init__(self, bits: list[int], k: int, weights: dict[int, int]) -> None:
+        """初期化.
+
+        Args:
+            bits: ポケモンごとのビットベクトル
+            k: 保持するチームの数
+            weights: 代表 -> クラスの人数（含まれない番号は1）
+        """
+        self.bits = bits
+        self.k = k
+        self.weights = weights
+        # (対応数, メンバーの符号反転, 重み) の最小ヒープ
+        # （同じ対応数ならメンバーの番号が小さい方を残す）
+        self._heap: list[tuple[int, tuple[int, ...], int]] = []
+        self._count = 0
+
+    def run(
+        self, members: tuple[int, ...], covered: int, pool: list[int], slots: int
+    ) -> list[tuple[int, tuple[int, ...]]]:
+        """探索して (対応数, メンバー) を対応数の多い順に返す."""
+        self._search(members, covered, pool, slots)
+        return [(score, _negated(key)) for score, key, _ in sorted(self._heap, reverse=True)]
+
+    def _threshold(self) -> int:
+        """枝を探索する価値がある対応数の下限（k 件見つかるまでは -1）."""
+        return self._heap[0][0] if self._count >= self.k else -1
+
+    def _record(self, members: tuple[int, ...], covered: int) -> None:
+        key = tuple(sorted(members))
+        entry = (covered.bit_count(), _negated(key), _team_weight(key, self.weights))
+        if self._count >= self.k and entry <= self._heap[0]:
+            return
+        heapq.heappush(self._heap, entry)
+        self._count += entry[2]
+        # 最下位を除いても k 件が残る間は除く
+        while self._count - self._heap[0][2] >= self.k:
+            self._count -= heapq.heappop(self._heap)[2]
+
+    def _search(self, members: tuple[int, ...], covered: int, pool: list[int], slots: int) -> None:
+        ranked = _ranked(pool, self.bits, covered) if slots > 0 else []
+        if not ranked:
+            self._record(members, covered)
+            return
+
+        gains = [gain for _, gain in ranked]
+        base = covered.bit_count()
+        for position, (index, _) in enumerate(ranked):
+            # 増分の大きい順に並んでいるため、この先の兄弟の上限はこれ以下
+            if base + sum(gains[position : position + slots]) <= self._threshold():
+                break
+            self._search(
+                (*members, index),
+                covered | self.bits[index],
+                [other for other, _ in ranked[position + 1 :]],
+                slots - 1,
+            )
+
+
+# ワーカープロセスのビットベクトル・クラスの人数（タスクごとに送らず初期化時に1回だけ受け取る）
+_worker_bits: list[int] = []
+_worker_weights: dict[int, int] = {}
+
+
+def _init_worker(bits: list[int], weights: dict[int, int]) -> None:
+    """ワーカープロセスの初期化."""
+    global _worker_bits, _worker_weights  # noqa: PLW0603
+    _worker_bits = bits
+    _worker_weights = weights
+
+
+def _search_subtree(
+    task: tuple[tuple[int, ...], int, int, list[int], int, int],
+) -> list[tuple[int, tuple[int, ...]]]:
+    """最初のメンバーを固定した部分木を探索する（ワーカープロセスで実行）."""
+    included, covered, first, rest, slots, k = task
+    return _BranchAndBound(_worker_bits, k, _worker_weights).run(
+        (*included, first), covered | _worker_bits[first], rest, slots - 1
+    )
+
+
+def _ranked(pool: list[int], bits: list[int], covered: int) -> list[tuple[int, int]]:
+    """候補を未対応の脅威に対する増分の大きい順に並べる（増分0の候補は除く）."""
+    uncovered = ~covered
+    gains = [(index, (bits[index] & uncovered).bit_count()) for index in pool]
+    return sorted((item for item in gains if item[1] > 0), key=lambda item: (-item[1], item[0]))
+
+
+def _coverage_classes(
+    pool: list[int], bits: list[int], covered: int, k: int
+) -> dict[int, list[int]]:
+    """未対応の脅威の集合が同じ候補をまとめる.
+
+    Returns:
+        代表（クラスで番号が最小の候補） -> 番号順のメンバー（上位 k 件に使う先頭 k 匹まで）
+    """
+    uncovered = ~covered
+    by_bits: dict[int, list[int]] = {}
+    for index in sorted(pool):
+        members = by_bits.setdefault(bits[index] & uncovered, [])
+        if len(members) < k:
+            members.append(index)
+    return {members[0]: members for members in by_bits.values()}
+
+
+def _non_dominated(
+    classes: dict[int, list[int]], bits: list[int], covered: int, k: int
+) -> dict[int, list[int]]:
+    """未対応の脅威の集合が合わせて k 匹以上の他の候補の集合の真部分集合になっているクラスを除く.
+
+    増分の大きい順に見るため、支配するクラスは先に判定済みになる。除いたクラスを
+    支配するクラスの集合は、それを支配する k 匹の候補の集合の部分集合でもあるため、
+    残したクラスの人数だけを数えればよい。
+    """
+    uncovered = ~covered
+    kept: dict[int, list[int]] = {}
+    kept_bits: list[tuple[int, int]] = []
+    for representative in sorted(
+        classes, key=lambda index: (-(bits[index] & uncovered).bit_count(), index)
+    ):
+        own = bits[representative] & uncovered
+        dominators = 0
+        for other, size in kept_bits:
+            if own & other == own:
+                dominators += size
+                if dominators >= k:
+                    break
+        if dominators >= k:
+            continue
+        kept[representative] = classes[representative]
+        kept_bits.append((own, len(classes[representative])))
+    return kept
+
+
+def _team_weight(members: tuple[int, ...], weights: dict[int, int]) -> int:
+    """代表のチームが表すチームの数（メンバーのクラスの人数の積）."""
+    return math.prod(weights.get(index, 1) for index in members)
+
+
+def _expand(
+    best: list[tuple[int, tuple[int, ...]]], classes: dict[int, list[int]], k: int
+) -> list[tuple[int, tuple[int, ...]]]:
+    """代表のチームをクラスのメンバーに展開し、対応数の多い順に上位 k 件を返す.
+
+    代表のチームごとに、番号の大きいクラスから順にメンバーを入れ替えた k 件までを作る
+    （同じ対応数ならメンバーの番号が小さい順）。
+    """
+    teams: list[tuple[int, tuple[int, ...]]] = []
+    for score, members in best:
+        choices = [classes.get(index, [index]) for index in members]
+        teams.extend(
+            (score, tuple(sorted(combination))) for combination in islice(product(*choices), k)
+        )
+    return heapq.nsmallest(k, teams, key=lambda item: (-item[0], item[1]))
+
+
+def _negated(members: tuple[int, ...]) -> tuple[int, ...]:
+    """メンバーの番号の符号を反転する（最小ヒープで番号の小さいチームを優先するため）."""
+    return tuple(-index for index in members)
+
+
+def _pack_rows(matrix: np.ndarray) -> list[int]:
+    """(ポケモン数, 脅威数) の真偽値行列を、行ごとのビットベクトル（整数）にする."""
+    packed = np.packbits(matrix, axis=1, bitorder="little")
+    return [int.from_bytes(row.tobytes(), "little") for row in packed]
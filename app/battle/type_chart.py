@@ -0,0 +1,325 @@
+"""タイプ相性表と防御相性プロファイル.
+
+18タイプの相性表を 18×18 のNumPy配列（行 = 攻撃タイプ, 列 = 防御タイプ）で保持し、
+各ポケモンのタイプ1・タイプ2から「各攻撃タイプから受けるダメージ倍率」の
+ベクトル（防御相性プロファイル）を一括で計算します。
+
+Example:
+    profiles = DefenseProfiles.from_csv_dir(Path("data/csv_files"))
+    mask = profiles.weak_to("じめん") & profiles.resists("ほのお")
+    profiles.names(mask)
+"""
+
+import csv
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+from app.query.engine import TYPE_NAMES
+from app.query.tables import Tables, load_tables_from_builder, load_tables_from_csv
+
+# タイプ名 -> 相性表の行・列インデックス
+TYPE_INDEX: dict[str, int] = {type_name: i for i, type_name in enumerate(TYPE_NAMES)}
+
+# 等倍以外の相性（攻撃タイプ -> {防御タイプ: 倍率}）。第6世代以降の相性表
+_EFFECTIVENESS: dict[str, dict[str, float]] = {
+    "ノーマル": {"いわ": 0.5, "ゴースト": 0.0, "はがね": 0.5},
+    "ほのお": {
+        "ほのお": 0.5,
+        "みず": 0.5,
+        "くさ": 2.0,
+        "こおり": 2.0,
+        "むし": 2.0,
+        "いわ": 0.5,
+        "ドラゴン": 0.5,
+        "はがね": 2.0,
+    },
+    "みず": {"ほのお": 2.0, "みず": 0.5, "くさ": 0.5, "じめん": 2.0, "いわ": 2.0, "ドラゴン": 0.5},
+    "でんき": {
+        "みず": 2.0,
+        "でんき": 0.5,
+        "くさ": 0.5,
+        "じめん": 0.0,
+        "ひこう": 2.0,
+        "ドラゴン": 0.5,
+    },
+    "くさ": {
+        "ほのお": 0.5,
+        "みず": 2.0,
+        "くさ": 0.5,
+        "どく": 0.5,
+        "じめん": 2.0,
+        "ひこう": 0.5,
+        "むし": 0.5,
+        "いわ": 2.0,
+        "ドラゴン": 0.5,
+        "はがね": 0.5,
+    },
+    "こおり": {
+        "ほのお": 0.5,
+        "みず": 0.5,
+        "くさ": 2.0,
+        "こおり": 0.5,
+        "じめん": 2.0,
+        "ひこう": 2.0,
+        "ドラゴン": 2.0,
+        "はがね": 0.5,
+    },
+    "かくとう": {
+        "ノーマル": 2.0,
+        "こおり": 2.0,
+        "どく": 0.5,
+        "ひこう": 0.5,
+        "エスパー": 0.5,
+        "むし": 0.5,
+        "いわ": 2.0,
+        "ゴースト": 0.0,
+        "あく": 2.0,
+        "はがね": 2.0,
+        "フェアリー": 0.5,
+    },
+    "どく": {
+        "くさ": 2.0,
+        "どく": 0.5,
+        "じめん": 0.5,
+        "いわ": 0.5,
+        "ゴースト": 0.5,
+        "はがね": 0.0,
+        "フェアリー": 2.0,
+    },
+    "じめん": {
+        "ほのお": 2.0,
+        "でんき": 2.0,
+        "くさ": 0.5,
+        "どく": 2.0,
+        "ひこう": 0.0,
+        "むし": 0.5,
+        "いわ": 2.0,
+        "はがね": 2.0,
+    },
+    "ひこう": {
+        "でんき": 0.5,
+        "くさ": 2.0,
+        "かくとう": 2.0,
+        "むし": 2.0,
+        "いわ": 0.5,
+        "はがね": 0.5,
+    },
+    "エスパー": {"かくとう": 2.0, "どく": 2.0, "エスパー": 0.5, "あく": 0.0, "はがね": 0.5},
+    "むし": {
+        "ほのお": 0.5,
+        "くさ": 2.0,
+        "かくとう": 0.5,
+        "どく": 0.5,
+        "ひこう": 0.5,
+        "エスパー": 2.0,
+        "ゴースト": 0.5,
+        "あく": 2.0,
+        "はがね": 0.5,
+        "フェアリー": 0.5,
+    },
+    "いわ": {
+        "ほのお": 2.0,
+        "こおり": 2.0,
+        "かくとう": 0.5,
+        "じめん": 0.5,
+        "ひこう": 2.0,
+        "むし": 2.0,
+        "はがね": 0.5,
+    },
+    "ゴースト": {"ノーマル": 0.0, "エスパー": 2.0, "ゴースト": 2.0, "あく": 0.5},
+    "ドラゴン": {"ドラゴン": 2.0, "はがね": 0.5, "フェアリー": 0.0},
+    "あく": {"かくとう": 0.5, "エスパー": 2.0, "ゴースト": 2.0, "あく": 0.5, "フェアリー": 0.5},
+    "はがね": {
+        "ほのお": 0.5,
+        "みず": 0.5,
+        "でんき": 0.5,
+        "こおり": 2.0,
+        "いわ": 2.0,
+        "はがね": 0.5,
+        "フェアリー": 2.0,
+    },
+    "フェアリー": {
+        "ほのお": 0.5,
+        "かくとう": 2.0,
+        "どく": 0.5,
+        "ドラゴン": 2.0,
+        "あく": 2.0,
+        "はがね": 0.5,
+    },
+}
+
+
+def _build_type_chart() -> np.ndarray:
+    """相性表を 18×18 の配列に展開する."""
+    chart = np.ones((len(TYPE_NAMES), len(TYPE_NAMES)), dtype=np.float32)
+    for attack_type, row in _EFFECTIVENESS.items():
+        for defense_type, multiplier in row.items():
+            chart[TYPE_INDEX[attack_type], TYPE_INDEX[defense_type]] = multiplier
+    chart.setflags(write=False)
+    return chart
+
+
+# タイプ相性表（TYPE_CHART[攻撃タイプ, 防御タイプ] = 倍率）
+TYPE_CHART: np.ndarray = _build_type_chart()
+
+# 出力CSVのカラム定義
+TYPE_CHART_COLUMNS: tuple[str, ...] = ("attack_type", "defense_type", "multiplier")
+TYPE_DEFENSE_COLUMNS: tuple[str, ...] = ("pokemon_id", "attack_type", "multiplier")
+
+
+def type_index(type_name: str) -> int:
+    """タイプ名を相性表のインデックスに変換する.
+
+    Raises:
+        KeyError: 未知のタイプ名が指定された場合
+    """
+    if type_name not in TYPE_INDEX:
+        msg = f"未知のタイプです: {type_name}"
+        raise KeyError(msg)
+    return TYPE_INDEX[type_name]
+
+
+def effectiveness(attack_type: str, *defense_types: str | None) -> float:
+    """攻撃タイプから防御側のタイプ（複合可）への倍率を返す.
+
+    Args:
+        attack_type: 攻撃技のタイプ
+        *defense_types: 防御側のタイプ（Noneは無視する）
+
+    Returns:
+        ダメージ倍率（0, 0.25, 0.5, 1, 2, 4）
+    """
+    attack = type_index(attack_type)
+    multiplier = 1.0
+    for defense_type in defense_types:
+        if defense_type is not None:
+            multiplier *= float(TYPE_CHART[attack, type_index(defense_type)])
+    return multiplier
+
+
+def defense_profiles(
+    type_primary: Sequence[str], type_secondary: Sequence[str | None]
+) -> np.ndarray:
+    """タイプ1・タイプ2の列から防御相性プロファイルを一括計算する.
+
+    Args:
+        type_primary: 各ポケモンのタイプ1
+        type_secondary: 各ポケモンのタイプ2（単タイプはNone）
+
+    Returns:
+        (ポケモン数, 18) の配列。[i, j] はポケモンiが攻撃タイプjから受ける倍率
+    """
+    primary = np.array([type_index(t) for t in type_primary], dtype=np.intp)
+    # 単タイプはタイプ2の倍率を1として扱うため、全て1の列（インデックス18）を追加した表を引く
+    no_type = len(TYPE_NAMES)
+    secondary = np.array(
+        [no_type if t is None else type_index(t) for t in type_secondary], dtype=np.intp
+    )
+    defense_chart = np.vstack([TYPE_CHART.T, np.ones(len(TYPE_NAMES), dtype=np.float32)])
+    return defense_chart[primary] * defense_chart[secondary]
+
+
+class DefenseProfiles:
+    """全ポケモンの防御相性プロファイル.
+
+    行の並びは pokemon テーブル（PokemonQueryEngine）と同じため、各フィルタが返す
+    真偽値マスクは PokemonQueryEngine のマスクとそのまま組み合わせられる。
+    """
+
+    def __init__(self, tables: Tables) -> None:
+        """初期化.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（tables.py の形式）
+        """
+        columns = TABLE_COLUMNS["pokemon"]
+        rows = tables["pokemon"]
+        id_index = columns.index("id")
+        name_index = columns.index("name_ja")
+        primary_index = columns.index("type_primary")
+        secondary_index = columns.index("type_secondary")
+
+        self.ids = np.array([row[id_index] for row in rows], dtype=np.int32)
+        self.name_list: list[str] = [row[name_index] for row in rows]
+        self.multipliers = defense_profiles(
+            [row[primary_index] for row in rows], [row[secondary_index] for row in rows]
+        )
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path) -> "DefenseProfiles":
+        """CSV生成ツールの出力ディレクトリから構築する."""
+        return cls(load_tables_from_csv(csv_dir))
+
+    @classmethod
+    def from_builder(cls, builder: CSVBuilder) -> "DefenseProfiles":
+        """collect_data() 済みのCSVBuilderから構築する."""
+        return cls(load_tables_from_builder(builder))
+
+    def multiplier(self, attack_type: str) -> np.ndarray:
+        """攻撃タイプから受ける倍率の列を返す."""
+        return self.multipliers[:, type_index(attack_type)]
+
+    def weak_to(self, attack_type: str, min_multiplier: float = 2.0) -> np.ndarray:
+        """攻撃タイプが効果抜群（既定は2倍以上）のポケモンのマスクを返す."""
+        return self.multiplier(attack_type) >= min_multiplier
+
+    def resists(self, attack_type: str, max_multiplier: float = 0.5) -> np.ndarray:
+        """攻撃タイプを半減以下（無効を含む）で受けるポケモンのマスクを返す."""
+        return self.multiplier(attack_type) <= max_multiplier
+
+    def immune_to(self, attack_type: str) -> np.ndarray:
+        """攻撃タイプが無効のポケモンのマスクを返す."""
+        return self.multiplier(attack_type) == 0
+
+    def weakness_counts(self) -> np.ndarray:
+        """各ポケモンの弱点（2倍以上）タイプ数を返す."""
+        return np.count_nonzero(self.multipliers >= 2.0, axis=1)
+
+    def names(self, mask: np.ndarray) -> list[str]:
+        """マスクに該当するポケモン名を返す."""
+        return [self.name_list[i] for i in np.flatnonzero(mask)]
+
+    def pokemon_ids(self, mask: np.ndarray) -> list[int]:
+        """マスクに該当するポケモンIDを返す."""
+        return self.ids[mask].tolist()
+
+
+def generate_type_csvs(profiles: DefenseProfiles, output_dir: Path) -> dict[str, Path]:
+    """タイプ相性表と防御相性プロファイルをCSVに出力する.
+
+    - type_chart.csv: 攻撃タイプ×防御タイプの倍率（18×18 = 324行）
+    - pokemon_type_defenses.csv: ポケモンごとの各攻撃タイプからの倍率（ポケモン数×18行）
+
+    倍率は "0", "0.25", "0.5", "1", "2", "4" の形式で出力する。
+
+    Args:
+        profiles: 防御相性プロファイル
+        output_dir: 出力先ディレクトリ（通常はCSVBuilderと同じ data/csv_files）
+
+    Returns:
+        生成されたCSVファイルのパス辞書 (テーブル名 -> パス)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    chart_path = output_dir / "type_chart.csv"
+    with chart_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TYPE_CHART_COLUMNS)
+        for attack, attack_type in enumerate(TYPE_NAMES):
+            for defense, defense_type in enumerate(TYPE_NAMES):
+                writer.writerow([attack_type, defense_type, f"{TYPE_CHART[attack, defense]:g}"])
+
+    defenses_path = output_dir / "pokemon_type_defenses.csv"
+    with defenses_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(TYPE_DEFENSE_COLUMNS)
+        for pokemon_id, vector in zip(profiles.ids.tolist(), profiles.multipliers, strict=True):
+            writer.writerows(
+                [pokemon_id, attack_type, f"{multiplier:g}"]
+                for attack_type, multiplier in zip(TYPE_NAMES, vector.tolist(), strict=True)
+            )
+
+    return {"type_chart": chart_path, "pokemon_type_defenses": defenses_path}
@@ -0,0 +1,5 @@
+"""SQL benchmark harness for the Supabase sv schema.
+
+代表的な検索クエリをローカルのSupabaseに対して並列実行し、レイテンシと実行計画を
+記録・比較するモジュール群。
+"""
@@ -0,0 +1,331 @@
+"""ベンチマーク対象クエリのカタログ.
+
+docs/DB設計書.md の「6. 代表的なクエリ例」を起点に、各インデックスが実際に
+使われるかを確認するためのクエリを並べます。`expected_indexes` は実行計画に
+現れることを期待するインデックス名で、使われなかった場合はレポートで警告します。
+
+`follow_ups` を持つクエリは、クライアントが結果を受け取ってから次の問い合わせを発行する
+複数リクエストのパターンを表し、全リクエストの往復を1回の計測に含めます。
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from app.query.service import PokemonSearch, build_search_query
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkQuery:
+    """ベンチマーク対象のクエリ1件.
+
+    Attributes:
+        name: クエリ名（結果・ベースラインのキー）
+        description: 内容の説明
+        sql: 実行するSQL
+        params: バインドパラメータ
+        expected_indexes: 実行計画に現れることを期待するインデックス名（sql のみ対象）
+        follow_ups: sql の後に順に実行するSQL。直前のリクエストの結果の1列目の値のリストを
+            $1 として渡す（クライアント側で結果から次の条件を組み立てる往復を再現する）
+    """
+
+    name: str
+    description: str
+    sql: str
+    params: tuple[Any, ...] = ()
+    expected_indexes: tuple[str, ...] = ()
+    follow_ups: tuple[str, ...] = ()
+
+    @property
+    def round_trips(self) -> int:
+        """1回の実行で発行するリクエスト数."""
+        return 1 + len(self.follow_ups)
+
+
+# タイプ -> 部分インデックス名（supabase/migrations/20250102000000_create_sv_schema.sql）
+TYPE_PARTIAL_INDEXES: dict[str, str] = {
+    "ノーマル": "idx_pokemon_type_normal",
+    "ほのお": "idx_pokemon_type_fire",
+    "みず": "idx_pokemon_type_water",
+    "でんき": "idx_pokemon_type_electric",
+    "くさ": "idx_pokemon_type_grass",
+    "こおり": "idx_pokemon_type_ice",
+    "かくとう": "idx_pokemon_type_fighting",
+    "どく": "idx_pokemon_type_poison",
+    "じめん": "idx_pokemon_type_ground",
+    "ひこう": "idx_pokemon_type_flying",
+    "エスパー": "idx_pokemon_type_psychic",
+    "むし": "idx_pokemon_type_bug",
+    "いわ": "idx_pokemon_type_rock",
+    "ゴースト": "idx_pokemon_type_ghost",
+    "ドラゴン": "idx_pokemon_type_dragon",
+    "あく": "idx_pokemon_type_dark",
+    "はがね": "idx_pokemon_type_steel",
+    "フェアリー": "idx_pokemon_type_fairy",
+}
+
+
+def _document_queries() -> list[BenchmarkQuery]:
+    """docs/DB設計書.md 6章のクエリ（JOIN版と sv.pokemon_search 版）."""
+    return [
+        BenchmarkQuery(
+            "doc_6_1_join",
+            "ねこだまし を覚える素早さ102以上（JOIN版）",
+            "SELECT p.* FROM sv.pokemon p "
+            "JOIN sv.pokemon_moves pm ON p.id = pm.pokemon_id "
+            "JOIN sv.moves m ON pm.move_id = m.id "
+            "WHERE m.name_ja = 'ねこだまし' AND p.base_spe >= 102",
+            expected_indexes=("moves_name_ja_key", "idx_pokemon_moves_move_id"),
+        ),
+        BenchmarkQuery(
+            "doc_6_1",
+            "ねこだまし を覚える素早さ102以上",
+            "SELECT p.* FROM sv.pokemon_search s "
+            "JOIN sv.pokemon p ON p.id = s.pokemon_id "
+            "WHERE s.move_ids @> ARRAY(SELECT id FROM sv.moves WHERE name_ja = 'ねこだまし') "
+            "AND s.base_spe >= 102",
+            expected_indexes=("moves_name_ja_key", "idx_pokemon_search_move_ids"),
+        ),
+        BenchmarkQuery(
+            "doc_6_2_join",
+            "もらいび を持つほのおタイプ（JOIN版）",
+            "SELECT p.* FROM sv.pokemon p "
+            "JOIN sv.pokemon_abilities pa ON p.id = pa.pokemon_id "
+            "JOIN sv.abilities a ON pa.ability_id = a.id "
+            "WHERE a.name_ja = 'もらいび' "
+            "AND (p.type_primary = 'ほのお' OR p.type_secondary = 'ほのお')",
+            expected_indexes=("abilities_name_ja_key", "idx_pokemon_abilities_ability_id"),
+        ),
+        BenchmarkQuery(
+            "doc_6_2",
+            "もらいび を持つほのおタイプ",
+            "SELECT p.* FROM sv.pokemon_search s "
+            "JOIN sv.pokemon p ON p.id = s.pokemon_id "
+            "WHERE s.ability_ids && ARRAY(SELECT id FROM sv.abilities WHERE name_ja = 'もらいび') "
+            "AND s.types @> ARRAY['ほのお']",
+            expected_indexes=("abilities_name_ja_key", "idx_pokemon_search_ability_ids"),
+        ),
+        BenchmarkQuery(
+            "doc_6_3_join",
+            "伝説・幻以外のドラゴンタイプで りゅうのまい を覚える（JOIN版）",
+            "SELECT p.* FROM sv.pokemon p "
+            "JOIN sv.pokemon_moves pm ON p.id = pm.pokemon_id "
+            "JOIN sv.moves m ON pm.move_id = m.id "
+            "WHERE (p.type_primary = 'ドラゴン' OR p.type_secondary = 'ドラゴン') "
+            "AND p.is_legendary = FALSE AND p.is_mythical = FALSE "
+            "AND m.name_ja = 'りゅうのまい'",
+            expected_indexes=("moves_name_ja_key", "idx_pokemon_moves_move_id"),
+        ),
+        BenchmarkQuery(
+            "doc_6_3",
+            "伝説・幻以外のドラゴンタイプで りゅうのまい を覚える",
+            "SELECT p.* FROM sv.pokemon_search s "
+            "JOIN sv.pokemon p ON p.id = s.pokemon_id "
+            "WHERE s.types @> ARRAY['ドラゴン'] "
+            "AND s.move_ids @> ARRAY(SELECT id FROM sv.moves WHERE name_ja = 'りゅうのまい') "
+            "AND NOT s.is_legendary AND NOT s.is_mythical",
+            expected_indexes=("moves_name_ja_key", "idx_pokemon_search_move_ids"),
+        ),
+        BenchmarkQuery(
+            "doc_6_4",
+            "最速ガブリアスより速い準速・最速のポケモン",
+            "SELECT p.name_ja, st.preset, st.speed FROM sv.speed_tiers st "
+            "JOIN sv.pokemon p ON p.id = st.pokemon_id "
+            "WHERE st.preset IN ('max', 'fastest') AND st.speed > ("
+            "SELECT speed FROM sv.speed_tiers WHERE preset = 'fastest' "
+            "AND pokemon_id = (SELECT id FROM sv.pokemon WHERE name_ja = 'ガブリアス')) "
+            "ORDER BY st.speed DESC",
+            expected_indexes=("pokemon_name_ja_key", "idx_speed_tiers_pokemon_preset"),
+        ),
+    ]
+
+
+def _index_queries() -> list[BenchmarkQuery]:
+    """個々のインデックスの利用を確認するクエリ."""
+    queries = [
+        BenchmarkQuery(
+            f"type_{index_name.removeprefix('idx_pokemon_type_')}",
+            f"{type_name}タイプのポケモン（部分インデックス）",
+            f"SELECT p.id, p.name_ja FROM sv.pokemon p "
+            f"WHERE p.type_primary = '{type_name}' OR p.type_secondary = '{type_name}'",
+            expected_indexes=(index_name,),
+        )
+        for type_name, index_name in TYPE_PARTIAL_INDEXES.items()
+    ]
+    queries.extend(
+        [
+            BenchmarkQuery(
+                "pokemon_by_name",
+                "ポケモン名の完全一致",
+                "SELECT * FROM sv.pokemon WHERE name_ja = 'ガブリアス'",
+                expected_indexes=("pokemon_name_ja_key",),
+            ),
+            BenchmarkQuery(
+                "pokemon_by_pokedex_no",
+                "図鑑番号の範囲（第4世代）",
+                "SELECT id, name_ja FROM sv.pokemon WHERE pokedex_no BETWEEN 387 AND 493",
+                expected_indexes=("idx_pokemon_pokedex_no",),
+            ),
+            BenchmarkQuery(
+                "pokemon_fast",
+                "素早さ種族値130以上",
+                "SELECT id, name_ja FROM sv.pokemon WHERE base_spe >= 130",
+                expected_indexes=("idx_pokemon_base_spe",),
+            ),
+            BenchmarkQuery(
+                "pokemon_legendary",
+                "伝説のポケモン",
+                "SELECT id, name_ja FROM sv.pokemon WHERE is_legendary",
+                expected_indexes=("idx_pokemon_is_legendary",),
+            ),
+            BenchmarkQuery(
+                "pokemon_mythical",
+                "幻のポケモン",
+                "SELECT id, name_ja FROM sv.pokemon WHERE is_mythical",
+                expected_indexes=("idx_pokemon_is_mythical",),
+            ),
+            BenchmarkQuery(
+                "hidden_abilities",
+                "夢特性の一覧",
+                "SELECT pokemon_id, ability_id FROM sv.pokemon_abilities WHERE is_hidden",
+                expected_indexes=("idx_pokemon_abilities_is_hidden",),
+            ),
+            BenchmarkQuery(
+                "moves_by_type",
+                "ドラゴンタイプの技",
+                "SELECT id, name_ja FROM sv.moves WHERE type_name = 'ドラゴン'",
+                expected_indexes=("idx_moves_type_name",),
+            ),
+            BenchmarkQuery(
+                "moves_by_damage_class",
+                "変化技",
+                "SELECT id, name_ja FROM sv.moves WHERE damage_class = 'status'",
+                expected_indexes=("idx_moves_damage_class",),
+            ),
+            BenchmarkQuery(
+                "move_learners",
+                "まもる を覚えるポケモン数",
+                "SELECT COUNT(*) FROM sv.pokemon_moves pm "
+                "JOIN sv.moves m ON m.id = pm.move_id WHERE m.name_ja = 'まもる'",
+                expected_indexes=("moves_name_ja_key", "idx_pokemon_moves_move_id"),
+            ),
+            BenchmarkQuery(
+                "pokemon_learnset",
+                "ガブリアスの習得技",
+                "SELECT m.name_ja FROM sv.pokemon_moves pm "
+                "JOIN sv.moves m ON m.id = pm.move_id "
+                "WHERE pm.pokemon_id = (SELECT id FROM sv.pokemon WHERE name_ja = 'ガブリアス')",
+                expected_indexes=("pokemon_name_ja_key", "pokemon_moves_pkey"),
+            ),
+            BenchmarkQuery(
+                "speed_tier_range",
+                "最速で素早さ200以上",
+                "SELECT pokemon_id, speed FROM sv.speed_tiers "
+                "WHERE preset = 'fastest' AND speed >= 200 ORDER BY speed DESC",
+                expected_indexes=("idx_speed_tiers_preset_speed",),
+            ),
+        ]
+    )
+    return queries
+
+
+def _service_queries() -> list[BenchmarkQuery]:
+    """app.query.service.QueryService が発行するクエリ."""
+    search = PokemonSearch(
+        moves=("りゅうのまい", "じしん"),
+        types=("ドラゴン",),
+        include_legendary=False,
+        include_mythical=False,
+    )
+    sql, params = build_search_query(search)
+    return [
+        BenchmarkQuery(
+            "service_search",
+            "QueryService.search（ドラゴンタイプで りゅうのまい・じしん を覚える）",
+            sql,
+            params,
+            expected_indexes=("idx_pokemon_search_move_ids",),
+        ),
+    ]
+
+
+def _function_queries() -> list[BenchmarkQuery]:
+    """サーバー側の検索関数（rpc_*）と、同じ結果を複数リクエストで組み立てる形（client_*）.
+
+    supabase/migrations/20261018000004_create_search_functions.sql の関数を、
+    関数導入前のクライアントの問い合わせ（前の結果から次の条件を組み立てる、
+    テーブルごとの SELECT の連続）と比較する。
+    """
+    return [
+        BenchmarkQuery(
+            "rpc_pokemon_detail",
+            "sv.pokemon_detail（ガブリアスの全カラム・特性・覚える技、1リクエスト）",
+            "SELECT * FROM sv.pokemon_detail('ガブリアス')",
+            expected_indexes=("pokemon_name_ja_key", "pokemon_moves_pkey"),
+        ),
+        BenchmarkQuery(
+            "client_pokemon_detail",
+            "ガブリアスの全カラム・特性・覚える技（ポケモン → 特性 → 技の3リクエスト）",
+            "SELECT * FROM sv.pokemon WHERE name_ja = 'ガブリアス'",
+            expected_indexes=("pokemon_name_ja_key",),
+            follow_ups=(
+                "SELECT pa.pokemon_id, a.name_ja, pa.is_hidden, a.effect_text "
+                "FROM sv.pokemon_abilities pa JOIN sv.abilities a ON a.id = pa.ability_id "
+                "WHERE pa.pokemon_id = ANY($1::int[])",
+                "SELECT pm.pokemon_id, m.name_ja, m.type_name, m.damage_class, m.power, "
+                "m.accuracy, m.pp, m.priority "
+                "FROM sv.pokemon_moves pm JOIN sv.moves m ON m.id = pm.move_id "
+                "WHERE pm.pokemon_id = ANY($1::int[])",
+            ),
+        ),
+        BenchmarkQuery(
+            "rpc_learners",
+            "sv.learners（トリックルーム・ねこだまし を両方覚える、1リクエスト）",
+            "SELECT * FROM sv.learners(ARRAY['トリックルーム', 'ねこだまし'])",
+            expected_indexes=("moves_name_ja_key", "idx_pokemon_search_move_ids"),
+        ),
+        BenchmarkQuery(
+            "client_learners",
+            "トリックルーム・ねこだまし を両方覚える（技 → 習得者 → ポケモンの3リクエスト）",
+            "SELECT id FROM sv.moves WHERE name_ja IN ('トリックルーム', 'ねこだまし')",
+            expected_indexes=("moves_name_ja_key",),
+            follow_ups=(
+                "SELECT pokemon_id FROM sv.pokemon_moves WHERE move_id = ANY($1::int[]) "
+                "GROUP BY pokemon_id HAVING COUNT(*) = 2",
+                "SELECT * FROM sv.pokemon WHERE id = ANY($1::int[]) ORDER BY id",
+            ),
+        ),
+        BenchmarkQuery(
+            "rpc_search_pokemon",
+            "sv.search_pokemon（伝説以外のドラゴンタイプで りゅうのまい を覚える素早さ80以上）",
+            'SELECT * FROM sv.search_pokemon(\'{"moves": ["りゅうのまい"], '
+            '"types": ["ドラゴン"], "stats": {"base_spe": {"min": 80}}, '
+            '"include_legendary": false}\')',
+            expected_indexes=("moves_name_ja_key", "idx_pokemon_search_move_ids"),
+        ),
+        BenchmarkQuery(
+            "client_search_pokemon",
+            "伝説以外のドラゴンタイプで りゅうのまい を覚える素早さ80以上"
+            "（技 → 習得者 → ポケモン → 特性の4リクエスト）",
+            "SELECT id FROM sv.moves WHERE name_ja = 'りゅうのまい'",
+            expected_indexes=("moves_name_ja_key",),
+            follow_ups=(
+                "SELECT pokemon_id FROM sv.pokemon_moves WHERE move_id = ANY($1::int[])",
+                "SELECT * FROM sv.pokemon WHERE id = ANY($1::int[]) "
+                "AND (type_primary = 'ドラゴン' OR type_secondary = 'ドラゴン') "
+                "AND base_spe >= 80 AND is_legendary = FALSE ORDER BY id",
+                "SELECT pa.pokemon_id, a.name_ja, pa.is_hidden "
+                "FROM sv.pokemon_abilities pa JOIN sv.abilities a ON a.id = pa.ability_id "
+                "WHERE pa.pokemon_id = ANY($1::int[])",
+            ),
+        ),
+    ]
+
+
+def default_catalogue() -> list[BenchmarkQuery]:
+    """既定のクエリカタログを返す."""
+    return [
+        *_document_queries(),
+        *_index_queries(),
+        *_service_queries(),
+        *_function_queries(),
+    ]
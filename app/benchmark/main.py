@@ -0,0 +1,216 @@
+"""クエリベンチマークのメインエントリポイント.
+
+ローカルのSupabase（127.0.0.1:54322）に対してクエリカタログを実行し、
+p50/p99 レイテンシと実行計画を data/benchmark/ に保存します（要 uv sync --extra service）。
+
+Usage:
+    # 計測して data/benchmark/latest.json に保存（ベースラインがあれば比較を表示）
+    uv run python -m app.benchmark.main
+
+    # CSVをローカル環境へ投入してから計測し、結果をベースラインとして保存
+    uv run python -m app.benchmark.main --load --save-baseline
+
+    # 並列度・実行回数・対象クエリを指定（クエリ名は fnmatch 形式）
+    uv run python -m app.benchmark.main --concurrency 1 4 16 --iterations 500 --queries "doc_*"
+
+    # サーバー側の検索関数と複数リクエスト版を、1往復20ミリ秒の遅延を加えて比較
+    uv run python -m app.benchmark.main --queries "rpc_*" "client_*" --network-latency-ms 20
+"""
+
+import argparse
+import asyncio
+import logging
+import subprocess
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+
+from app.query.service import build_dsn
+
+from .catalogue import default_catalogue
+from .runner import (
+    DEFAULT_REGRESSION_RATIO,
+    compare_results,
+    compare_round_trips,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+
+# ロギング設定
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+BENCHMARK_DIR = PROJECT_ROOT / "data" / "benchmark"
+IMPORT_SCRIPT = PROJECT_ROOT / "scripts" / "import_to_supabase.sh"
+
+
+def main(
+    remote: bool = False,
+    load: bool = False,
+    patterns: list[str] | None = None,
+    concurrency_levels: list[int] | None = None,
+    iterations: int = 200,
+    warmup: int = 10,
+    output_path: Path = BENCHMARK_DIR / "latest.json",
+    baseline_path: Path = BENCHMARK_DIR / "baseline.json",
+    save_baseline: bool = False,
+    regression_ratio: float = DEFAULT_REGRESSION_RATIO,
+    network_latency_ms: float = 0.0,
+) -> int:
+    """メイン処理.
+
+    Args:
+        remote: Trueで本番環境を計測する
+        load: Trueの場合は計測前に import_to_supabase.sh でCSVを投入する
+        patterns: 対象クエリ名のパターン（省略時は全件）
+        concurrency_levels: 計測する並列度
+        iterations: クエリ・並列度ごとの実行回数
+        warmup: クエリごとの計測前の実行回数
+        output_path: 計測結果の保存先
+        baseline_path: ベースラインのパス
+        save_baseline: Trueの場合は計測結果をベースラインとしても保存する
+        regression_ratio: 悪化とみなすベースラインからの倍率
+        network_latency_ms: リクエストごとに加算する往復の遅延（ミリ秒）
+
+    Returns:
+        終了コード（悪化したクエリがあれば1）
+    """
+    logger.info("=" * 60)
+    logger.info("ポケモンデータベース クエリベンチマーク")
+    logger.info("=" * 60)
+
+    if load:
+        logger.info("\n[準備] CSVを投入")
+        command = [str(IMPORT_SCRIPT), *(["--remote"] if remote else [])]
+        subprocess.run(command, check=True, cwd=PROJECT_ROOT)
+
+    queries = default_catalogue()
+    if patterns:
+        queries = [q for q in queries if any(fnmatch(q.name, pattern) for pattern in patterns)]
+    if not queries:
+        logger.error(f"対象のクエリがありません: {patterns}")
+        return 1
+
+    logger.info(f"\n[計測] {len(queries)}件のクエリ（並列度 {concurrency_levels or [1, 8]}）")
+    results = asyncio.run(
+        run_benchmark(
+            build_dsn(remote),
+            queries,
+            concurrency_levels=concurrency_levels or [1, 8],
+            iterations=iterations,
+            warmup=warmup,
+            network_latency_ms=network_latency_ms,
+        )
+    )
+    logger.info(f"\n計測結果を保存しました: {save_results(results, output_path)}")
+
+    round_trip_lines = compare_round_trips(results)
+    if round_trip_lines:
+        logger.info("\n[検索関数] 複数リクエスト -> サーバー側の検索関数")
+        for line in round_trip_lines:
+            logger.info(line)
+
+    if results["unused_indexes"]:
+        logger.info("\nどのクエリの実行計画にも現れなかったインデックス:")
+        for index_name in results["unused_indexes"]:
+            logger.info(f"  - {index_name}")
+
+    exit_code = 0
+    if baseline_path.exists() and baseline_path != output_path:
+        logger.info(f"\n[比較] ベースライン: {baseline_path}")
+        lines = compare_results(results, load_results(baseline_path), regression_ratio)
+        for line in lines:
+            logger.info(line)
+        if any(line.endswith("悪化") for line in lines):
+            exit_code = 1
+
+    if save_baseline:
+        logger.info(f"\nベースラインを保存しました: {save_results(results, baseline_path)}")
+
+    logger.info("\n" + "=" * 60)
+    logger.info("処理完了")
+    logger.info("=" * 60)
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="svスキーマの代表クエリのレイテンシと実行計画を計測する.",
+    )
+    parser.add_argument("--remote", action="store_true", help="本番環境を計測します。")
+    parser.add_argument(
+        "--load",
+        action="store_true",
+        help="計測前に scripts/import_to_supabase.sh で data/csv_files/ を投入します。",
+    )
+    parser.add_argument(
+        "--queries",
+        nargs="+",
+        default=None,
+        metavar="PATTERN",
+        help="対象クエリ名のパターン (例: 'doc_*' 'type_*')。省略時は全件。",
+    )
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        type=int,
+        default=None,
+        metavar="N",
+        help="計測する並列度 (既定: 1 8)。",
+    )
+    parser.add_argument(
+        "--iterations", type=int, default=200, help="クエリ・並列度ごとの実行回数 (既定: 200)。"
+    )
+    parser.add_argument("--warmup", type=int, default=10, help="計測前の実行回数 (既定: 10)。")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=BENCHMARK_DIR / "latest.json",
+        help="計測結果の保存先 (既定: data/benchmark/latest.json)。",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BENCHMARK_DIR / "baseline.json",
+        help="比較・保存に使うベースライン (既定: data/benchmark/baseline.json)。",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="計測結果をベースラインとしても保存します。",
+    )
+    parser.add_argument(
+        "--regression-ratio",
+        type=float,
+        default=DEFAULT_REGRESSION_RATIO,
+        help=f"悪化とみなすベースラインからの倍率 (既定: {DEFAULT_REGRESSION_RATIO})。",
+    )
+    parser.add_argument(
+        "--network-latency-ms",
+        type=float,
+        default=0.0,
+        help="リクエストごとに加算する往復の遅延 (ミリ秒、既定: 0)。リモート環境の再現に使います。",
+    )
+
+    parsed = parser.parse_args()
+    sys.exit(
+        main(
+            remote=parsed.remote,
+            load=parsed.load,
+            patterns=parsed.queries,
+            concurrency_levels=parsed.concurrency,
+            iterations=parsed.iterations,
+            warmup=parsed.warmup,
+            output_path=parsed.output,
+            baseline_path=parsed.baseline,
+            save_baseline=parsed.save_baseline,
+            regression_ratio=parsed.regression_ratio,
+            network_latency_ms=parsed.network_latency_ms,
+        )
+    )
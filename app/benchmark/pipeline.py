@@ -0,0 +1,302 @@
+"""パイプラインの規模別負荷試験.
+
+合成データセット（synthetic.py）を規模ごとに生成し、JSON読み込み → データ収集 →
+CSV出力（→ Supabase投入）の各段階の処理時間とピークメモリを計測します。
+結果は data/benchmark/pipeline.json に保存します。
+
+Usage:
+    # 1万・10万匹で計測
+    uv run python -m app.benchmark.pipeline --scales 10000 100000
+
+    # 生成済みのデータを再利用し、ローカル環境への投入も計測
+    uv run python -m app.benchmark.pipeline --scales 100000 --reuse --import
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.csv_generator.csv_builder import CSVBuilder
+from app.csv_generator.json_loader import PokemonDataLoader
+
+from .synthetic import SyntheticSpec, generate_dataset
+
+# ロギング設定
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SYNTHETIC_DIR = PROJECT_ROOT / "data" / "synthetic"
+IMPORT_SCRIPT = PROJECT_ROOT / "scripts" / "import_to_supabase.sh"
+
+# ru_maxrss の単位（Linux は KiB、macOS はバイト）
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+@dataclass(slots=True)
+class StageResult:
+    """1段階分の計測結果.
+
+    Attributes:
+        scale: ポケモン数
+        stage: 段階名
+        seconds: 経過時間（秒）
+        peak_mb: 段階中のPythonオブジェクトのピーク使用量（MB、tracemalloc無効時は0）
+        max_rss_mb: 段階終了時点までのプロセス最大常駐メモリ（MB、子プロセスは別計上）
+        items: 処理件数
+    """
+
+    scale: int
+    stage: str
+    seconds: float
+    peak_mb: float
+    max_rss_mb: float
+    items: int
+
+    @property
+    def items_per_second(self) -> float:
+        """1秒あたりの処理件数."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+class StageTimer:
+    """段階ごとの処理時間・ピークメモリを記録する."""
+
+    def __init__(self, scale: int, trace_memory: bool = True) -> None:
+        """初期化.
+
+        Args:
+            scale: ポケモン数
+            trace_memory: tracemalloc でPythonオブジェクトのピーク使用量を計測するか
+                （有効にすると処理は遅くなる）
+        """
+        self.scale = scale
+        self.trace_memory = trace_memory
+        self.results: list[StageResult] = []
+
+    @contextmanager
+    def stage(
+        self, name: str, items: Callable[[], int] | int = 0, trace_memory: bool | None = None
+    ) -> Iterator[None]:
+        """段階を計測する.
+
+        Args:
+            name: 段階名
+            items: 処理件数（段階の終了後に評価する関数も可）
+            trace_memory: この段階でピークメモリを計測するか（省略時は初期化時の指定）
+        """
+        logger.info(f"[{self.scale:,}] {name} 開始")
+        trace = self.trace_memory if trace_memory is None else trace_memory
+        if trace:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            peak = 0
+            if trace:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+        result = StageResult(
+            scale=self.scale,
+            stage=name,
+            seconds=seconds,
+            peak_mb=peak / 1024**2,
+            max_rss_mb=_max_rss_mb(name == "import"),
+            items=items() if callable(items) else items,
+        )
+        self.results.append(result)
+        logger.info(
+            f"[{self.scale:,}] {name} 完了: {result.seconds:.2f}秒, "
+            f"ピーク {result.peak_mb:,.1f}MB, 最大RSS {result.max_rss_mb:,.1f}MB"
+        )
+
+
+def _max_rss_mb(children: bool = False) -> float:
+    """プロセス（または終了した子プロセス）の最大常駐メモリをMBで返す."""
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    return resource.getrusage(who).ru_maxrss * _MAXRSS_UNIT / 1024**2
+
+
+def run_scale(
+    spec: SyntheticSpec,
+    base_dir: Path = SYNTHETIC_DIR,
+    reuse: bool = False,
+    run_import: bool = False,
+    trace_memory: bool = True,
+) -> list[StageResult]:
+    """1つの規模でパイプライン全段階を計測する.
+
+    Args:
+        spec: 合成データセットの規模と分布
+        base_dir: 規模ごとのデータを置くディレクトリ（<base_dir>/<ポケモン数>/ 以下）
+        reuse: Trueの場合は生成済みのJSONファイルがあれば再生成しない
+        run_import: Trueの場合はローカル環境への投入（import_to_supabase.sh）も計測する
+        trace_memory: tracemalloc でピークメモリを計測するか
+
+    Returns:
+        段階ごとの計測結果
+    """
+    json_dir = base_dir / str(spec.pokemon) / "pokemon"
+    csv_dir = base_dir / str(spec.pokemon) / "csv_files"
+    timer = StageTimer(spec.pokemon, trace_memory)
+
+    if not (reuse and json_dir.exists() and any(json_dir.glob("*.json"))):
+        # 生成段階はパイプラインの外側のため、時間のみ記録する
+        with timer.stage("generate", items=spec.pokemon, trace_memory=False):
+            generate_dataset(spec, json_dir)
+
+    with timer.stage("load_json", items=spec.pokemon):
+        pokemon_data_list = PokemonDataLoader(json_dir).load_all_json_files()
+
+    builder = CSVBuilder()
+    with timer.stage("collect", items=len(pokemon_data_list)):
+        builder.collect_data(pokemon_data_list)
+    del pokemon_data_list
+
+    with timer.stage("write_csv", items=lambda: builder.row_count("pokemon_moves")):
+        builder.generate_csvs(csv_dir)
+
+    if run_import:
+        # 確認プロンプトの待ち時間を計測に含めないよう --yes で省略し、標準入力も渡さない
+        with timer.stage("import", items=lambda: builder.row_count("pokemon_moves")):
+            subprocess.run(
+                [str(IMPORT_SCRIPT), "--bulk", "--yes"],
+                check=True,
+                stdin=subprocess.DEVNULL,
+                cwd=PROJECT_ROOT,
+                env={**os.environ, "CSV_DIR": str(csv_dir)},
+            )
+
+    return timer.results
+
+
+def format_report(results: list[StageResult]) -> list[str]:
+    """計測結果を表形式の行に整形する."""
+    lines = [
+        f"{'規模':>10} {'段階':<10} {'秒':>9} {'件/秒':>12} {'ピークMB':>10} {'最大RSS MB':>11}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.scale:>10,} {result.stage:<10} {result.seconds:>9.2f} "
+            f"{result.items_per_second:>12,.0f} {result.peak_mb:>10,.1f} "
+            f"{result.max_rss_mb:>11,.1f}"
+        )
+    return lines
+
+
+def main(
+    scales: list[int],
+    seed: int = 0,
+    reuse: bool = False,
+    run_import: bool = False,
+    trace_memory: bool = True,
+    output_path: Path = PROJECT_ROOT / "data" / "benchmark" / "pipeline.json",
+) -> None:
+    """メイン処理.
+
+    規模ごとに別プロセスで計測すると最大RSSが規模ごとに分かれるため、
+    大きな規模を計測する場合は1規模ずつ実行することを推奨する。
+
+    Args:
+        scales: 計測するポケモン数のリスト
+        seed: 乱数シード
+        reuse: 生成済みのJSONファイルを再利用するか
+        run_import: ローカル環境への投入も計測するか
+        trace_memory: tracemalloc でピークメモリを計測するか
+        output_path: 計測結果の保存先
+    """
+    logger.info("=" * 60)
+    logger.info("ポケモンデータベース パイプライン負荷試験")
+    logger.info("=" * 60)
+
+    results: list[StageResult] = []
+    for scale in sorted(scales):
+        results.extend(
+            run_scale(
+                SyntheticSpec(pokemon=scale, seed=seed),
+                reuse=reuse,
+                run_import=run_import,
+                trace_memory=trace_memory,
+            )
+        )
+
+    logger.info("")
+    for line in format_report(results):
+        logger.info(line)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    report: dict[str, Any] = {
+        "seed": seed,
+        "trace_memory": trace_memory,
+        "results": [
+            {**asdict(result), "items_per_second": result.items_per_second} for result in results
+        ],
+    }
+    output_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info(f"\n計測結果を保存しました: {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="合成データセットでJSON読み込み・CSV生成・投入の規模別の処理時間を計測する.",
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=int,
+        default=[10_000],
+        metavar="N",
+        help="計測するポケモン数 (既定: 10000)。例: --scales 10000 100000 1000000",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="乱数シード (既定: 0)。")
+    parser.add_argument(
+        "--reuse",
+        action="store_true",
+        help="data/synthetic/<N>/pokemon/ に生成済みのJSONファイルがあれば再生成しません。",
+    )
+    parser.add_argument(
+        "--import",
+        dest="run_import",
+        action="store_true",
+        help="ローカル環境への一括投入 (import_to_supabase.sh --bulk) も計測します。",
+    )
+    parser.add_argument(
+        "--no-trace-memory",
+        action="store_true",
+        help="tracemalloc によるピークメモリ計測を行いません (処理時間のみを正確に計測)。",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=PROJECT_ROOT / "data" / "benchmark" / "pipeline.json",
+        help="計測結果の保存先 (既定: data/benchmark/pipeline.json)。",
+    )
+
+    parsed = parser.parse_args()
+    main(
+        scales=parsed.scales,
+        seed=parsed.seed,
+        reuse=parsed.reuse,
+        run_import=parsed.run_import,
+        trace_memory=not parsed.no_trace_memory,
+        output_path=parsed.output,
+    )
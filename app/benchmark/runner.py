@@ -0,0 +1,396 @@
+"""クエリベンチマークの実行とベースライン比較.
+
+カタログの各クエリを指定した並列度で繰り返し実行してレイテンシ（p50/p99）を測り、
+`EXPLAIN (ANALYZE, BUFFERS)` の実行計画から使用インデックスとバッファ数を記録します。
+結果はJSONで保存し、ベースラインとの比較に使います。
+
+複数リクエストのクエリ（`follow_ups` を持つもの）は、全リクエストの往復を含めた時間を
+1回のレイテンシとし、実行計画は最初のリクエストのものを記録します。ローカル環境では
+往復の遅延がほぼないため、`network_latency_ms` でリクエストごとの遅延を加算して
+リモート環境の往復回数の差を再現できます。
+"""
+
+import asyncio
+import json
+import logging
+import statistics
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import asyncpg
+
+from .catalogue import BenchmarkQuery
+
+logger = logging.getLogger(__name__)
+
+# ベースラインからこの倍率を超えて遅くなった場合に悪化とみなす
+DEFAULT_REGRESSION_RATIO = 1.2
+
+
+@dataclass(slots=True)
+class QueryResult:
+    """クエリ1件・並列度1つ分の計測結果.
+
+    Attributes:
+        name: クエリ名
+        concurrency: 並列度（同時接続数）
+        iterations: 計測した実行回数
+        rows: 結果の行数（複数リクエストのクエリは最後のリクエストの行数）
+        round_trips: 1回の実行で発行するリクエスト数
+        p50_ms: レイテンシの中央値（ミリ秒）
+        p99_ms: レイテンシの99パーセンタイル（ミリ秒）
+        mean_ms: レイテンシの平均（ミリ秒）
+        max_ms: レイテンシの最大値（ミリ秒）
+        qps: 1秒あたりの実行回数
+        planning_ms: EXPLAIN ANALYZE の計画時間（ミリ秒）
+        execution_ms: EXPLAIN ANALYZE の実行時間（ミリ秒）
+        shared_hit_blocks: 共有バッファから読んだブロック数
+        shared_read_blocks: ディスク（OSキャッシュ）から読んだブロック数
+        indexes_used: 実行計画に現れたインデックス名
+        missing_indexes: 期待したが実行計画に現れなかったインデックス名
+        plan: EXPLAIN (ANALYZE, BUFFERS) のテキスト
+    """
+
+    name: str
+    concurrency: int
+    iterations: int
+    rows: int
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    qps: float
+    planning_ms: float
+    execution_ms: float
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    indexes_used: list[str] = field(default_factory=list)
+    missing_indexes: list[str] = field(default_factory=list)
+    plan: str = ""
+    round_trips: int = 1
+
+    @property
+    def key(self) -> str:
+        """結果・ベースラインのキー（クエリ名@並列度）."""
+        return f"{self.name}@c{self.concurrency}"
+
+
+async def measure_latencies(
+    pool: asyncpg.Pool,
+    query: BenchmarkQuery,
+    iterations: int,
+    concurrency: int,
+    network_latency_ms: float = 0.0,
+) -> tuple[list[float], float, int]:
+    """クエリを並列に繰り返し実行してレイテンシを測る.
+
+    concurrency 個のワーカーがそれぞれ接続を1つ確保し、合計 iterations 回になるまで
+    実行を分担する。
+
+    Args:
+        pool: コネクションプール（max_size は concurrency 以上）
+        query: 対象クエリ
+        iterations: 合計の実行回数
+        concurrency: 並列度
+        network_latency_ms: リクエストごとに加算する往復の遅延（ミリ秒）
+
+    Returns:
+        (各実行のレイテンシ（秒）のリスト, 全体の経過時間（秒）, 結果の行数)
+    """
+    tickets: Iterator[int] = iter(range(iterations))
+    latencies: list[float] = []
+    row_counts: list[int] = []
+
+    async def worker() -> None:
+        async with pool.acquire() as connection:
+            for _ in tickets:
+                started = time.perf_counter()
+                rows = await execute(connection, query, network_latency_ms)
+                latencies.append(time.perf_counter() - started)
+                row_counts.append(len(rows))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started, row_counts[-1] if row_counts else 0
+
+
+async def execute(
+    connection: asyncpg.Connection, query: BenchmarkQuery, network_latency_ms: float = 0.0
+) -> list[asyncpg.Record]:
+    """クエリを実行する（follow_ups を持つ場合は順に実行し、最後の結果を返す）.
+
+    後続のリクエストには、直前の結果の1列目の値のリストを $1 として渡す。
+
+    Args:
+        connection: 接続
+        query: 対象クエリ
+        network_latency_ms: リクエストごとに加算する往復の遅延（ミリ秒）
+
+    Returns:
+        最後のリクエストの結果
+    """
+    rows: list[asyncpg.Record] = []
+    for number, sql in enumerate((query.sql, *query.follow_ups)):
+        if network_latency_ms > 0:
+            await asyncio.sleep(network_latency_ms / 1000)
+        params = query.params if number == 0 else ([row[0] for row in rows],)
+        rows = await connection.fetch(sql, *params)
+    return rows
+
+
+async def explain(connection: asyncpg.Connection, query: BenchmarkQuery) -> dict[str, Any]:
+    """EXPLAIN (ANALYZE, BUFFERS) を取得する.
+
+    Returns:
+        planning_ms / execution_ms / shared_hit_blocks / shared_read_blocks /
+        indexes_used / plan（テキスト）をキーに持つ辞書
+    """
+    raw = await connection.fetchval(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.sql}", *query.params
+    )
+    document = json.loads(raw) if isinstance(raw, str) else raw
+    root = document[0]
+    text_rows = await connection.fetch(f"EXPLAIN (ANALYZE, BUFFERS) {query.sql}", *query.params)
+    return {
+        "planning_ms": float(root.get("Planning Time", 0.0)),
+        "execution_ms": float(root.get("Execution Time", 0.0)),
+        "shared_hit_blocks": int(root["Plan"].get("Shared Hit Blocks", 0)),
+        "shared_read_blocks": int(root["Plan"].get("Shared Read Blocks", 0)),
+        "indexes_used": sorted(set(_index_names(root["Plan"]))),
+        "plan": "\n".join(row[0] for row in text_rows),
+    }
+
+
+def _index_names(node: dict[str, Any]) -> Iterator[str]:
+    """実行計画ノード以下に現れるインデックス名を列挙する."""
+    if "Index Name" in node:
+        yield node["Index Name"]
+    for child in node.get("Plans", ()):
+        yield from _index_names(child)
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """ソート済みの値から最近傍法でパーセンタイルを求める."""
+    position = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[position]
+
+
+async def run_query(
+    pool: asyncpg.Pool,
+    query: BenchmarkQuery,
+    concurrency: int,
+    iterations: int,
+    warmup: int,
+    network_latency_ms: float = 0.0,
+) -> QueryResult:
+    """クエリ1件を計測する.
+
+    Args:
+        pool: コネクションプール
+        query: 対象クエリ
+        concurrency: 並列度
+        iterations: 計測する実行回数
+        warmup: 計測前に捨てる実行回数（キャッシュ・プリペアドステートメントを温める）
+        network_latency_ms: リクエストごとに加算する往復の遅延（ミリ秒）
+
+    Returns:
+        計測結果
+    """
+    async with pool.acquire() as connection:
+        for _ in range(warmup):
+            await execute(connection, query)
+        plan = await explain(connection, query)
+
+    latencies, elapsed, rows = await measure_latencies(
+        pool, query, iterations, concurrency, network_latency_ms
+    )
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    missing = [name for name in query.expected_indexes if name not in plan["indexes_used"]]
+    if missing:
+        logger.warning(f"  {query.name}: 期待したインデックスが使われていません: {missing}")
+
+    return QueryResult(
+        name=query.name,
+        concurrency=concurrency,
+        iterations=len(latencies_ms),
+        rows=rows,
+        p50_ms=_percentile(latencies_ms, 50),
+        p99_ms=_percentile(latencies_ms, 99),
+        mean_ms=statistics.fmean(latencies_ms),
+        max_ms=latencies_ms[-1],
+        qps=len(latencies_ms) / elapsed if elapsed > 0 else 0.0,
+        missing_indexes=missing,
+        round_trips=query.round_trips,
+        **plan,
+    )
+
+
+async def run_benchmark(
+    dsn: str,
+    queries: Iterable[BenchmarkQuery],
+    concurrency_levels: Iterable[int] = (1, 8),
+    iterations: int = 200,
+    warmup: int = 10,
+    network_latency_ms: float = 0.0,
+) -> dict[str, Any]:
+    """カタログ全体を計測する.
+
+    Args:
+        dsn: 接続文字列
+        queries: 対象クエリ
+        concurrency_levels: 計測する並列度
+        iterations: クエリ・並列度ごとの実行回数
+        warmup: クエリごとの計測前の実行回数
+        network_latency_ms: リクエストごとに加算する往復の遅延（ミリ秒）
+
+    Returns:
+        計測結果（save_results / compare_results の入力形式）
+
+    Raises:
+        ValueError: 実行回数・並列度が1未満の場合
+    """
+    levels = sorted(set(concurrency_levels))
+    if iterations < 1 or not levels or levels[0] < 1:
+        msg = f"実行回数・並列度は1以上を指定してください: {iterations}, {levels}"
+        raise ValueError(msg)
+
+    queries = list(queries)
+    pool = await asyncpg.create_pool(dsn, min_size=1, max_size=levels[-1])
+    try:
+        async with pool.acquire() as connection:
+            server_version = await connection.fetchval("SHOW server_version")
+            sv_indexes = [
+                row["indexname"]
+                for row in await connection.fetch(
+                    "SELECT indexname FROM pg_indexes WHERE schemaname = 'sv' ORDER BY indexname"
+                )
+            ]
+
+        results: dict[str, dict[str, Any]] = {}
+        for number, query in enumerate(queries, start=1):
+            logger.info(f"[{number}/{len(queries)}] {query.name}: {query.description}")
+            for concurrency in levels:
+                result = await run_query(
+                    pool, query, concurrency, iterations, warmup, network_latency_ms
+                )
+                logger.info(
+                    f"  c={concurrency:<3} p50={result.p50_ms:8.3f}ms "
+                    f"p99={result.p99_ms:8.3f}ms qps={result.qps:9.1f} rows={result.rows} "
+                    f"requests={result.round_trips}"
+                )
+                results[result.key] = asdict(result)
+    finally:
+        await pool.close()
+
+    used = {name for result in results.values() for name in result["indexes_used"]}
+    return {
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "server_version": server_version,
+        "settings": {
+            "iterations": iterations,
+            "warmup": warmup,
+            "concurrency": levels,
+            "network_latency_ms": network_latency_ms,
+        },
+        "results": results,
+        "unused_indexes": [name for name in sv_indexes if name not in used],
+    }
+
+
+def save_results(results: dict[str, Any], output_path: Path) -> Path:
+    """計測結果をJSONファイルに保存する."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    return output_path
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    """保存した計測結果を読み込む.
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+    """
+    if not path.exists():
+        msg = f"計測結果ファイルが存在しません: {path}"
+        raise FileNotFoundError(msg)
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare_results(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    regression_ratio: float = DEFAULT_REGRESSION_RATIO,
+) -> list[str]:
+    """ベースラインと比較した結果の行を返す.
+
+    p50/p99 の倍率と、使用インデックスの変化を表示する。p50 または p99 が
+    regression_ratio 倍を超えて悪化した行には「悪化」を付ける。
+
+    Args:
+        current: 今回の計測結果
+        baseline: ベースラインの計測結果
+        regression_ratio: 悪化とみなす倍率
+
+    Returns:
+        表示用の行のリスト
+    """
+    lines = [f"{'クエリ':<32} {'p50 (ms)':>21} {'p99 (ms)':>21}  判定"]
+    baseline_results = baseline.get("results", {})
+    for key, result in current["results"].items():
+        before = baseline_results.get(key)
+        if before is None:
+            lines.append(f"{key:<32} {result['p50_ms']:>21.3f} {result['p99_ms']:>21.3f}  新規")
+            continue
+
+        p50_ratio = _ratio(result["p50_ms"], before["p50_ms"])
+        p99_ratio = _ratio(result["p99_ms"], before["p99_ms"])
+        verdict = "悪化" if max(p50_ratio, p99_ratio) > regression_ratio else ""
+        lines.append(
+            f"{key:<32} "
+            f"{before['p50_ms']:>7.3f} -> {result['p50_ms']:>7.3f} ({p50_ratio:4.2f}x) "
+            f"{before['p99_ms']:>7.3f} -> {result['p99_ms']:>7.3f} ({p99_ratio:4.2f}x)  {verdict}"
+        )
+        if result["indexes_used"] != before["indexes_used"]:
+            lines.append(f"    インデックス: {before['indexes_used']} -> {result['indexes_used']}")
+
+    for key in baseline_results.keys() - current["results"].keys():
+        lines.append(f"{key:<32} （今回の計測に含まれていません）")
+    return lines
+
+
+def compare_round_trips(results: dict[str, Any]) -> list[str]:
+    """サーバー側の検索関数（rpc_*）と、同じ結果の複数リクエスト版（client_*）を並べた行を返す.
+
+    Args:
+        results: 計測結果
+
+    Returns:
+        表示用の行のリスト（比較できる組がない場合は空）
+    """
+    lines: list[str] = []
+    for key, rpc in results["results"].items():
+        if not key.startswith("rpc_"):
+            continue
+        client = results["results"].get(key.replace("rpc_", "client_", 1))
+        if client is None:
+            continue
+        if not lines:
+            lines.append(f"{'クエリ':<32} {'リクエスト数':>12} {'p50 (ms)':>21} {'p99 (ms)':>21}")
+        lines.append(
+            f"{key.removeprefix('rpc_'):<32} "
+            f"{client['round_trips']:>5} -> {rpc['round_trips']:<5} "
+            f"{client['p50_ms']:>7.3f} -> {rpc['p50_ms']:>7.3f} "
+            f"({_ratio(rpc['p50_ms'], client['p50_ms']):4.2f}x) "
+            f"{client['p99_ms']:>7.3f} -> {rpc['p99_ms']:>7.3f} "
+            f"({_ratio(rpc['p99_ms'], client['p99_ms']):4.2f}x)"
+        )
+    return lines
+
+
+def _ratio(value: float, base: float) -> float:
+    """base に対する value の倍率を返す（base が0の場合は1とみなす）."""
+    return value / base if base > 0 else 1.0
@@ -0,0 +1,272 @@
+"""負荷試験用の合成データセット生成.
+
+スクレイピング結果（data/pokemon/*.json）と同じ形式のJSONファイルを、任意の規模で
+生成します。実データ（約1,200匹・技約900・特性約300）の傾向に合わせ、技・特性の
+習得者数は順位に反比例する偏り（Zipf分布）を持たせます。「まもる」のように
+ほぼ全員が覚える技と、数匹しか覚えない技が混在するため、重複排除や関連テーブルの
+件数が実データと同じように伸びます。
+
+Example:
+    spec = SyntheticSpec(pokemon=100_000, seed=1)
+    generate_dataset(spec, Path("data/synthetic/100000/pokemon"))
+"""
+
+import logging
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+
+from app.scraper.output import save_pokemon_json
+
+logger = logging.getLogger(__name__)
+
+# タイプ（supabase/migrations の CHECK 制約と同じ）
+_TYPES: tuple[str, ...] = (
+    "ノーマル",
+    "ほのお",
+    "みず",
+    "でんき",
+    "くさ",
+    "こおり",
+    "かくとう",
+    "どく",
+    "じめん",
+    "ひこう",
+    "エスパー",
+    "むし",
+    "いわ",
+    "ゴースト",
+    "ドラゴン",
+    "あく",
+    "はがね",
+    "フェアリー",
+)
+
+# 名前に使う音節（濁音・拗音を含むカタカナ。個数は7と互いに素）
+_SYLLABLES: tuple[str, ...] = tuple(
+    "ア イ ウ エ オ カ キ ク ケ コ サ シ ス セ ソ タ チ ツ テ ト ナ ニ ヌ ネ ノ "
+    "ハ ヒ フ ヘ ホ マ ミ ム メ モ ヤ ユ ヨ ラ リ ル レ ロ ワ ン "
+    "ガ ギ グ ゲ ゴ ザ ジ ズ ゼ ゾ ダ デ ド バ ビ ブ ベ ボ パ ピ プ ペ ポ "
+    "キャ キュ ショ チュ ジャ リュ ニョ ヴァ".split()
+)
+
+# 技の効果説明のテンプレート（実データの表記に合わせる）
+_MOVE_EFFECTS: tuple[str, ...] = (
+    "通常攻撃。",
+    "10%の確率で相手を『まひ』状態にする。",
+    "30%の確率で相手をひるませる。",
+    "優先度:+1の先制技。",
+    "優先度:+2。必ず先制できる。",
+    "優先度:-6。相手を交代させる。",
+    "急所に当たりやすい。",
+    "与えたダメージの1/3を自分も受ける。",
+    "自分の『こうげき』『すばやさ』ランクが1段階ずつ上がる。",
+    "相手の『ぼうぎょ』ランクを1段階下げる。",
+    "2〜5回連続で攻撃する。",
+    "",
+)
+_DAMAGE_CLASSES: tuple[str | None, ...] = ("physical", "special", "status", None)
+_DAMAGE_CLASS_WEIGHTS: tuple[float, ...] = (0.45, 0.35, 0.19, 0.01)
+
+# 実データの規模（1ポケモンあたりの技・特性の種類数の目安）
+_MOVES_PER_POKEMON = 0.75
+_ABILITIES_PER_POKEMON = 0.25
+_MIN_MOVES = 900
+_MIN_ABILITIES = 300
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticSpec:
+    """合成データセットの規模と分布.
+
+    Attributes:
+        pokemon: ポケモン数（JSONファイル数）
+        moves: 技の種類数（省略時はポケモン数に応じて実データと同じ比率）
+        abilities: 特性の種類数（省略時はポケモン数に応じて実データと同じ比率）
+        learnset_mean: 1匹あたりの平均習得技数
+        forms_per_species: 1図鑑番号あたりの平均フォーム数
+        zipf_exponent: 技・特性の習得者数の偏り（大きいほど一部の技に集中する）
+        seed: 乱数シード
+    """
+
+    pokemon: int
+    moves: int | None = None
+    abilities: int | None = None
+    learnset_mean: int = 70
+    forms_per_species: float = 1.2
+    zipf_exponent: float = 0.9
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        """値の範囲を検証する."""
+        if self.pokemon < 1:
+            msg = f"ポケモン数は1以上を指定してください: {self.pokemon}"
+            raise ValueError(msg)
+        if self.learnset_mean < 1:
+            msg = f"平均習得技数は1以上を指定してください: {self.learnset_mean}"
+            raise ValueError(msg)
+        if self.forms_per_species < 1:
+            msg = f"平均フォーム数は1以上を指定してください: {self.forms_per_species}"
+            raise ValueError(msg)
+
+    @property
+    def move_count(self) -> int:
+        """技の種類数."""
+        if self.moves is not None:
+            return self.moves
+        return max(_MIN_MOVES, int(self.pokemon * _MOVES_PER_POKEMON))
+
+    @property
+    def ability_count(self) -> int:
+        """特性の種類数."""
+        if self.abilities is not None:
+            return self.abilities
+        return max(_MIN_ABILITIES, int(self.pokemon * _ABILITIES_PER_POKEMON))
+
+
+def synthetic_name(number: int, offset: int = 0) -> str:
+    """番号から一意なカタカナ名を作る.
+
+    番号を音節数を基数とする位取りで3桁以上の音節列に変換する。各桁は下の桁の値に
+    応じてずらすため、連番でも似た名前が並ばない（ずらし方は可逆なので一意性は保たれる）。
+
+    Args:
+        number: 0以上の番号
+        offset: 名前の種類ごとのずらし量
+
+    Returns:
+        3音節以上のカタカナ名
+    """
+    base = len(_SYLLABLES)
+    digits: list[int] = []
+    value = number
+    while value or len(digits) < 3:
+        digits.append(value % base)
+        value //= base
+
+    syllables: list[str] = []
+    shift = offset
+    for digit in digits:
+        syllables.append(_SYLLABLES[(digit * 7 + shift) % base])
+        shift = shift * 31 + digit + 1
+    return "".join(syllables)
+
+
+def _zipf_cum_weights(count: int, exponent: float) -> list[float]:
+    """順位 1..count に反比例する重みの累積和を返す（random.choices 用）."""
+    return list(accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+def _sample_unique(rng: random.Random, count: int, cum_weights: list[float], k: int) -> list[int]:
+    """0..count-1 から重み付きで重複なしに最大k個の番号を選ぶ.
+
+    重複ありで多めに引いてから重複を除く（重み付き非復元抽出の近似）。
+    """
+    picks = rng.choices(range(count), cum_weights=cum_weights, k=int(k * 1.5) + 1)
+    return list(dict.fromkeys(picks))[:k]
+
+
+def iter_bundles(spec: SyntheticSpec) -> Iterator[dict[str, Any]]:
+    """合成したポケモン1匹分のJSONデータを順に返す.
+
+    Args:
+        spec: 規模と分布
+
+    Yields:
+        data/pokemon/*.json と同じ構造の辞書
+    """
+    rng = random.Random(spec.seed)
+
+    moves = [
+        {
+            "name_ja": synthetic_name(i, offset=1),
+            "type_name": rng.choice(_TYPES),
+            "damage_class": rng.choices(_DAMAGE_CLASSES, _DAMAGE_CLASS_WEIGHTS)[0],
+            "power": rng.choice((None, 40, 60, 70, 80, 90, 100, 120, 150)),
+            "accuracy": rng.choice((None, 70, 80, 85, 90, 95, 100, 100, 100)),
+            "pp": rng.choice((5, 10, 15, 20, 25, 30, 35, 40)),
+            "priority": rng.choices((0, 1, 2, -6), (0.9, 0.05, 0.03, 0.02))[0],
+            "effect_text": rng.choice(_MOVE_EFFECTS),
+        }
+        for i in range(spec.move_count)
+    ]
+    abilities = [
+        {"name_ja": synthetic_name(i, offset=2), "effect_text": "合成データの特性。"}
+        for i in range(spec.ability_count)
+    ]
+    move_weights = _zipf_cum_weights(len(moves), spec.zipf_exponent)
+    ability_weights = _zipf_cum_weights(len(abilities), spec.zipf_exponent)
+
+    for number in range(spec.pokemon):
+        type_primary = rng.choice(_TYPES)
+        type_secondary = rng.choice((None, *_TYPES))
+        if type_secondary == type_primary:
+            type_secondary = None
+        stats = [max(5, min(255, int(rng.gauss(75, 28)))) for _ in range(6)]
+        pokemon = {
+            "pokedex_no": int(number / spec.forms_per_species) + 1,
+            "name_ja": synthetic_name(number),
+            "name_en": f"Synthetic{number}",
+            "form_label": None,
+            "type_primary": type_primary,
+            "type_secondary": type_secondary,
+            "height_dm": rng.randint(1, 200),
+            "weight_hg": rng.randint(1, 9999),
+            "low_kick_power": rng.choice((20, 40, 60, 80, 100, 120)),
+            "is_legendary": rng.random() < 0.05,
+            "is_mythical": rng.random() < 0.02,
+            "base_hp": stats[0],
+            "base_atk": stats[1],
+            "base_def": stats[2],
+            "base_spa": stats[3],
+            "base_spd": stats[4],
+            "base_spe": stats[5],
+            "remarks": None,
+        }
+
+        ability_count = rng.choices((1, 2, 3), (0.1, 0.3, 0.6))[0]
+        chosen_abilities = [
+            abilities[i]
+            for i in _sample_unique(rng, len(abilities), ability_weights, ability_count)
+        ]
+        learnset_size = max(1, int(rng.gauss(spec.learnset_mean, spec.learnset_mean / 3)))
+        chosen_moves = [
+            moves[i] for i in _sample_unique(rng, len(moves), move_weights, learnset_size)
+        ]
+
+        yield {
+            "pokemon": pokemon,
+            "abilities": [
+                {**ability, "is_hidden": position == 2}
+                for position, ability in enumerate(chosen_abilities)
+            ],
+            "moves": [{**move, "notes": None} for move in chosen_moves],
+        }
+
+
+def generate_dataset(spec: SyntheticSpec, output_dir: Path) -> int:
+    """合成データセットをJSONファイルに書き出す.
+
+    ファイル名・書式はスクレイピングツールと同じ（app.scraper.output.save_pokemon_json）。
+
+    Args:
+        spec: 規模と分布
+        output_dir: 出力ディレクトリ
+
+    Returns:
+        書き出したファイル数
+    """
+    logger.info(
+        f"合成データ生成: ポケモン{spec.pokemon:,}匹, 技{spec.move_count:,}種, "
+        f"特性{spec.ability_count:,}種 -> {output_dir}"
+    )
+    written = 0
+    for bundle in iter_bundles(spec):
+        save_pokemon_json(bundle, str(output_dir))
+        written += 1
+        if written % 10_000 == 0:
+            logger.info(f"  {written:,} / {spec.pokemon:,}件")
+    return written
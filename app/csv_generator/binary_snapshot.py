@@ -0,0 +1,418 @@
+"""データセット全体のバイナリスナップショット.
+
+CSVの解析やデータベースへの問い合わせの代わりに、5テーブル分のデータを1つのバイナリファイル
+（data/pokemon.snapshot）に書き出し、読み込み側は mmap で開いてそのまま参照します。
+解析処理がないため短命なプロセスでも数ミリ秒で開け、同じファイルを開いた複数のワーカーは
+OS のページキャッシュを共有します（プロセスごとのコピーは発生しない）。
+
+ファイル形式（リトルエンディアン）:
+    ヘッダー（64バイト）    マジック・形式バージョン・フィードのバージョン・セクション数・
+                            作成日時・本体（ディレクトリ以降）の SHA-256
+    セクションディレクトリ  セクション名・要素の型・要素数・オフセット・バイト数
+    セクション（8バイト境界） 固定長の配列
+
+セクション:
+    strings.offsets / strings.data      文字列テーブル（UTF-8、重複は1つにまとめる）
+    <マスタ>.<カラム>                   カラムごとの固定長配列（INTEGER は int32、SMALLINT は
+                                        int16、BOOLEAN は uint8、文字列は文字列テーブルの番号）
+    <マスタ>.name_index                 name_ja の UTF-8 バイト順に並べた行番号（二分探索用）
+    <関連>.offsets / <関連>.targets     ポケモンの行番号ごとの関連先の行番号（CSR 形式）
+    <関連>.reverse_offsets / reverse_targets  関連先の行番号ごとのポケモンの行番号
+    pokemon_abilities.is_hidden          targets と同じ並びの隠れ特性フラグ
+
+NULL は型ごとの番兵値（整数は最小値、真偽値は 255、文字列は 0xFFFFFFFF）で表します。
+
+Example:
+    with DatasetSnapshot.open(Path("data/pokemon.snapshot")) as snapshot:
+        row = snapshot.find("pokemon", "ガブリアス")
+        snapshot.value("pokemon", "base_spe", row)
+        moves = snapshot.related("pokemon_moves", row)
+        [snapshot.value("moves", "name_ja", move) for move in moves]
+"""
+
+import bisect
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+from .schema import TABLE_COLUMNS, TABLE_RULES
+
+if TYPE_CHECKING:
+    # 読み込み側（DatasetSnapshot）が pydantic のモデルを読み込まないよう、型注釈でのみ参照する
+    from .csv_builder import CSVBuilder
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SNAPSHOT_PATH = PROJECT_ROOT / "data" / "pokemon.snapshot"
+
+MAGIC = b"PKMNSNAP"
+FORMAT_VERSION = 1
+
+# マジック, 形式バージョン, 変更フィードの feed_version, セクション数, 作成日時（UNIX秒）, SHA-256
+_HEADER = struct.Struct("<8sIIIq32s4x")
+# セクション名, 要素の型（array の型コード）, 要素数, オフセット, バイト数
+_SECTION = struct.Struct("<48sc3xIQQ")
+_ALIGNMENT = 8
+
+# カラムの種類 -> array の型コード
+_TYPECODES = {"integer": "i", "smallint": "h", "boolean": "B", "text": "I"}
+# 型コード -> NULL の番兵値
+_NULLS = {"i": -(2**31), "h": -(2**15), "B": 255, "I": 2**32 - 1}
+
+# マスタテーブル（name_ja で引ける）と、関連テーブル -> 関連先のマスタ
+MASTER_TABLES = ("abilities", "moves", "pokemon")
+RELATION_TARGETS = {"pokemon_abilities": "abilities", "pokemon_moves": "moves"}
+
+
+@dataclass(frozen=True, slots=True)
+class _Section:
+    """セクションディレクトリの1件."""
+
+    typecode: str
+    count: int
+    offset: int
+
+
+# ========================================
+# 書き込み
+# ========================================
+
+
+def write_snapshot(
+    builder: "CSVBuilder", output_path: Path = SNAPSHOT_PATH, feed_version: int = 0
+) -> Path:
+    """ビルド結果をバイナリスナップショットとして出力する.
+
+    一時ファイルに書き込んでから置き換えるため、出力中も既存のファイルを mmap している
+    プロセスは置き換え前の内容を読み続けられる。
+
+    Args:
+        builder: データ収集済みのビルダー
+        output_path: 出力先
+        feed_version: ヘッダーに記録する変更フィードの feed_version（sv.dataset_version とは別）
+
+    Returns:
+        出力したファイルのパス
+
+    Raises:
+        ValueError: NULL の番兵値と同じ値が含まれる場合
+    """
+    strings: dict[str, int] = {}
+    sections: dict[str, array] = {}
+
+    def string_ref(value: str | None) -> int:
+        if value is None:
+            return _NULLS["I"]
+        return strings.setdefault(value, len(strings))
+
+    row_of: dict[str, dict[int, int]] = {}
+    for table_name in MASTER_TABLES:
+        rows = list(builder.iter_rows(table_name))
+        row_of[table_name] = {row[0]: i for i, row in enumerate(rows)}
+        for position, (column, rule) in enumerate(
+            zip(TABLE_COLUMNS[table_name], TABLE_RULES[table_name], strict=True)
+        ):
+            typecode = _TYPECODES[rule.kind]
+            values = [row[position] for row in rows]
+            if typecode == "I":
+                values = [string_ref(value) for value in values]
+            else:
+                values = [_to_fixed(value, typecode, table_name, column) for value in values]
+            sections[f"{table_name}.{column}"] = array(typecode, values)
+        name_position = TABLE_COLUMNS[table_name].index("name_ja")
+        sections[f"{table_name}.name_index"] = array(
+            "I",
+            sorted(range(len(rows)), key=lambda i: rows[i][name_position].encode("utf-8")),
+        )
+
+    pokemon_count = len(row_of["pokemon"])
+    for relation, target_table in RELATION_TARGETS.items():
+        pokemon_rows = row_of["pokemon"]
+        target_rows = row_of[target_table]
+        pairs = [
+            (pokemon_rows[row[0]], target_rows[row[1]], row[2:])
+            for row in builder.iter_rows(relation)
+        ]
+        # ポケモンの行番号順（同じポケモン内は元の順）に並べる
+        pairs.sort(key=lambda pair: pair[0])
+        sections[f"{relation}.offsets"] = _csr_offsets((pair[0] for pair in pairs), pokemon_count)
+        sections[f"{relation}.targets"] = array("I", (pair[1] for pair in pairs))
+        if relation == "pokemon_abilities":
+            sections[f"{relation}.is_hidden"] = array("B", (int(pair[2][0]) for pair in pairs))
+        reverse = sorted(pairs, key=lambda pair: (pair[1], pair[0]))
+        sections[f"{relation}.reverse_offsets"] = _csr_offsets(
+            (pair[1] for pair in reverse), len(target_rows)
+        )
+        sections[f"{relation}.reverse_targets"] = array("I", (pair[0] for pair in reverse))
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = array("I", [0])
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    sections["strings.offsets"] = string_offsets
+    sections["strings.data"] = array("B", b"".join(encoded))
+
+    if sys.byteorder != "little":
+        for values in sections.values():
+            values.byteswap()
+
+    body = _layout(sections)
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        feed_version,
+        len(sections),
+        int(datetime.now().timestamp()),
+        hashlib.sha256(body).digest(),
+    )
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = output_path.with_name(f".{output_path.name}.tmp")
+    temporary.write_bytes(header + body)
+    os.replace(temporary, output_path)
+    logger.info(
+        f"バイナリスナップショット生成完了: {output_path} "
+        f"({output_path.stat().st_size:,} bytes, 文字列 {len(strings):,}件)"
+    )
+    return output_path
+
+
+def _to_fixed(value: Any, typecode: str, table_name: str, column: str) -> int:
+    """数値・真偽値を固定長の値にする（None は番兵値）."""
+    if value is None:
+        return _NULLS[typecode]
+    value = int(value)
+    if value == _NULLS[typecode]:
+        msg = f"NULLの番兵値と同じ値は格納できません: {table_name}.{column} = {value}"
+        raise ValueError(msg)
+    return value
+
+
+def _csr_offsets(keys: Iterator[int], size: int) -> array:
+    """行番号順に並んだキーから CSR 形式のオフセット配列（要素数 size + 1）を作る."""
+    counts = [0] * (size + 1)
+    for key in keys:
+        counts[key + 1] += 1
+    for i in range(size):
+        counts[i + 1] += counts[i]
+    return array("I", counts)
+
+
+def _layout(sections: dict[str, array]) -> bytes:
+    """セクションディレクトリとセクションを連結する（オフセットはファイル先頭から）."""
+    position = _HEADER.size + _SECTION.size * len(sections)
+    directory = bytearray()
+    chunks: list[bytes] = []
+    for name, values in sections.items():
+        padding = -position % _ALIGNMENT
+        chunks.append(b"\0" * padding)
+        position += padding
+        data = values.tobytes()
+        directory += _SECTION.pack(
+            name.encode("ascii"), values.typecode.encode("ascii"), len(values), position, len(data)
+        )
+        chunks.append(data)
+        position += len(data)
+    return bytes(directory) + b"".join(chunks)
+
+
+# ========================================
+# 読み込み
+# ========================================
+
+
+class DatasetSnapshot:
+    """mmap したバイナリスナップショット.
+
+    数値カラム・関連の配列はファイルのページを直接参照する memoryview として返す
+    （コピーしない）。返した memoryview を保持したままでは close() できない。
+    """
+
+    def __init__(self, path: Path, verify: bool = False) -> None:
+        """ファイルを開く.
+
+        Args:
+            path: スナップショットのパス
+            verify: Trueの場合は本体の SHA-256 を検証する（全ページを読み込む）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            ValueError: 形式が異なる・チェックサムが一致しない場合
+        """
+        if sys.byteorder != "little":
+            msg = "バイナリスナップショットの読み込みはリトルエンディアン環境のみ対応しています"
+            raise ValueError(msg)
+
+        self.path = path
+        with path.open("rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        if len(self._buffer) < _HEADER.size:
+            self.close()
+            msg = f"バイナリスナップショットではありません: {path}"
+            raise ValueError(msg)
+
+        magic, format_version, feed_version, section_count, created_at, checksum = (
+            _HEADER.unpack_from(self._buffer)
+        )
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            self.close()
+            msg = f"バイナリスナップショットの形式が異なります: {path} (形式 {format_version})"
+            raise ValueError(msg)
+        self.format_version: int = format_version
+        self.feed_version: int = feed_version
+        self.created_at = datetime.fromtimestamp(created_at).astimezone()
+        self.checksum: bytes = checksum
+        if verify and not self.verify():
+            self.close()
+            msg = f"バイナリスナップショットのチェックサムが一致しません: {path}"
+            raise ValueError(msg)
+
+        self._sections: dict[str, _Section] = {}
+        for i in range(section_count):
+            name, typecode, count, offset, _ = _SECTION.unpack_from(
+                self._buffer, _HEADER.size + _SECTION.size * i
+            )
+            self._sections[name.rstrip(b"\0").decode("ascii")] = _Section(
+                typecode.decode("ascii"), count, offset
+            )
+        self._views: dict[str, memoryview] = {}
+        self._string_offsets = self.section("strings.offsets")
+        self._string_data = self.section("strings.data")
+
+    @classmethod
+    def open(cls, path: Path = SNAPSHOT_PATH, verify: bool = False) -> Self:
+        """ファイルを開く（with 文で使う）."""
+        return cls(path, verify)
+
+    def __enter__(self) -> Self:
+        """with 文の開始."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """with 文の終了時に close() する."""
+        self.close()
+
+    def close(self) -> None:
+        """mmap を閉じる."""
+        for view in getattr(self, "_views", {}).values():
+            view.release()
+        self._views = {}
+        self._buffer.release()
+        self._mmap.close()
+
+    def verify(self) -> bool:
+        """本体（セクションディレクトリ以降）の SHA-256 がヘッダーと一致するか."""
+        return hashlib.sha256(self._buffer[_HEADER.size :]).digest() == self.checksum
+
+    # ========================================
+    # 参照
+    # ========================================
+
+    def section(self, name: str) -> memoryview:
+        """セクションの配列（ファイルのページを直接参照する memoryview）.
+
+        Raises:
+            KeyError: 未知のセクション名が指定された場合
+        """
+        view = self._views.get(name)
+        if view is None:
+            if name not in self._sections:
+                msg = f"未知のセクションです: {name}"
+                raise KeyError(msg)
+            section = self._sections[name]
+            size = struct.calcsize(section.typecode) * section.count
+            view = self._buffer[section.offset : section.offset + size].cast(section.typecode)
+            self._views[name] = view
+        return view
+
+    def row_count(self, table_name: str) -> int:
+        """テーブルの行数."""
+        if table_name in RELATION_TARGETS:
+            return len(self.section(f"{table_name}.targets"))
+        return len(self.section(f"{table_name}.id"))
+
+    def string(self, ref: int) -> str | None:
+        """文字列テーブルの番号から文字列を取り出す（番兵値は None）."""
+        if ref == _NULLS["I"]:
+            return None
+        start, end = self._string_offsets[ref], self._string_offsets[ref + 1]
+        return str(self._string_data[start:end], "utf-8")
+
+    def value(self, table_name: str, column: str, row: int) -> Any:
+        """マスタテーブルの1セルの値（NULL は None）."""
+        view = self.section(f"{table_name}.{column}")
+        raw = view[row]
+        if view.format == "I":
+            return self.string(raw)
+        if raw == _NULLS[view.format]:
+            return None
+        return bool(raw) if view.format == "B" else raw
+
+    def find(self, table_name: str, name: str) -> int | None:
+        """name_ja から行番号を二分探索する（見つからない場合は None）."""
+        index = self.section(f"{table_name}.name_index")
+        names = self.section(f"{table_name}.name_ja")
+        key = name.encode("utf-8")
+        position = bisect.bisect_left(index, key, key=lambda row: self._string_bytes(names[row]))
+        if position < len(index) and self._string_bytes(names[index[position]]) == key:
+            return index[position]
+        return None
+
+    def related(self, relation: str, pokemon_row: int) -> memoryview:
+        """ポケモンの行番号から関連先（特性・技）の行番号の配列."""
+        offsets = self.section(f"{relation}.offsets")
+        return self.section(f"{relation}.targets")[offsets[pokemon_row] : offsets[pokemon_row + 1]]
+
+    def reverse_related(self, relation: str, target_row: int) -> memoryview:
+        """関連先（特性・技）の行番号からポケモンの行番号の配列."""
+        offsets = self.section(f"{relation}.reverse_offsets")
+        return self.section(f"{relation}.reverse_targets")[
+            offsets[target_row] : offsets[target_row + 1]
+        ]
+
+    def iter_rows(self, table_name: str) -> Iterator[tuple[Any, ...]]:
+        """テーブルの行を CSVBuilder.iter_rows() と同じID・カラム順で返す.
+
+        関連テーブルはポケモンの行番号順に返す。
+
+        Raises:
+            KeyError: 未知のテーブル名が指定された場合
+        """
+        if table_name not in TABLE_COLUMNS:
+            msg = f"未知のテーブルです: {table_name}"
+            raise KeyError(msg)
+
+        if table_name in RELATION_TARGETS:
+            pokemon_ids = self.section("pokemon.id")
+            target_ids = self.section(f"{RELATION_TARGETS[table_name]}.id")
+            offsets = self.section(f"{table_name}.offsets")
+            targets = self.section(f"{table_name}.targets")
+            hidden = (
+                self.section("pokemon_abilities.is_hidden")
+                if table_name == "pokemon_abilities"
+                else None
+            )
+            for pokemon_row in range(len(offsets) - 1):
+                for position in range(offsets[pokemon_row], offsets[pokemon_row + 1]):
+                    pair = (pokemon_ids[pokemon_row], target_ids[targets[position]])
+                    yield pair if hidden is None else (*pair, bool(hidden[position]))
+            return
+
+        columns: Sequence[str] = TABLE_COLUMNS[table_name]
+        for row in range(self.row_count(table_name)):
+            yield tuple(self.value(table_name, column, row) for column in columns)
+
+    def _string_bytes(self, ref: int) -> bytes:
+        """文字列テーブルの番号から UTF-8 のバイト列を取り出す."""
+        return bytes(self._string_data[self._string_offsets[ref] : self._string_offsets[ref + 1]])
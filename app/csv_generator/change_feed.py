@@ -0,0 +1,272 @@
+"""ビルド間の変更フィード.
+
+CSV生成のたびに、出力先に残っている前回のCSVと今回のビルド結果を比較し、追加・削除・変更された
+特性・技・ポケモンと、ポケモン-特性・ポケモン-技の組を JSONL で data/changes/ に出力します。
+下流のキャッシュや MCP クライアントは、全件を破棄する代わりにフィードに含まれるキーだけを
+無効化・再取得できます。
+
+ID は特性・技の追加で名前順に振り直されるため、比較には自然キー（name_ja、関連テーブルは
+名前の組）を使います。
+
+フィードの形式（1行1レコード、先頭行はビルド全体の情報）:
+    {"feed_version": 5, "entity": "dataset", "op": "build", "previous_feed_version": 4, ...}
+    {"feed_version": 5, "entity": "pokemon", "op": "modified", "key": "ピカチュウ",
+     "fields": {"base_spe": [90, 110]}}
+    {"feed_version": 5, "entity": "pokemon_moves", "op": "added",
+     "key": ["ピカチュウ", "なみのり"]}
+
+feed_version は CSV のビルドごとに進むフィードの番号で、データ投入ごとに進む
+sv.dataset_version（クエリサービスのキャッシュ・NOTIFY で使う番号）とは別物です。
+1回の投入には、前回の投入以降に出力された（1つ以上の）フィードの変更がまとめて反映されます。
+"""
+
+import csv
+import json
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .csv_builder import TABLE_COLUMNS, CSVBuilder
+from .schema import TABLE_RULES
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CHANGES_DIR = PROJECT_ROOT / "data" / "changes"
+
+OP_ADDED = "added"
+OP_REMOVED = "removed"
+OP_MODIFIED = "modified"
+
+# 関連テーブルのIDカラムの参照先（自然キーへの変換に使う）
+_RELATION_TARGETS: dict[str, tuple[str, str]] = {
+    "pokemon_abilities": ("pokemon", "abilities"),
+    "pokemon_moves": ("pokemon", "moves"),
+}
+
+# CSVの値を CSVBuilder.iter_rows() と同じ型に戻す変換（空欄は None）
+_CSV_CONVERTERS: dict[str, Callable[[str], Any]] = {
+    "integer": int,
+    "smallint": int,
+    "boolean": lambda value: value == "True",
+    "text": str,
+}
+
+# テーブル名 -> 自然キー -> ID以外の値
+Snapshot = dict[str, dict[Any, tuple[Any, ...]]]
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """1件の変更.
+
+    Attributes:
+        entity: テーブル名
+        op: 変更の種類（"added" / "removed" / "modified"）
+        key: 自然キー（マスタは name_ja、関連テーブルは名前の組）
+        fields: 追加時は全カラムの値、変更時はカラム名 -> (変更前, 変更後)、削除時は空
+    """
+
+    entity: str
+    op: str
+    key: str | tuple[str, str]
+    fields: dict[str, Any] = field(default_factory=dict)
+
+    def to_record(self, feed_version: int) -> dict[str, Any]:
+        """JSONL の1レコード."""
+        record: dict[str, Any] = {
+            "feed_version": feed_version,
+            "entity": self.entity,
+            "op": self.op,
+            "key": list(self.key) if isinstance(self.key, tuple) else self.key,
+        }
+        if self.fields:
+            record["fields"] = {
+                name: list(value) if self.op == OP_MODIFIED else value
+                for name, value in self.fields.items()
+            }
+        return record
+
+
+@dataclass(slots=True)
+class ChangeFeed:
+    """1回のビルドの変更フィード.
+
+    Attributes:
+        feed_version: フィードのバージョン（フィードを出力するごとに1進む。
+            sv.dataset_version とは別の番号）
+        changes: 変更（テーブル順、テーブル内は削除・追加・変更の順に自然キー順）
+        baseline: 変更を含まない基準のフィードか（初回ビルド・最初のフィード）
+    """
+
+    feed_version: int
+    changes: list[Change]
+    baseline: bool = False
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """テーブルごとの変更件数."""
+        counts = {
+            table_name: dict.fromkeys((OP_ADDED, OP_REMOVED, OP_MODIFIED), 0)
+            for table_name in TABLE_COLUMNS
+        }
+        for change in self.changes:
+            counts[change.entity][change.op] += 1
+        return counts
+
+    def write(self, changes_dir: Path) -> Path:
+        """フィードを JSONL として出力する.
+
+        Args:
+            changes_dir: 出力ディレクトリ
+
+        Returns:
+            出力したファイルのパス（changes_<バージョン>.jsonl）
+        """
+        changes_dir.mkdir(parents=True, exist_ok=True)
+        path = changes_dir / f"changes_{self.feed_version:06d}.jsonl"
+        header = {
+            "feed_version": self.feed_version,
+            "entity": "dataset",
+            "op": "build",
+            "previous_feed_version": self.feed_version - 1 if self.feed_version > 1 else None,
+            "baseline": self.baseline,
+            "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "summary": self.summary(),
+        }
+        with path.open("w", encoding="utf-8") as f:
+            f.write(_dumps(header))
+            for change in self.changes:
+                f.write(_dumps(change.to_record(self.feed_version)))
+        return path
+
+
+def snapshot_from_rows(rows: Callable[[str], Iterable[Sequence[Any]]]) -> Snapshot:
+    """テーブルの行から自然キーのスナップショットを作る.
+
+    Args:
+        rows: テーブル名を受け取り、TABLE_COLUMNS の順の行を返す関数
+
+    Returns:
+        テーブル名 -> 自然キー -> ID以外の値（空文字列は None に揃える）
+    """
+    snapshot: Snapshot = {}
+    names: dict[str, dict[Any, str]] = {}
+    for table_name, columns in TABLE_COLUMNS.items():
+        entries: dict[Any, tuple[Any, ...]] = {}
+        targets = _RELATION_TARGETS.get(table_name)
+        if targets is None:
+            key_index = columns.index("name_ja")
+            id_to_name = names[table_name] = {}
+            for row in rows(table_name):
+                values = tuple(None if value == "" else value for value in row)
+                id_to_name[values[0]] = values[key_index]
+                entries[values[key_index]] = values[1:]
+        else:
+            first, second = (names[target] for target in targets)
+            for row in rows(table_name):
+                entries[(first[row[0]], second[row[1]])] = tuple(row[2:])
+        snapshot[table_name] = entries
+    return snapshot
+
+
+def snapshot_from_builder(builder: CSVBuilder) -> Snapshot:
+    """今回のビルド結果のスナップショット."""
+    return snapshot_from_rows(builder.iter_rows)
+
+
+def snapshot_from_csv_dir(csv_dir: Path) -> Snapshot | None:
+    """出力済みCSVのスナップショット（5テーブル揃っていない場合は None）."""
+    paths = {table_name: csv_dir / f"{table_name}.csv" for table_name in TABLE_COLUMNS}
+    if not all(path.exists() for path in paths.values()):
+        return None
+
+    def rows(table_name: str) -> Iterable[tuple[Any, ...]]:
+        converters = [_CSV_CONVERTERS[rule.kind] for rule in TABLE_RULES[table_name]]
+        with paths[table_name].open(encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                yield tuple(
+                    None if raw == "" else convert(raw)
+                    for convert, raw in zip(converters, row, strict=True)
+                )
+
+    return snapshot_from_rows(rows)
+
+
+def diff_snapshots(previous: Snapshot, current: Snapshot) -> list[Change]:
+    """2つのスナップショットの差分.
+
+    Args:
+        previous: 前回のビルド
+        current: 今回のビルド
+
+    Returns:
+        変更（テーブル順、テーブル内は削除・追加・変更の順に自然キー順）
+    """
+    changes: list[Change] = []
+    for table_name, columns in TABLE_COLUMNS.items():
+        before = previous[table_name]
+        after = current[table_name]
+        value_columns = columns[1:] if table_name not in _RELATION_TARGETS else columns[2:]
+
+        for key in sorted(before.keys() - after.keys()):
+            changes.append(Change(table_name, OP_REMOVED, key))
+        for key in sorted(after.keys() - before.keys()):
+            changes.append(
+                Change(table_name, OP_ADDED, key, dict(zip(value_columns, after[key], strict=True)))
+            )
+        for key in sorted(before.keys() & after.keys()):
+            old, new = before[key], after[key]
+            if old == new:
+                continue
+            fields = {
+                name: (old_value, new_value)
+                for name, old_value, new_value in zip(value_columns, old, new, strict=True)
+                if old_value != new_value
+            }
+            changes.append(Change(table_name, OP_MODIFIED, key, fields))
+    return changes
+
+
+def latest_feed_version(changes_dir: Path) -> int:
+    """出力済みのフィードの最新の feed_version（なければ0）."""
+    versions = [
+        int(path.stem.removeprefix("changes_"))
+        for path in changes_dir.glob("changes_*.jsonl")
+        if path.stem.removeprefix("changes_").isdigit()
+    ]
+    return max(versions, default=0)
+
+
+def build_change_feed(
+    previous: Snapshot | None, current: Snapshot, changes_dir: Path = CHANGES_DIR
+) -> ChangeFeed | None:
+    """前回のビルドとの変更フィードを作る.
+
+    前回のCSVがない場合（初回ビルド）は、変更を含まない基準（baseline）のフィードを作る。
+
+    Args:
+        previous: 前回のビルド（出力先に残っていたCSV）のスナップショット
+        current: 今回のビルドのスナップショット
+        changes_dir: フィードの出力ディレクトリ（バージョンの採番に使う）
+
+    Returns:
+        変更フィード（前回から変更がない場合は None）
+    """
+    feed_version = latest_feed_version(changes_dir) + 1
+    if previous is None:
+        return ChangeFeed(feed_version, [], baseline=True)
+    changes = diff_snapshots(previous, current)
+    if not changes:
+        # フィードがまだ1つもない場合は、現在のCSVを基準として最初のバージョンを出力する
+        return ChangeFeed(feed_version, [], baseline=True) if feed_version == 1 else None
+    return ChangeFeed(feed_version, changes)
+
+
+def _dumps(record: dict[str, Any]) -> str:
+    """JSONL の1行."""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
@@ -4,25 +4,133 @@ PokemonDataからCSVファイルを生成します。
 """
 
 import csv
+import hashlib
 import logging
-from collections.abc import Sequence
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
 
-from .models import Ability, Move, Pokemon, PokemonAbility, PokemonData
+from .models import PokemonData, PokemonMove
+from .schema import TABLE_COLUMNS
 
 logger = logging.getLogger(__name__)
 
+# 列指向フォーマットの出力形式 (形式名 -> 拡張子)
+COLUMNAR_FORMATS: dict[str, str] = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+# 覚える技の組（learnset）の正規化レイアウトのカラム
+# （supabase/migrations/20261018000003_create_learnsets.sql と同じ）
+LEARNSET_COLUMNS: dict[str, tuple[str, ...]] = {
+    "learnsets": ("id", "move_set_hash", "move_count"),
+    "learnset_moves": ("learnset_id", "move_id"),
+    "pokemon_learnsets": ("pokemon_id", "learnset_id"),
+}
+
+# CSV生成時のログに使うテーブルの表示名
+TABLE_LABELS: dict[str, str] = {
+    "abilities": "特性",
+    "moves": "技",
+    "pokemon": "ポケモン",
+    "pokemon_abilities": "ポケモン-特性",
+    "pokemon_moves": "ポケモン-技",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class AbilityRecord:
+    """特性マスタの1行（idを除く sv.abilities のカラム）."""
+
+    name_ja: str
+    effect_text: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class MoveRecord:
+    """技マスタの1行（idを除く sv.moves のカラム）."""
+
+    name_ja: str
+    type_name: str
+    damage_class: str | None
+    power: int | None
+    accuracy: int | None
+    pp: int | None
+    priority: int
+    effect_text: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class PokemonRecord:
+    """ポケモンマスタの1行（idを除く sv.pokemon のカラム）."""
+
+    pokedex_no: int
+    name_ja: str
+    name_en: str | None
+    form_label: str | None
+    type_primary: str
+    type_secondary: str | None
+    height_dm: int | None
+    weight_hg: int | None
+    low_kick_power: int | None
+    is_legendary: bool
+    is_mythical: bool
+    base_hp: int
+    base_atk: int
+    base_def: int
+    base_spa: int
+    base_spd: int
+    base_spe: int
+    remarks: str | None
+
+
+# モデル・レコードから id 以外のカラムをCSVのカラム順に取り出す
+_ABILITY_VALUES = attrgetter(*TABLE_COLUMNS["abilities"][1:])
+_MOVE_VALUES = attrgetter(*TABLE_COLUMNS["moves"][1:])
+_POKEMON_VALUES = attrgetter(*TABLE_COLUMNS["pokemon"][1:])
+
 
 class CSVBuilder:
-    """CSV生成クラス."""
+    """CSV生成クラス.
+
+    収集時に特性・技・ポケモンの名前を出現順の内部番号（0始まり）に置き換え、
+    マスタは __slots__ のレコード、関連テーブルは内部番号の配列（array）で保持する。
+    重複排除は内部番号で行い、CSVのID（特性・技は名前順、ポケモンは読み込み順の連番）への
+    変換は出力時に内部番号 -> IDの配列を引くだけで済ませる。
+    """
 
     def __init__(self) -> None:
         """初期化."""
-        self.abilities_dict: dict[str, Ability] = {}
-        self.moves_dict: dict[str, Move] = {}
-        self.pokemon_list: list[Pokemon] = []
-        self.pokemon_abilities: list[PokemonAbility] = []
-        self.pokemon_moves_dict: dict[tuple[str, str], None] = {}  # (pokemon_name, move_name)
+        # マスタ（内部番号順）と名前 -> 内部番号
+        self._abilities: list[AbilityRecord] = []
+        self._moves: list[MoveRecord] = []
+        self._pokemon: list[PokemonRecord] = []
+        self._ability_numbers: dict[str, int] = {}
+        self._move_numbers: dict[str, int] = {}
+        self._pokemon_numbers: dict[str, int] = {}  # 関連テーブルから参照される名前も含む
+        self._pokemon_names: list[str] = []
+
+        # 関連テーブル（内部番号の列）
+        self._pokemon_ability_pokemon = array("i")
+        self._pokemon_ability_ability = array("i")
+        self._pokemon_ability_hidden = array("b")
+        self._pokemon_move_pokemon = array("i")
+        self._pokemon_move_move = array("i")
+
+        # ポケモン-技の重複排除用: 技を追加済みのポケモンの内部番号
+        # （同じポケモンの技が複数回に分かれて追加された場合のみ全体の重複排除を行う）
+        self._pokemon_with_moves: set[int] = set()
+        self._pokemon_moves_deduplicated = True
+
+        # 内部番号 -> ID（CSV生成時に構築）
+        self._ability_ids = array("i")
+        self._move_ids = array("i")
+        self._pokemon_ids = array("i")
+        self._mapped_counts: tuple[int, int, int] | None = None
 
         # 名前→IDマッピング（CSV生成時に使用）
         self.ability_name_to_id: dict[str, int] = {}
@@ -37,33 +145,118 @@ class CSVBuilder:
         """
         logger.info("データ収集フェーズ開始")
 
+        ability_numbers = self._ability_numbers
+        move_numbers = self._move_numbers
+
         for pokemon_data in pokemon_data_list:
             # ポケモン基本情報
-            self.pokemon_list.append(pokemon_data.pokemon)
+            pokemon = pokemon_data.pokemon
+            self._pokemon.append(PokemonRecord(*_POKEMON_VALUES(pokemon)))
+            self._pokemon_number(pokemon.name_ja)
 
             # 特性（name_jaでユニーク）
             for ability in pokemon_data.abilities:
-                if ability.name_ja not in self.abilities_dict:
-                    self.abilities_dict[ability.name_ja] = ability
+                if ability.name_ja not in ability_numbers:
+                    ability_numbers[ability.name_ja] = len(self._abilities)
+                    self._abilities.append(AbilityRecord(*_ABILITY_VALUES(ability)))
 
             # 技（name_jaでユニーク）
             for move in pokemon_data.moves:
-                if move.name_ja not in self.moves_dict:
-                    self.moves_dict[move.name_ja] = move
+                if move.name_ja not in move_numbers:
+                    move_numbers[move.name_ja] = len(self._moves)
+                    self._moves.append(MoveRecord(*_MOVE_VALUES(move)))
 
             # ポケモン-特性関連
-            self.pokemon_abilities.extend(pokemon_data.pokemon_abilities)
+            for pa in pokemon_data.pokemon_abilities:
+                self._pokemon_ability_pokemon.append(self._pokemon_number(pa.pokemon_name))
+                self._pokemon_ability_ability.append(ability_numbers[pa.ability_name])
+                self._pokemon_ability_hidden.append(pa.is_hidden)
 
-            # ポケモン-技関連（pokemon_name, move_nameの組み合わせでユニーク化）
-            for pm in pokemon_data.pokemon_moves:
-                key = (pm.pokemon_name, pm.move_name)
-                self.pokemon_moves_dict[key] = None
+            # ポケモン-技関連（ポケモン・技の内部番号の組み合わせでユニーク化）
+            self._add_pokemon_moves(pokemon_data.pokemon_moves)
 
-        logger.info(f"ポケモン: {len(self.pokemon_list)}件")
-        logger.info(f"ユニーク特性: {len(self.abilities_dict)}件")
-        logger.info(f"ユニーク技: {len(self.moves_dict)}件")
-        logger.info(f"ポケモン-特性関連: {len(self.pokemon_abilities)}件")
-        logger.info(f"ポケモン-技関連（ユニーク）: {len(self.pokemon_moves_dict)}件")
+        logger.info(f"ポケモン: {len(self._pokemon)}件")
+        logger.info(f"ユニーク特性: {len(self._abilities)}件")
+        logger.info(f"ユニーク技: {len(self._moves)}件")
+        logger.info(f"ポケモン-特性関連: {self.row_count('pokemon_abilities')}件")
+        logger.info(f"ポケモン-技関連（ユニーク）: {self.row_count('pokemon_moves')}件")
+
+    def row_count(self, table_name: str) -> int:
+        """テーブルの行数を返す.
+
+        Args:
+            table_name: テーブル名 (TABLE_COLUMNSのキー)
+
+        Returns:
+            行数（ポケモン-技関連は重複排除後の件数）
+
+        Raises:
+            KeyError: 未知のテーブル名が指定された場合
+        """
+        if table_name == "abilities":
+            return len(self._abilities)
+        if table_name == "moves":
+            return len(self._moves)
+        if table_name == "pokemon":
+            return len(self._pokemon)
+        if table_name == "pokemon_abilities":
+            return len(self._pokemon_ability_pokemon)
+        if table_name == "pokemon_moves":
+            self._deduplicate_pokemon_moves()
+            return len(self._pokemon_move_pokemon)
+        msg = f"未知のテーブルです: {table_name}"
+        raise KeyError(msg)
+
+    def _pokemon_number(self, name: str) -> int:
+        """ポケモン名の内部番号を返す（未登録なら採番する）."""
+        number = self._pokemon_numbers.get(name)
+        if number is None:
+            number = self._pokemon_numbers[name] = len(self._pokemon_names)
+            self._pokemon_names.append(name)
+        return number
+
+    def _add_pokemon_moves(self, pokemon_moves: Iterable[PokemonMove]) -> None:
+        """ポケモン-技関連を追加する.
+
+        1ファイル分の関連は、ポケモンごとの小さな集合で重複を除きながら追加する。
+        既に技を追加したポケモンの関連が再び現れた場合（同名のポケモンが複数ファイルにある
+        場合など）は、次に参照されるときに全体の重複排除を行う。
+        """
+        move_numbers = self._move_numbers
+        seen: dict[int, set[int]] = {}
+        for pm in pokemon_moves:
+            pokemon_number = self._pokemon_number(pm.pokemon_name)
+            move_number = move_numbers[pm.move_name]
+            moves = seen.get(pokemon_number)
+            if moves is None:
+                moves = seen[pokemon_number] = set()
+                if pokemon_number in self._pokemon_with_moves:
+                    self._pokemon_moves_deduplicated = False
+                self._pokemon_with_moves.add(pokemon_number)
+            if move_number not in moves:
+                moves.add(move_number)
+                self._pokemon_move_pokemon.append(pokemon_number)
+                self._pokemon_move_move.append(move_number)
+
+    def _deduplicate_pokemon_moves(self) -> None:
+        """ポケモン-技関連の重複を、最初の出現順を保って取り除く."""
+        if self._pokemon_moves_deduplicated:
+            return
+        shift = max(len(self._moves), 1).bit_length()
+        seen: set[int] = set()
+        pokemon_column = array("i")
+        move_column = array("i")
+        for pokemon_number, move_number in zip(
+            self._pokemon_move_pokemon, self._pokemon_move_move, strict=True
+        ):
+            key = pokemon_number << shift | move_number
+            if key not in seen:
+                seen.add(key)
+                pokemon_column.append(pokemon_number)
+                move_column.append(move_number)
+        self._pokemon_move_pokemon = pokemon_column
+        self._pokemon_move_move = move_column
+        self._pokemon_moves_deduplicated = True
 
     def generate_csvs(self, output_dir: Path) -> dict[str, Path]:
         """CSVファイルを生成する.
@@ -79,230 +272,335 @@ class CSVBuilder:
         output_dir.mkdir(parents=True, exist_ok=True)
         generated_files = {}
 
-        # IDマッピングを構築
-        self._build_id_mappings()
+        # IDマッピングを構築（構築済みであれば再利用）
+        self.ensure_id_mappings()
 
         # 各テーブルのCSV生成（マスタテーブルが先）
-        generated_files["abilities"] = self._generate_abilities_csv(output_dir / "abilities.csv")
-        generated_files["moves"] = self._generate_moves_csv(output_dir / "moves.csv")
-        generated_files["pokemon"] = self._generate_pokemon_csv(output_dir / "pokemon.csv")
-        generated_files["pokemon_abilities"] = self._generate_pokemon_abilities_csv(
-            output_dir / "pokemon_abilities.csv"
-        )
-        generated_files["pokemon_moves"] = self._generate_pokemon_moves_csv(
-            output_dir / "pokemon_moves.csv"
-        )
+        for table_name in TABLE_COLUMNS:
+            generated_files[table_name] = self._generate_csv(
+                table_name, output_dir / f"{table_name}.csv"
+            )
 
         logger.info(f"CSV生成完了: {len(generated_files)}ファイル")
         return generated_files
 
-    def _build_id_mappings(self) -> None:
-        """名前→IDマッピングを構築する."""
-        # 特性のIDマッピング（アルファベット順でソートして連番を割り当て）
-        for idx, name_ja in enumerate(sorted(self.abilities_dict.keys()), start=1):
-            self.ability_name_to_id[name_ja] = idx
+    def learnset_rows(self) -> dict[str, list[tuple[Any, ...]]]:
+        """覚える技の組（learnset）の正規化レイアウトの行を作る.
 
-        # 技のIDマッピング
-        for idx, name_ja in enumerate(sorted(self.moves_dict.keys()), start=1):
-            self.move_name_to_id[name_ja] = idx
+        覚える技がまったく同じポケモン（フォーム違いなど）は1つの learnset を共有する。
+        learnset は技の名前をコードポイント順に改行で連結した文字列の MD5 で識別し
+        （sv.refresh_learnsets() と同じ値）、IDはその技の組を持つ最小のポケモンIDの順に振る。
+        技を1つも覚えないポケモンは learnset を持たない。
 
-        # ポケモンのIDマッピング
-        for idx, pokemon in enumerate(self.pokemon_list, start=1):
-            self.pokemon_name_to_id[pokemon.name_ja] = idx
+        Returns:
+            テーブル名 (LEARNSET_COLUMNSのキー) -> 行のリスト
+        """
+        self.ensure_id_mappings()
+        self._deduplicate_pokemon_moves()
+
+        moves_by_pokemon: dict[int, list[int]] = {}
+        for pokemon_number, move_number in zip(
+            self._pokemon_move_pokemon, self._pokemon_move_move, strict=True
+        ):
+            moves_by_pokemon.setdefault(self._pokemon_ids[pokemon_number], []).append(move_number)
+
+        learnset_ids: dict[str, int] = {}
+        rows: dict[str, list[tuple[Any, ...]]] = {table_name: [] for table_name in LEARNSET_COLUMNS}
+        for pokemon_id in sorted(moves_by_pokemon):
+            move_numbers = moves_by_pokemon[pokemon_id]
+            names = sorted(self._moves[number].name_ja for number in move_numbers)
+            move_set_hash = hashlib.md5(
+                "\n".join(names).encode("utf-8"), usedforsecurity=False
+            ).hexdigest()
+            learnset_id = learnset_ids.get(move_set_hash)
+            if learnset_id is None:
+                learnset_id = learnset_ids[move_set_hash] = len(learnset_ids) + 1
+                rows["learnsets"].append((learnset_id, move_set_hash, len(names)))
+                rows["learnset_moves"].extend(
+                    (learnset_id, move_id)
+                    for move_id in sorted(self._move_ids[number] for number in move_numbers)
+                )
+            rows["pokemon_learnsets"].append((pokemon_id, learnset_id))
+        return rows
 
-    def _generate_abilities_csv(self, output_path: Path) -> Path:
-        """特性マスタのCSVを生成.
+    def generate_learnset_csvs(self, output_dir: Path) -> dict[str, Path]:
+        """覚える技の組（learnset）の正規化レイアウトのCSVを生成する.
 
         Args:
-            output_path: 出力ファイルパス
+            output_dir: 出力先ディレクトリ
 
         Returns:
-            生成されたファイルパス
+            生成されたCSVファイルのパス辞書 (テーブル名 -> パス)
         """
-        logger.info(f"特性CSV生成中: {output_path}")
-
-        with output_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-
-            # ヘッダー
-            writer.writerow(["id", "name_ja", "effect_text"])
-
-            # データ（ソート順でID割り当て）
-            for name_ja in sorted(self.abilities_dict.keys()):
-                ability = self.abilities_dict[name_ja]
-                ability_id = self.ability_name_to_id[name_ja]
-                writer.writerow([ability_id, ability.name_ja, ability.effect_text or ""])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        rows = self.learnset_rows()
+        generated_files = {}
+        for table_name, columns in LEARNSET_COLUMNS.items():
+            output_path = output_dir / f"{table_name}.csv"
+            with output_path.open("w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+                writer.writerow(columns)
+                writer.writerows(rows[table_name])
+            generated_files[table_name] = output_path
+
+        logger.info(
+            f"learnset: {len(rows['learnsets'])}件（ポケモン {len(rows['pokemon_learnsets'])}匹）、"
+            f"ポケモン-技 {self.row_count('pokemon_moves')}件 -> "
+            f"learnset-技 {len(rows['learnset_moves'])}件"
+        )
+        return generated_files
 
-        logger.info(f"特性CSV生成完了: {len(self.abilities_dict)}件")
-        return output_path
+    def generate_columnar_files(
+        self, output_dir: Path, file_format: str = "parquet"
+    ) -> dict[str, Path]:
+        """Parquet / Arrow IPC ファイルを生成する.
 
-    def _generate_moves_csv(self, output_path: Path) -> Path:
-        """技マスタのCSVを生成.
+        CSVと同じIDで5テーブル分を型付きで出力する。タイプ名などの低カーディナリティ列は
+        辞書エンコードする。Parquetはzstd圧縮、Arrow IPCはmmapでゼロコピー読み込みできるよう
+        非圧縮で出力する。
 
         Args:
-            output_path: 出力ファイルパス
+            output_dir: 出力先ディレクトリ
+            file_format: 出力形式 ("parquet" または "arrow")
 
         Returns:
-            生成されたファイルパス
+            生成されたファイルのパス辞書 (テーブル名 -> パス)
+
+        Raises:
+            ValueError: 未対応の出力形式が指定された場合
+            ImportError: pyarrowがインストールされていない場合
         """
-        logger.info(f"技CSV生成中: {output_path}")
+        if file_format not in COLUMNAR_FORMATS:
+            msg = f"未対応の出力形式です: {file_format} (対応形式: {', '.join(COLUMNAR_FORMATS)})"
+            raise ValueError(msg)
 
-        with output_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as error:
+            msg = "Parquet/Arrow出力には pyarrow が必要です: uv sync --extra parquet"
+            raise ImportError(msg) from error
 
-            # ヘッダー
-            writer.writerow(
-                [
-                    "id",
-                    "name_ja",
-                    "type_name",
-                    "damage_class",
-                    "power",
-                    "accuracy",
-                    "pp",
-                    "priority",
-                    "effect_text",
-                ]
-            )
+        logger.info(f"列指向ファイル生成フェーズ開始 ({file_format})")
 
-            # データ（ソート順でID割り当て）
-            for name_ja in sorted(self.moves_dict.keys()):
-                move = self.moves_dict[name_ja]
-                move_id = self.move_name_to_id[name_ja]
-                writer.writerow(
-                    [
-                        move_id,
-                        move.name_ja,
-                        move.type_name,
-                        move.damage_class or "",
-                        move.power if move.power is not None else "",
-                        move.accuracy if move.accuracy is not None else "",
-                        move.pp if move.pp is not None else "",
-                        move.priority,
-                        move.effect_text or "",
-                    ]
-                )
+        output_dir.mkdir(parents=True, exist_ok=True)
+        generated_files = {}
 
-        logger.info(f"技CSV生成完了: {len(self.moves_dict)}件")
-        return output_path
+        # IDマッピングを構築（CSVと同じIDを割り当てる。構築済みであれば再利用）
+        self.ensure_id_mappings()
+
+        for table_name, table in self._build_arrow_tables(pa).items():
+            output_path = output_dir / f"{table_name}{COLUMNAR_FORMATS[file_format]}"
+            if file_format == "parquet":
+                pq.write_table(table, output_path, compression="zstd")
+            else:
+                with pa.OSFile(str(output_path), "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            generated_files[table_name] = output_path
+            logger.info(f"{table_name}: {output_path.name} ({table.num_rows}件)")
+
+        logger.info(f"列指向ファイル生成完了: {len(generated_files)}ファイル")
+        return generated_files
 
-    def _generate_pokemon_csv(self, output_path: Path) -> Path:
-        """ポケモンマスタのCSVを生成.
+    def iter_rows(self, table_name: str) -> Iterator[tuple[Any, ...]]:
+        """テーブルの行をCSVと同じID・カラム順で返す.
+
+        CSVとは異なりNULLは空文字列に変換せず `None` のまま返す。
 
         Args:
-            output_path: 出力ファイルパス
+            table_name: テーブル名 (TABLE_COLUMNSのキー)
 
-        Returns:
-            生成されたファイルパス
+        Yields:
+            TABLE_COLUMNS[table_name] の順に並んだ値のタプル
+
+        Raises:
+            KeyError: 未知のテーブル名が指定された場合
         """
-        logger.info(f"ポケモンCSV生成中: {output_path}")
+        if table_name not in TABLE_COLUMNS:
+            msg = f"未知のテーブルです: {table_name}"
+            raise KeyError(msg)
+
+        self.ensure_id_mappings()
+
+        if table_name == "abilities":
+            for number in self._sorted_numbers(self._ability_ids):
+                yield (self._ability_ids[number], *_ABILITY_VALUES(self._abilities[number]))
+        elif table_name == "moves":
+            for number in self._sorted_numbers(self._move_ids):
+                yield (self._move_ids[number], *_MOVE_VALUES(self._moves[number]))
+        elif table_name == "pokemon":
+            pokemon_ids = self._pokemon_ids
+            pokemon_numbers = self._pokemon_numbers
+            for pokemon in self._pokemon:
+                yield (pokemon_ids[pokemon_numbers[pokemon.name_ja]], *_POKEMON_VALUES(pokemon))
+        elif table_name == "pokemon_abilities":
+            pokemon_ids = self._pokemon_ids
+            ability_ids = self._ability_ids
+            for pokemon_number, ability_number, is_hidden in zip(
+                self._pokemon_ability_pokemon,
+                self._pokemon_ability_ability,
+                self._pokemon_ability_hidden,
+                strict=True,
+            ):
+                yield (pokemon_ids[pokemon_number], ability_ids[ability_number], bool(is_hidden))
+        else:
+            self._deduplicate_pokemon_moves()
+            yield from zip(
+                map(self._pokemon_ids.__getitem__, self._pokemon_move_pokemon),
+                map(self._move_ids.__getitem__, self._pokemon_move_move),
+                strict=True,
+            )
 
-        with output_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+    def ensure_id_mappings(self) -> None:
+        """名前→IDマッピングが未構築の場合に構築する.
 
-            # ヘッダー
-            writer.writerow(
-                [
-                    "id",
-                    "pokedex_no",
-                    "name_ja",
-                    "name_en",
-                    "form_label",
-                    "type_primary",
-                    "type_secondary",
-                    "height_dm",
-                    "weight_hg",
-                    "low_kick_power",
-                    "is_legendary",
-                    "is_mythical",
-                    "base_hp",
-                    "base_atk",
-                    "base_def",
-                    "base_spa",
-                    "base_spd",
-                    "base_spe",
-                    "remarks",
-                ]
-            )
+        CSV生成を経由せずにIDを参照する場合（iter_rows() や検索インデックスの構築）に使用する。
+        collect_data() で件数が変わった場合は構築し直す。
+        """
+        if self._mapped_counts != self._master_counts():
+            self._build_id_mappings()
 
-            # データ
-            for pokemon in self.pokemon_list:
-                pokemon_id = self.pokemon_name_to_id[pokemon.name_ja]
-                writer.writerow(
-                    [
-                        pokemon_id,
-                        pokemon.pokedex_no,
-                        pokemon.name_ja,
-                        pokemon.name_en or "",
-                        pokemon.form_label or "",
-                        pokemon.type_primary,
-                        pokemon.type_secondary or "",
-                        pokemon.height_dm if pokemon.height_dm is not None else "",
-                        pokemon.weight_hg if pokemon.weight_hg is not None else "",
-                        pokemon.low_kick_power if pokemon.low_kick_power is not None else "",
-                        pokemon.is_legendary,
-                        pokemon.is_mythical,
-                        pokemon.base_hp,
-                        pokemon.base_atk,
-                        pokemon.base_def,
-                        pokemon.base_spa,
-                        pokemon.base_spd,
-                        pokemon.base_spe,
-                        pokemon.remarks or "",
-                    ]
-                )
+    def _master_counts(self) -> tuple[int, int, int]:
+        """マスタ（特性・技・ポケモン名）の件数."""
+        return (len(self._abilities), len(self._moves), len(self._pokemon_names))
 
-        logger.info(f"ポケモンCSV生成完了: {len(self.pokemon_list)}件")
-        return output_path
+    def _build_id_mappings(self) -> None:
+        """名前→IDマッピングと内部番号→IDの配列を構築する."""
+        # 特性のIDマッピング（アルファベット順でソートして連番を割り当て）
+        self.ability_name_to_id = _sorted_ids(self._ability_numbers)
+        self._ability_ids = _number_to_id(self._ability_numbers, self.ability_name_to_id)
 
-    def _generate_pokemon_abilities_csv(self, output_path: Path) -> Path:
-        """ポケモン-特性関連のCSVを生成.
+        # 技のIDマッピング
+        self.move_name_to_id = _sorted_ids(self._move_numbers)
+        self._move_ids = _number_to_id(self._move_numbers, self.move_name_to_id)
 
-        Args:
-            output_path: 出力ファイルパス
+        # ポケモンのIDマッピング（読み込み順。同名のポケモンは後の行のID）
+        self.pokemon_name_to_id = {
+            pokemon.name_ja: idx for idx, pokemon in enumerate(self._pokemon, start=1)
+        }
+        self._pokemon_ids = _number_to_id(self._pokemon_numbers, self.pokemon_name_to_id)
 
-        Returns:
-            生成されたファイルパス
-        """
-        logger.info(f"ポケモン-特性CSV生成中: {output_path}")
+        self._mapped_counts = self._master_counts()
 
-        with output_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+    @staticmethod
+    def _sorted_numbers(ids: array[int]) -> list[int]:
+        """内部番号をID順に並べる."""
+        order = [0] * len(ids)
+        for number, id_ in enumerate(ids):
+            order[id_ - 1] = number
+        return order
 
-            # ヘッダー
-            writer.writerow(["pokemon_id", "ability_id", "is_hidden"])
+    def _build_arrow_tables(self, pa: Any) -> dict[str, Any]:
+        """全テーブルのpyarrow.Tableを構築する.
+
+        Args:
+            pa: pyarrowモジュール
 
-            # データ（名前をIDに変換）
-            for pa in self.pokemon_abilities:
-                pokemon_id = self.pokemon_name_to_id[pa.pokemon_name]
-                ability_id = self.ability_name_to_id[pa.ability_name]
-                writer.writerow([pokemon_id, ability_id, pa.is_hidden])
+        Returns:
+            テーブル名 -> pyarrow.Table の辞書（マスタテーブルが先）
+        """
+        # タイプ名などの低カーディナリティ列は辞書エンコード
+        category = pa.dictionary(pa.int8(), pa.string())
+        label = pa.dictionary(pa.int16(), pa.string())
+        small_int = pa.int16()
+
+        column_types: dict[str, dict[str, Any]] = {
+            "abilities": {"id": pa.int32(), "name_ja": pa.string(), "effect_text": pa.string()},
+            "moves": {
+                "id": pa.int32(),
+                "name_ja": pa.string(),
+                "type_name": category,
+                "damage_class": category,
+                "power": small_int,
+                "accuracy": small_int,
+                "pp": small_int,
+                "priority": small_int,
+                "effect_text": pa.string(),
+            },
+            "pokemon": {
+                "id": pa.int32(),
+                "pokedex_no": pa.int32(),
+                "name_ja": pa.string(),
+                "name_en": pa.string(),
+                "form_label": label,
+                "type_primary": category,
+                "type_secondary": category,
+                "height_dm": small_int,
+                "weight_hg": small_int,
+                "low_kick_power": small_int,
+                "is_legendary": pa.bool_(),
+                "is_mythical": pa.bool_(),
+                "base_hp": small_int,
+                "base_atk": small_int,
+                "base_def": small_int,
+                "base_spa": small_int,
+                "base_spd": small_int,
+                "base_spe": small_int,
+                "remarks": pa.string(),
+            },
+            "pokemon_abilities": {
+                "pokemon_id": pa.int32(),
+                "ability_id": pa.int32(),
+                "is_hidden": pa.bool_(),
+            },
+            "pokemon_moves": {"pokemon_id": pa.int32(), "move_id": pa.int32()},
+        }
+
+        tables: dict[str, Any] = {}
+        for table_name, types in column_types.items():
+            columns = list(zip(*self.iter_rows(table_name), strict=True)) or [() for _ in types]
+            tables[table_name] = pa.table(
+                {
+                    column: pa.array(values, type_)
+                    for (column, type_), values in zip(types.items(), columns, strict=True)
+                }
+            )
+        return tables
 
-        logger.info(f"ポケモン-特性CSV生成完了: {len(self.pokemon_abilities)}件")
-        return output_path
+    def _generate_csv(self, table_name: str, output_path: Path) -> Path:
+        """テーブル1つ分のCSVを生成.
 
-    def _generate_pokemon_moves_csv(self, output_path: Path) -> Path:
-        """ポケモン-技関連のCSVを生成.
+        NULLは空文字列、真偽値は True / False として出力する。
 
         Args:
+            table_name: テーブル名 (TABLE_COLUMNSのキー)
             output_path: 出力ファイルパス
 
         Returns:
             生成されたファイルパス
         """
-        logger.info(f"ポケモン-技CSV生成中: {output_path}")
+        label = TABLE_LABELS[table_name]
+        logger.info(f"{label}CSV生成中: {output_path}")
 
         with output_path.open("w", encoding="utf-8", newline="") as f:
             writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
 
             # ヘッダー
-            writer.writerow(["pokemon_id", "move_id"])
+            writer.writerow(TABLE_COLUMNS[table_name])
 
-            # データ（名前をIDに変換）
-            for pokemon_name, move_name in self.pokemon_moves_dict.keys():
-                pokemon_id = self.pokemon_name_to_id[pokemon_name]
-                move_id = self.move_name_to_id[move_name]
-                writer.writerow([pokemon_id, move_id])
+            # データ（csv.writer は None を空文字列として書き出す）
+            writer.writerows(self.iter_rows(table_name))
 
-        logger.info(f"ポケモン-技CSV生成完了: {len(self.pokemon_moves_dict)}件")
+        logger.info(f"{label}CSV生成完了: {self.row_count(table_name)}件")
         return output_path
+
+
+def _sorted_ids(numbers: dict[str, int]) -> dict[str, int]:
+    """名前をソートして1からの連番IDを割り当てる."""
+    return {name: idx for idx, name in enumerate(sorted(numbers), start=1)}
+
+
+def _number_to_id(numbers: dict[str, int], name_to_id: dict[str, int]) -> array[int]:
+    """内部番号 -> IDの配列を作る.
+
+    Raises:
+        KeyError: 関連テーブルから参照された名前にIDがない場合
+    """
+    ids = array("i", [0]) * len(numbers)
+    for name, number in numbers.items():
+        if name not in name_to_id:
+            msg = f"マスタに存在しない名前が参照されています: {name}"
+            raise KeyError(msg)
+        ids[number] = name_to_id[name]
+    return ids
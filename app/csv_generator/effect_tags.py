@@ -0,0 +1,170 @@
+"""技・特性の効果タグ抽出モジュール.
+
+効果説明（effect_text）から「先制」「反動」「相手の防御ダウン」「まひ」のような構造化タグを
+抽出し、縦持ちのCSV（effect_tags.csv）に出力します。データ投入時に sv.moves / sv.abilities の
+effect_tags 配列カラム（GINインデックス付き）へ反映され、「相手の防御を下げる先制技」のような
+問い合わせを効果説明の部分一致検索ではなくインデックスで引けるようにします。
+
+Usage:
+    from app.csv_generator.effect_tags import extract_effect_tags
+
+    extract_effect_tags("優先度:+1 相手の防御を1段階下げる", priority=1)
+    # -> ("先制", "相手の防御ダウン")
+"""
+
+import csv
+import logging
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+from .csv_builder import TABLE_COLUMNS, CSVBuilder
+
+logger = logging.getLogger(__name__)
+
+# effect_tags.csv のカラム（1行 = 1タグ、table_name は "moves" / "abilities"）
+EFFECT_TAG_COLUMNS: tuple[str, ...] = ("table_name", "name_ja", "tag")
+
+# 効果タグのCSVファイル名（CSV生成ツールが他のCSVと同じディレクトリに出力する）
+EFFECT_TAGS_CSV = "effect_tags.csv"
+
+# 能力の表記（『』で囲んだひらがな表記も受け付ける） -> タグに使う表記
+_STAT_LABELS: dict[str, str] = {
+    "攻撃": "攻撃",
+    "こうげき": "攻撃",
+    "防御": "防御",
+    "ぼうぎょ": "防御",
+    "特攻": "特攻",
+    "とくこう": "特攻",
+    "特防": "特防",
+    "とくぼう": "特防",
+    "素早さ": "素早さ",
+    "すばやさ": "素早さ",
+    "命中率": "命中率",
+    "めいちゅうりつ": "命中率",
+    "回避率": "回避率",
+    "かいひりつ": "回避率",
+}
+_STAT_NAME = "|".join(_STAT_LABELS)
+_STAT = rf"『?(?:{_STAT_NAME})』?"
+
+# 「自分の攻撃と防御を1段階上げる」「相手の『ぼうぎょ』ランクを1段階下げる」
+# 「自分の『こうげき』『すばやさ』ランクが1段階ずつ上がる」
+_STAT_CHANGE_PATTERN = re.compile(
+    rf"(?:(自分|相手)の)?({_STAT}(?:[と・、]?{_STAT})*)(?:ランク)?[をが][^。、]{{0,8}}?"
+    r"(上げ|下げ|上が|下が)"
+)
+_STAT_NAME_PATTERN = re.compile(_STAT_NAME)
+
+# 「相手を『まひ』状態にする」「やけどにすることがある」（もうどくを先に照合する）
+_AILMENT_PATTERN = re.compile(
+    r"『?(もうどく|どく|まひ|やけど|ねむり|こおり|こんらん)』?(?:状態)?に(?:する|させる)"
+)
+
+# 効果説明の部分一致で付けるタグ（タグ, パターン）
+_TEXT_TAGS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    ("反動", re.compile(r"反動|自分も[^。]{0,8}?受ける")),
+    ("吸収", re.compile(r"与えたダメージの[^。]*回復")),
+    ("ひるみ", re.compile(r"ひるませ|ひるむ")),
+)
+_HEAL_PATTERN = re.compile(r"HPを[^。]{0,12}回復")
+
+
+def extract_effect_tags(effect_text: str | None, priority: int | None = None) -> tuple[str, ...]:
+    """効果説明から効果タグを抽出する.
+
+    優先度はスクレイパーが効果説明から抽出済みの priority カラムの値を使う
+    （正なら「先制」、負なら「後攻」）。能力変化の対象が書かれていない場合は、
+    直前に書かれた対象（「自分の攻撃を上げるが、素早さを下げる」の「自分」）を引き継ぎ、
+    それもなければ他動詞の「下げる」は相手、自動詞の「下がる」と「上げる」「上がる」は
+    自分に対するものとみなす（「〜ランクが1段階下がる」は自分の能力が下がる）。
+
+    Args:
+        effect_text: 効果説明（NULLの場合は優先度のタグのみ）
+        priority: 技の優先度（特性の場合は None）
+
+    Returns:
+        効果タグのタプル（重複なし、抽出順）
+    """
+    tags: dict[str, None] = {}
+    if priority is not None and priority > 0:
+        tags["先制"] = None
+    elif priority is not None and priority < 0:
+        tags["後攻"] = None
+
+    if not effect_text:
+        return tuple(tags)
+
+    last_subject: str | None = None
+    for match in _STAT_CHANGE_PATTERN.finditer(effect_text):
+        subject, stats, direction = match.groups()
+        rises = direction in ("上げ", "上が")
+        if subject is not None:
+            last_subject = subject
+        elif last_subject is not None:
+            subject = last_subject
+        else:
+            subject = "相手" if direction == "下げ" else "自分"
+        suffix = "アップ" if rises else "ダウン"
+        for stat in _STAT_NAME_PATTERN.findall(stats):
+            tags[f"{subject}の{_STAT_LABELS[stat]}{suffix}"] = None
+
+    for match in _AILMENT_PATTERN.finditer(effect_text):
+        tags[match.group(1)] = None
+
+    for tag, pattern in _TEXT_TAGS:
+        if pattern.search(effect_text):
+            tags[tag] = None
+    # 与えたダメージ分の回復は「吸収」のみとし、「回復」は付けない
+    if "吸収" not in tags and _HEAL_PATTERN.search(effect_text):
+        tags["回復"] = None
+
+    return tuple(tags)
+
+
+def effect_tag_rows(builder: CSVBuilder) -> Iterator[tuple[str, str, str]]:
+    """技・特性の効果タグをCSVの行として返す.
+
+    Args:
+        builder: データ収集済みの CSVBuilder
+
+    Yields:
+        (table_name, name_ja, tag) のタプル（技が先、それぞれCSVのID順）
+    """
+    move_columns = TABLE_COLUMNS["moves"]
+    name_index = move_columns.index("name_ja")
+    priority_index = move_columns.index("priority")
+    text_index = move_columns.index("effect_text")
+    for row in builder.iter_rows("moves"):
+        for tag in extract_effect_tags(row[text_index], row[priority_index]):
+            yield ("moves", row[name_index], tag)
+
+    ability_columns = TABLE_COLUMNS["abilities"]
+    name_index = ability_columns.index("name_ja")
+    text_index = ability_columns.index("effect_text")
+    for row in builder.iter_rows("abilities"):
+        for tag in extract_effect_tags(row[text_index]):
+            yield ("abilities", row[name_index], tag)
+
+
+def write_effect_tags_csv(builder: CSVBuilder, output_path: Path) -> Path:
+    """技・特性の効果タグを縦持ちのCSVに出力する.
+
+    Args:
+        builder: データ収集済みの CSVBuilder
+        output_path: 出力先のCSVファイルパス
+
+    Returns:
+        生成されたファイルパス
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"moves": 0, "abilities": 0}
+    with output_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EFFECT_TAG_COLUMNS)
+        for row in effect_tag_rows(builder):
+            writer.writerow(row)
+            counts[row[0]] += 1
+
+    logger.info(f"効果タグ: 技 {counts['moves']:,}件 / 特性 {counts['abilities']:,}件")
+    return output_path
@@ -6,13 +6,51 @@ Usage:
     python -m app.csv_generator.main
     または
     uv run python -m app.csv_generator.main
+
+    # CSVに加えてParquetファイルも生成（要 uv sync --extra parquet）
+    uv run python -m app.csv_generator.main --columnar parquet
+
+    # CSVに加えてsvスキーマ相当のSQLiteファイルも生成
+    uv run python -m app.csv_generator.main --sqlite
+
+    # CSVに加えてタイプ相性表・防御相性CSVも生成（要 uv sync --extra analysis）
+    uv run python -m app.csv_generator.main --type-defenses
+
+    # CSVに加えて素早さ順表CSVも生成（要 uv sync --extra analysis）
+    uv run python -m app.csv_generator.main --speed-tiers
+
+    # CSVに加えて静的配信用のJSONシャードを data/shards/ に生成
+    uv run python -m app.csv_generator.main --shards
+
+    # CSVに加えて mmap で読み込むバイナリスナップショットを data/pokemon.snapshot に生成
+    uv run python -m app.csv_generator.main --snapshot
+
+    # 段階ごとの処理時間・関数別統計を data/profile/ に出力
+    uv run python -m app.csv_generator.main --profile
+
+    # 前回のCSVとの変更フィード（data/changes/）を出力しない
+    uv run python -m app.csv_generator.main --no-change-feed
 """
 
+import argparse
 import logging
 from pathlib import Path
 
-from .csv_builder import CSVBuilder
+from app.profiling import StageProfiler, default_output_dir
+
+from .binary_snapshot import SNAPSHOT_PATH, write_snapshot
+from .change_feed import (
+    CHANGES_DIR,
+    build_change_feed,
+    latest_feed_version,
+    snapshot_from_builder,
+    snapshot_from_csv_dir,
+)
+from .csv_builder import COLUMNAR_FORMATS, CSVBuilder
+from .effect_tags import EFFECT_TAGS_CSV, write_effect_tags_csv
 from .json_loader import PokemonDataLoader
+from .shards import SHARD_DIR, write_shards
+from .sqlite_builder import write_sqlite_database
 
 # ロギング設定
 logging.basicConfig(
@@ -23,8 +61,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    """メイン処理."""
+def main(
+    columnar_format: str | None = None,
+    sqlite: bool = False,
+    type_defenses: bool = False,
+    speed_tiers: bool = False,
+    shards: bool = False,
+    snapshot: bool = False,
+    profile_dir: Path | None = None,
+    change_feed: bool = True,
+) -> None:
+    """メイン処理.
+
+    Args:
+        columnar_format: 指定時はCSVに加えて列指向ファイルも生成する ("parquet" / "arrow")
+        sqlite: Trueの場合はCSVに加えてSQLiteファイルも生成する
+        type_defenses: Trueの場合はCSVに加えてタイプ相性表・防御相性CSVも生成する
+        speed_tiers: Trueの場合はCSVに加えて素早さ順表CSVも生成する
+        shards: Trueの場合はCSVに加えて静的配信用のJSONシャードも生成する
+        snapshot: Trueの場合はCSVに加えて mmap 用のバイナリスナップショットも生成する
+        profile_dir: 指定時は段階ごとの処理時間・cProfile の統計・トレースをここに出力する
+        change_feed: Trueの場合は前回のCSVとの変更フィードを data/changes/ に出力する
+    """
     logger.info("=" * 60)
     logger.info("ポケモンデータベース CSV生成ツール")
     logger.info("=" * 60)
@@ -33,23 +91,44 @@ def main() -> None:
     project_root = Path(__file__).parent.parent.parent
     data_dir = project_root / "data" / "pokemon"
     output_dir = project_root / "data" / "csv_files"
+    columnar_dir = project_root / "data" / "columnar_files"
+    sqlite_path = project_root / "data" / "pokemon.sqlite3"
 
     logger.info(f"JSONデータディレクトリ: {data_dir}")
     logger.info(f"CSV出力先ディレクトリ: {output_dir}")
 
+    profiler = StageProfiler(enabled=profile_dir is not None)
+
     # 1. JSONファイル読み込み
     logger.info("\n[1/3] JSONファイル読み込み")
     loader = PokemonDataLoader(data_dir)
-    pokemon_data_list = loader.load_all_json_files()
+    with profiler.stage("load_json"):
+        pokemon_data_list = loader.load_all_json_files()
 
     # 2. データ収集と重複排除
     logger.info("\n[2/3] データ収集と重複排除")
     builder = CSVBuilder()
-    builder.collect_data(pokemon_data_list)
+    with profiler.stage("collect_data"):
+        builder.collect_data(pokemon_data_list)
 
     # 3. CSV生成と出力
     logger.info("\n[3/3] CSV生成と出力")
-    generated_files = builder.generate_csvs(output_dir)
+    with profiler.stage("build_id_mappings"):
+        builder.ensure_id_mappings()
+    if change_feed:
+        # 上書きする前に前回のCSVを読み込んでおく
+        with profiler.stage("load_previous_csv"):
+            previous_snapshot = snapshot_from_csv_dir(output_dir)
+    with profiler.stage("write_csv"):
+        generated_files = builder.generate_csvs(output_dir)
+    # 技・特性の効果タグ（データ投入時に sv.moves / sv.abilities の effect_tags へ反映）
+    with profiler.stage("write_effect_tags"):
+        generated_files["effect_tags"] = write_effect_tags_csv(
+            builder, output_dir / EFFECT_TAGS_CSV
+        )
+    # 覚える技の組（learnset）の正規化レイアウト（データ投入時に sv.learnsets などへ反映）
+    with profiler.stage("write_learnsets"):
+        generated_files.update(builder.generate_learnset_csvs(output_dir))
 
     logger.info("\n生成されたCSVファイル:")
     total_size = 0
@@ -59,10 +138,168 @@ def main() -> None:
         logger.info(f"  - {table_name}: {file_path.name} ({file_size:,} bytes)")
 
     logger.info(f"\n合計ファイルサイズ: {total_size:,} bytes")
+
+    if change_feed:
+        logger.info("\n[変更フィード]")
+        with profiler.stage("change_feed"):
+            feed = build_change_feed(previous_snapshot, snapshot_from_builder(builder))
+            feed_path = feed.write(CHANGES_DIR) if feed is not None else None
+        if feed is None:
+            logger.info("前回のCSVから変更はありません（バージョンは据え置き）")
+        elif feed.baseline:
+            logger.info(f"基準のフィード (feed_version {feed.feed_version}) を出力: {feed_path}")
+        else:
+            logger.info(f"フィード feed_version {feed.feed_version}: {feed_path}")
+            for table_name, counts in feed.summary().items():
+                if any(counts.values()):
+                    logger.info(
+                        f"  - {table_name}: 追加 {counts['added']:,} / "
+                        f"削除 {counts['removed']:,} / 変更 {counts['modified']:,}"
+                    )
+
+    if columnar_format is not None:
+        logger.info(f"\n[追加] 列指向ファイル生成 ({columnar_format})")
+        with profiler.stage("write_columnar"):
+            columnar_files = builder.generate_columnar_files(columnar_dir, columnar_format)
+        for table_name, file_path in columnar_files.items():
+            logger.info(f"  - {table_name}: {file_path.name} ({file_path.stat().st_size:,} bytes)")
+
+    if sqlite:
+        logger.info("\n[追加] SQLiteファイル生成")
+        with profiler.stage("write_sqlite"):
+            write_sqlite_database(builder, sqlite_path)
+
+    if type_defenses:
+        logger.info("\n[追加] タイプ相性CSV生成")
+        try:
+            from app.battle.type_chart import DefenseProfiles, generate_type_csvs
+        except ImportError as error:
+            msg = "タイプ相性CSVの生成には numpy が必要です: uv sync --extra analysis"
+            raise ImportError(msg) from error
+
+        with profiler.stage("type_defenses"):
+            type_files = generate_type_csvs(DefenseProfiles.from_builder(builder), output_dir)
+        for table_name, file_path in type_files.items():
+            logger.info(f"  - {table_name}: {file_path.name} ({file_path.stat().st_size:,} bytes)")
+
+    if speed_tiers:
+        logger.info("\n[追加] 素早さ順表CSV生成")
+        try:
+            from app.battle.speed_tiers import SpeedTierTable, write_speed_tiers_csv
+        except ImportError as error:
+            msg = "素早さ順表CSVの生成には numpy が必要です: uv sync --extra analysis"
+            raise ImportError(msg) from error
+
+        with profiler.stage("speed_tiers"):
+            tiers_path = write_speed_tiers_csv(
+                SpeedTierTable.from_builder(builder), output_dir / "speed_tiers.csv"
+            )
+        logger.info(f"  - speed_tiers: {tiers_path.name} ({tiers_path.stat().st_size:,} bytes)")
+
+    if shards:
+        logger.info("\n[追加] 静的JSONシャード生成")
+        with profiler.stage("write_shards"):
+            shard_result = write_shards(builder, SHARD_DIR)
+        logger.info(
+            f"  - {shard_result.total:,}シャード（書き込み {shard_result.written:,} / "
+            f"変更なし {shard_result.unchanged:,} / 削除 {shard_result.removed:,}）"
+        )
+        logger.info(f"  - マニフェスト: {shard_result.manifest_path}")
+
+    if snapshot:
+        logger.info("\n[追加] バイナリスナップショット生成")
+        with profiler.stage("write_snapshot"):
+            # ヘッダーには変更フィードのバージョン（フィードを出力しない場合は出力済みの最新）を記録
+            snapshot_path = write_snapshot(
+                builder, SNAPSHOT_PATH, feed_version=latest_feed_version(CHANGES_DIR)
+            )
+        logger.info(f"  - {snapshot_path} ({snapshot_path.stat().st_size:,} bytes)")
+
+    if profile_dir is not None:
+        logger.info("\n[プロファイル]")
+        for line in profiler.summary_lines():
+            logger.info(line)
+        files = profiler.export(profile_dir)
+        logger.info(f"\nプロファイル結果を保存しました: {profile_dir}")
+        logger.info(f"  トレース（chrome://tracing・speedscope で表示）: {files['trace'].name}")
+
     logger.info("\n" + "=" * 60)
     logger.info("処理完了")
     logger.info("=" * 60)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(
+        description="data/pokemon配下のJSONファイルからSupabase投入用のCSVファイルを生成する.",
+    )
+    parser.add_argument(
+        "--columnar",
+        choices=sorted(COLUMNAR_FORMATS),
+        default=None,
+        help="CSVに加えて data/columnar_files/ に列指向ファイルを生成します (要 pyarrow)。",
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="CSVに加えて data/pokemon.sqlite3 にsvスキーマ相当のSQLiteファイルを生成します。",
+    )
+
+    parser.add_argument(
+        "--type-defenses",
+        action="store_true",
+        help="CSVに加えてタイプ相性表と各ポケモンの防御相性CSVを生成します (要 numpy)。",
+    )
+
+    parser.add_argument(
+        "--speed-tiers",
+        action="store_true",
+        help="CSVに加えてレベル50の素早さプリセット別の素早さ順表CSVを生成します (要 numpy)。",
+    )
+
+    parser.add_argument(
+        "--shards",
+        action="store_true",
+        help="CSVに加えて data/shards/ に静的配信用の gzip 圧縮JSONシャードを生成します。",
+    )
+
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="CSVに加えて data/pokemon.snapshot に mmap 用のバイナリスナップショットを生成します。",
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="段階ごとの処理時間と cProfile の統計・トレースを data/profile/ に出力します。",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help=(
+            "--profile の出力先 (既定: data/profile/csv_generator_<日時>/)。"
+            "指定時は --profile を含みます。"
+        ),
+    )
+
+    parser.add_argument(
+        "--no-change-feed",
+        action="store_true",
+        help="前回のCSVとの変更フィード (data/changes/) を出力しません。",
+    )
+
+    parsed = parser.parse_args()
+    main(
+        columnar_format=parsed.columnar,
+        sqlite=parsed.sqlite,
+        type_defenses=parsed.type_defenses,
+        speed_tiers=parsed.speed_tiers,
+        shards=parsed.shards,
+        snapshot=parsed.snapshot,
+        # --profile-dir の指定は --profile を含む
+        profile_dir=(
+            parsed.profile_dir or (default_output_dir("csv_generator") if parsed.profile else None)
+        ),
+        change_feed=not parsed.no_change_feed,
+    )
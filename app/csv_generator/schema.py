@@ -0,0 +1,144 @@
+"""CSV・データベースのテーブル定義.
+
+各テーブルのカラム（CSVのヘッダー順）と、supabase/migrations 適用後の sv スキーマの
+カラム単位の制約を定義します。CSV生成（csv_builder）・投入前検証（validator）・
+バイナリスナップショットの読み込み（binary_snapshot）で共有するため、
+標準ライブラリ以外には依存しません（pydantic のモデルを読み込まずに参照できる）。
+"""
+
+from dataclasses import dataclass
+
+# 各テーブルのカラム（CSVのヘッダー順、マスタテーブルが先）
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "abilities": ("id", "name_ja", "effect_text"),
+    "moves": (
+        "id",
+        "name_ja",
+        "type_name",
+        "damage_class",
+        "power",
+        "accuracy",
+        "pp",
+        "priority",
+        "effect_text",
+    ),
+    "pokemon": (
+        "id",
+        "pokedex_no",
+        "name_ja",
+        "name_en",
+        "form_label",
+        "type_primary",
+        "type_secondary",
+        "height_dm",
+        "weight_hg",
+        "low_kick_power",
+        "is_legendary",
+        "is_mythical",
+        "base_hp",
+        "base_atk",
+        "base_def",
+        "base_spa",
+        "base_spd",
+        "base_spe",
+        "remarks",
+    ),
+    "pokemon_abilities": ("pokemon_id", "ability_id", "is_hidden"),
+    "pokemon_moves": ("pokemon_id", "move_id"),
+}
+
+# chk_type_primary / chk_type_secondary / chk_move_type
+TYPE_NAMES: frozenset[str] = frozenset(
+    (
+        "ノーマル",
+        "ほのお",
+        "みず",
+        "でんき",
+        "くさ",
+        "こおり",
+        "かくとう",
+        "どく",
+        "じめん",
+        "ひこう",
+        "エスパー",
+        "むし",
+        "いわ",
+        "ゴースト",
+        "ドラゴン",
+        "あく",
+        "はがね",
+        "フェアリー",
+    )
+)
+# chk_damage_class（20251102142819_allow_null_damage_class.sql で NULL 許容）
+DAMAGE_CLASSES: frozenset[str] = frozenset(("physical", "special", "status"))
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnRule:
+    """1カラム分の制約.
+
+    Attributes:
+        name: カラム名
+        kind: 型（"integer" / "smallint" / "boolean" / "text"）
+        nullable: NULL（空欄）を許容するか
+        max_length: VARCHAR の最大文字数
+        choices: CHECK 制約で許容される値
+    """
+
+    name: str
+    kind: str = "text"
+    nullable: bool = True
+    max_length: int | None = None
+    choices: frozenset[str] | None = None
+
+
+# テーブルごとのカラム制約（TABLE_COLUMNS と同じ順）
+TABLE_RULES: dict[str, tuple[ColumnRule, ...]] = {
+    "abilities": (
+        ColumnRule("id", "integer", nullable=False),
+        ColumnRule("name_ja", nullable=False, max_length=64),
+        ColumnRule("effect_text"),
+    ),
+    "moves": (
+        ColumnRule("id", "integer", nullable=False),
+        ColumnRule("name_ja", nullable=False, max_length=64),
+        ColumnRule("type_name", nullable=False, max_length=16, choices=TYPE_NAMES),
+        ColumnRule("damage_class", max_length=16, choices=DAMAGE_CLASSES),
+        ColumnRule("power", "smallint"),
+        ColumnRule("accuracy", "smallint"),
+        ColumnRule("pp", "smallint"),
+        ColumnRule("priority", "smallint"),
+        ColumnRule("effect_text"),
+    ),
+    "pokemon": (
+        ColumnRule("id", "integer", nullable=False),
+        ColumnRule("pokedex_no", "integer", nullable=False),
+        ColumnRule("name_ja", nullable=False, max_length=64),
+        ColumnRule("name_en", max_length=64),
+        ColumnRule("form_label", max_length=64),
+        ColumnRule("type_primary", nullable=False, max_length=16, choices=TYPE_NAMES),
+        ColumnRule("type_secondary", max_length=16, choices=TYPE_NAMES),
+        ColumnRule("height_dm", "smallint"),
+        ColumnRule("weight_hg", "smallint"),
+        ColumnRule("low_kick_power", "smallint"),
+        ColumnRule("is_legendary", "boolean"),
+        ColumnRule("is_mythical", "boolean"),
+        ColumnRule("base_hp", "smallint", nullable=False),
+        ColumnRule("base_atk", "smallint", nullable=False),
+        ColumnRule("base_def", "smallint", nullable=False),
+        ColumnRule("base_spa", "smallint", nullable=False),
+        ColumnRule("base_spd", "smallint", nullable=False),
+        ColumnRule("base_spe", "smallint", nullable=False),
+        ColumnRule("remarks"),
+    ),
+    "pokemon_abilities": (
+        ColumnRule("pokemon_id", "integer", nullable=False),
+        ColumnRule("ability_id", "integer", nullable=False),
+        ColumnRule("is_hidden", "boolean", nullable=False),
+    ),
+    "pokemon_moves": (
+        ColumnRule("pokemon_id", "integer", nullable=False),
+        ColumnRule("move_id", "integer", nullable=False),
+    ),
+}
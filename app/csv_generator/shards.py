@@ -0,0 +1,292 @@
+"""読み取り専用配信用の静的JSONシャード.
+
+よく使われる参照（名前・IDによるポケモン、技を覚えるポケモン、特性を持つポケモン、
+タイプに属するポケモン・技）をあらかじめ gzip 圧縮した JSON ファイルとして出力します。
+静的ファイルサーバーや CDN からそのまま配信でき、データベースへの問い合わせは発生しません。
+
+出力（data/shards/）:
+    manifest.json                  名前・ID -> シャードのパス、シャードごとの内容ハッシュ
+    pokemon/<キーのハッシュ>.json.gz  ポケモン1匹（特性・覚える技の名前を含む）
+    moves/<キーのハッシュ>.json.gz    技1つと覚えるポケモン
+    abilities/<キーのハッシュ>.json.gz 特性1つと持つポケモン
+    types/<タイプの英名>.json.gz      タイプ1つに属するポケモンと技
+
+ファイル名は name_ja のハッシュから作るため、特性・技の追加で ID が振り直されてもパスは
+変わりません。シャードの内容にも ID（サロゲートキー）は含めず、他のデータは name_ja で参照し、
+ポケモンの並びは図鑑番号順とします。ID は manifest.json の by_id の索引にのみ記録します。
+前回の manifest.json の内容ハッシュと比較し、内容が変わったシャードだけを書き直します。
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .csv_builder import TABLE_COLUMNS, CSVBuilder
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+SHARD_DIR = PROJECT_ROOT / "data" / "shards"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_FORMAT = 2
+
+# タイプ名 -> シャードのファイル名（supabase/migrations の CHECK 制約と同じ並び）
+TYPE_SLUGS: dict[str, str] = {
+    "ノーマル": "normal",
+    "ほのお": "fire",
+    "みず": "water",
+    "でんき": "electric",
+    "くさ": "grass",
+    "こおり": "ice",
+    "かくとう": "fighting",
+    "どく": "poison",
+    "じめん": "ground",
+    "ひこう": "flying",
+    "エスパー": "psychic",
+    "むし": "bug",
+    "いわ": "rock",
+    "ゴースト": "ghost",
+    "ドラゴン": "dragon",
+    "あく": "dark",
+    "はがね": "steel",
+    "フェアリー": "fairy",
+}
+
+# シャードファイル名に使う name_ja のハッシュの桁数
+_KEY_DIGEST_LENGTH = 16
+
+
+@dataclass(frozen=True, slots=True)
+class ShardBuildResult:
+    """シャード出力の結果.
+
+    Attributes:
+        manifest_path: manifest.json のパス
+        written: 書き込んだ（新規・内容が変わった）シャード数
+        unchanged: 内容が同じため書き込まなかったシャード数
+        removed: 対応するデータがなくなったため削除したシャード数
+    """
+
+    manifest_path: Path
+    written: int
+    unchanged: int
+    removed: int
+
+    @property
+    def total(self) -> int:
+        """出力後のシャード数."""
+        return self.written + self.unchanged
+
+
+def shard_key(name: str) -> str:
+    """name_ja からシャードのファイル名（拡張子なし）を作る."""
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()[:_KEY_DIGEST_LENGTH]
+
+
+def render_shards(builder: CSVBuilder) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """ビルド結果からシャードの内容と索引を作る.
+
+    Args:
+        builder: データ収集済みのビルダー
+
+    Returns:
+        (索引, シャードの相対パス -> 内容)。索引は manifest.json の
+        "pokemon" / "moves" / "abilities" / "types" にそのまま使う
+    """
+    abilities = _records(builder, "abilities")
+    moves = _records(builder, "moves")
+    pokemon = _records(builder, "pokemon")
+
+    def pokedex_order(pokemon_id: int) -> tuple[int, str]:
+        return pokemon[pokemon_id]["pokedex_no"], pokemon[pokemon_id]["name_ja"]
+
+    pokemon_abilities: dict[int, list[dict[str, Any]]] = defaultdict(list)
+    ability_holders: dict[int, list[int]] = defaultdict(list)
+    hidden_abilities: dict[tuple[int, int], bool] = {}
+    for pokemon_id, ability_id, is_hidden in builder.iter_rows("pokemon_abilities"):
+        pokemon_abilities[pokemon_id].append(
+            {"name_ja": abilities[ability_id]["name_ja"], "is_hidden": is_hidden}
+        )
+        ability_holders[ability_id].append(pokemon_id)
+        hidden_abilities[pokemon_id, ability_id] = is_hidden
+
+    pokemon_moves: dict[int, list[int]] = defaultdict(list)
+    move_learners: dict[int, list[int]] = defaultdict(list)
+    for pokemon_id, move_id in builder.iter_rows("pokemon_moves"):
+        pokemon_moves[pokemon_id].append(move_id)
+        move_learners[move_id].append(pokemon_id)
+
+    shards: dict[str, dict[str, Any]] = {}
+    index: dict[str, Any] = {}
+
+    def add(
+        kind: str,
+        records: dict[int, dict[str, Any]],
+        render: Callable[[int, dict[str, Any]], dict[str, Any]],
+    ) -> None:
+        by_name: dict[str, str] = {}
+        by_id: dict[str, str] = {}
+        for record_id, record in records.items():
+            path = f"{kind}/{shard_key(record['name_ja'])}.json.gz"
+            if path in shards:
+                msg = f"シャードのパスが重複しています: {path} ({record['name_ja']})"
+                raise ValueError(msg)
+            content = render(record_id, record)
+            # ID は manifest.json の by_id にのみ記録する（ID の振り直しで内容を変えない）
+            del content["id"]
+            shards[path] = content
+            by_name[record["name_ja"]] = path
+            by_id[str(record_id)] = path
+        index[kind] = {"by_name": by_name, "by_id": by_id}
+
+    add(
+        "pokemon",
+        pokemon,
+        lambda pokemon_id, record: {
+            **record,
+            "abilities": pokemon_abilities[pokemon_id],
+            "moves": sorted(moves[move_id]["name_ja"] for move_id in pokemon_moves[pokemon_id]),
+        },
+    )
+    add(
+        "moves",
+        moves,
+        lambda move_id, record: {
+            **record,
+            "learners": [
+                {"name_ja": pokemon[pokemon_id]["name_ja"]}
+                for pokemon_id in sorted(move_learners[move_id], key=pokedex_order)
+            ],
+        },
+    )
+    add(
+        "abilities",
+        abilities,
+        lambda ability_id, record: {
+            **record,
+            "holders": [
+                {
+                    "name_ja": pokemon[pokemon_id]["name_ja"],
+                    "is_hidden": hidden_abilities[pokemon_id, ability_id],
+                }
+                for pokemon_id in sorted(ability_holders[ability_id], key=pokedex_order)
+            ],
+        },
+    )
+
+    type_pokemon: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for pokemon_id in sorted(pokemon, key=pokedex_order):
+        record = pokemon[pokemon_id]
+        member = {
+            "name_ja": record["name_ja"],
+            "type_primary": record["type_primary"],
+            "type_secondary": record["type_secondary"],
+        }
+        type_pokemon[record["type_primary"]].append(member)
+        if record["type_secondary"] is not None:
+            type_pokemon[record["type_secondary"]].append(member)
+    type_moves: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for record in moves.values():
+        type_moves[record["type_name"]].append({"name_ja": record["name_ja"]})
+
+    by_type: dict[str, str] = {}
+    for type_name, slug in TYPE_SLUGS.items():
+        path = f"types/{slug}.json.gz"
+        shards[path] = {
+            "type_name": type_name,
+            "pokemon": type_pokemon[type_name],
+            "moves": type_moves[type_name],
+        }
+        by_type[type_name] = path
+    index["types"] = {"by_name": by_type}
+
+    return index, shards
+
+
+def write_shards(builder: CSVBuilder, output_dir: Path = SHARD_DIR) -> ShardBuildResult:
+    """静的JSONシャードと manifest.json を出力する.
+
+    前回の manifest.json に記録した内容ハッシュと同じシャードは書き直さず、
+    今回のビルドに含まれないシャードは、manifest.json を置き換えた後に削除する。
+
+    Args:
+        builder: データ収集済みのビルダー
+        output_dir: 出力ディレクトリ
+
+    Returns:
+        出力結果
+    """
+    index, shards = render_shards(builder)
+    manifest_path = output_dir / MANIFEST_NAME
+    previous_hashes = _load_previous_hashes(manifest_path)
+
+    hashes: dict[str, str] = {}
+    written = unchanged = 0
+    for relative_path, content in shards.items():
+        data = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        hashes[relative_path] = digest
+        path = output_dir / relative_path
+        if previous_hashes.get(relative_path) == digest and path.exists():
+            unchanged += 1
+            continue
+        # mtime=0 で同じ内容からは同じ圧縮ファイルを作る（CDN の ETag を安定させる）
+        _replace_file(path, gzip.compress(data, compresslevel=9, mtime=0))
+        written += 1
+
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "generated_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "counts": {table_name: builder.row_count(table_name) for table_name in TABLE_COLUMNS},
+        **index,
+        "shards": hashes,
+    }
+    _replace_file(
+        manifest_path,
+        json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+    )
+
+    removed = 0
+    for relative_path in previous_hashes.keys() - hashes.keys():
+        stale = output_dir / relative_path
+        if stale.exists():
+            stale.unlink()
+            removed += 1
+
+    return ShardBuildResult(manifest_path, written, unchanged, removed)
+
+
+def _records(builder: CSVBuilder, table_name: str) -> dict[int, dict[str, Any]]:
+    """マスタテーブルの行を ID -> カラム名 -> 値 の辞書にする."""
+    columns = TABLE_COLUMNS[table_name]
+    return {row[0]: dict(zip(columns, row, strict=True)) for row in builder.iter_rows(table_name)}
+
+
+def _load_previous_hashes(manifest_path: Path) -> dict[str, str]:
+    """前回の manifest.json のシャードごとの内容ハッシュ（なければ空）."""
+    if not manifest_path.exists():
+        return {}
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        logger.warning(f"manifest.json を読み込めないため全シャードを書き直します: {manifest_path}")
+        return {}
+    if manifest.get("format") != MANIFEST_FORMAT:
+        return {}
+    return manifest.get("shards", {})
+
+
+def _replace_file(path: Path, data: bytes) -> None:
+    """一時ファイルに書き込んでから置き換える（配信中に書きかけのファイルを見せない）."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
@@ -0,0 +1,214 @@
+"""SQLite出力モジュール.
+
+CSVBuilderが収集したデータから、Supabaseの `sv` スキーマと同じテーブル・制約・
+インデックスを持つ単一のSQLiteファイルを生成します。
+
+生成したファイルを `sv` という名前でATTACHすると、`docs/DB設計書.md` の
+代表的なクエリ（`sv.pokemon` などのスキーマ修飾付き）をそのまま実行できます。
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+from .csv_builder import TABLE_COLUMNS, CSVBuilder
+
+logger = logging.getLogger(__name__)
+
+# ATTACH時のスキーマ名（Supabase側のスキーマ名に合わせる）
+SCHEMA_NAME = "sv"
+
+_TYPE_NAMES = (
+    "'ノーマル', 'ほのお', 'みず', 'でんき', 'くさ', 'こおり', "
+    "'かくとう', 'どく', 'じめん', 'ひこう', 'エスパー', 'むし', "
+    "'いわ', 'ゴースト', 'ドラゴン', 'あく', 'はがね', 'フェアリー'"
+)
+
+# supabase/migrations の適用後の状態に対応するテーブル定義
+_CREATE_TABLE_STATEMENTS = (
+    f"""
+CREATE TABLE pokemon (
+    id INTEGER PRIMARY KEY,
+    pokedex_no INTEGER NOT NULL,
+    name_ja VARCHAR(64) UNIQUE NOT NULL,
+    name_en VARCHAR(64),
+    form_label VARCHAR(64),
+    type_primary VARCHAR(16) NOT NULL,
+    type_secondary VARCHAR(16),
+    height_dm SMALLINT,
+    weight_hg SMALLINT,
+    low_kick_power SMALLINT,
+    is_legendary BOOLEAN DEFAULT FALSE,
+    is_mythical BOOLEAN DEFAULT FALSE,
+    base_hp SMALLINT NOT NULL,
+    base_atk SMALLINT NOT NULL,
+    base_def SMALLINT NOT NULL,
+    base_spa SMALLINT NOT NULL,
+    base_spd SMALLINT NOT NULL,
+    base_spe SMALLINT NOT NULL,
+    remarks TEXT,
+    CONSTRAINT chk_type_primary CHECK (type_primary IN ({_TYPE_NAMES})),
+    CONSTRAINT chk_type_secondary CHECK (
+        type_secondary IS NULL OR type_secondary IN ({_TYPE_NAMES})
+    )
+)
+""",
+    """
+CREATE TABLE abilities (
+    id INTEGER PRIMARY KEY,
+    name_ja VARCHAR(64) UNIQUE NOT NULL,
+    effect_text TEXT
+)
+""",
+    """
+CREATE TABLE pokemon_abilities (
+    pokemon_id INTEGER NOT NULL,
+    ability_id INTEGER NOT NULL,
+    is_hidden BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (pokemon_id, ability_id),
+    FOREIGN KEY (pokemon_id) REFERENCES pokemon(id) ON DELETE CASCADE,
+    FOREIGN KEY (ability_id) REFERENCES abilities(id) ON DELETE CASCADE
+) WITHOUT ROWID
+""",
+    f"""
+CREATE TABLE moves (
+    id INTEGER PRIMARY KEY,
+    name_ja VARCHAR(64) UNIQUE NOT NULL,
+    type_name VARCHAR(16) NOT NULL,
+    damage_class VARCHAR(16),
+    power SMALLINT,
+    accuracy SMALLINT,
+    pp SMALLINT,
+    priority SMALLINT DEFAULT 0,
+    effect_text TEXT,
+    CONSTRAINT chk_move_type CHECK (type_name IN ({_TYPE_NAMES})),
+    CONSTRAINT chk_damage_class CHECK (
+        damage_class IS NULL OR damage_class IN ('physical', 'special', 'status')
+    )
+)
+""",
+    """
+CREATE TABLE pokemon_moves (
+    pokemon_id INTEGER NOT NULL,
+    move_id INTEGER NOT NULL,
+    PRIMARY KEY (pokemon_id, move_id),
+    FOREIGN KEY (pokemon_id) REFERENCES pokemon(id) ON DELETE CASCADE,
+    FOREIGN KEY (move_id) REFERENCES moves(id) ON DELETE CASCADE
+) WITHOUT ROWID
+""",
+)
+
+# タイプ別部分インデックス (インデックス名の接尾辞, タイプ名)
+_TYPE_INDEXES = (
+    ("normal", "ノーマル"),
+    ("fire", "ほのお"),
+    ("water", "みず"),
+    ("electric", "でんき"),
+    ("grass", "くさ"),
+    ("ice", "こおり"),
+    ("fighting", "かくとう"),
+    ("poison", "どく"),
+    ("ground", "じめん"),
+    ("flying", "ひこう"),
+    ("psychic", "エスパー"),
+    ("bug", "むし"),
+    ("rock", "いわ"),
+    ("ghost", "ゴースト"),
+    ("dragon", "ドラゴン"),
+    ("dark", "あく"),
+    ("steel", "はがね"),
+    ("fairy", "フェアリー"),
+)
+
+# データ投入後に作成するインデックス（投入中のインデックス更新を避けるため）
+_CREATE_INDEX_STATEMENTS = (
+    "CREATE INDEX idx_pokemon_pokedex_no ON pokemon(pokedex_no)",
+    "CREATE INDEX idx_pokemon_base_spe ON pokemon(base_spe)",
+    "CREATE INDEX idx_pokemon_is_legendary ON pokemon(is_legendary)",
+    "CREATE INDEX idx_pokemon_is_mythical ON pokemon(is_mythical)",
+    *(
+        f"CREATE INDEX idx_pokemon_type_{suffix} ON pokemon(id) "
+        f"WHERE type_primary = '{type_name}' OR type_secondary = '{type_name}'"
+        for suffix, type_name in _TYPE_INDEXES
+    ),
+    "CREATE INDEX idx_pokemon_abilities_ability_id ON pokemon_abilities(ability_id, pokemon_id)",
+    "CREATE INDEX idx_pokemon_abilities_is_hidden ON pokemon_abilities(is_hidden)",
+    "CREATE INDEX idx_moves_type_name ON moves(type_name)",
+    "CREATE INDEX idx_moves_damage_class ON moves(damage_class)",
+    "CREATE INDEX idx_pokemon_moves_move_id ON pokemon_moves(move_id, pokemon_id)",
+)
+
+
+def write_sqlite_database(builder: CSVBuilder, output_path: Path) -> Path:
+    """svスキーマ相当のSQLiteファイルを生成する.
+
+    既存ファイルは作り直す。全テーブルを1トランザクションで一括投入し、
+    インデックスは投入後に作成してANALYZEまで実行する。
+
+    Args:
+        builder: collect_data() 済みのCSVBuilder
+        output_path: 出力するSQLiteファイルのパス
+
+    Returns:
+        生成されたファイルパス
+    """
+    logger.info(f"SQLite生成中: {output_path}")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(output_path, isolation_level=None)
+    try:
+        # 新規ファイルへの一括投入のため、ジャーナル・同期書き込みを無効化する
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA locking_mode = EXCLUSIVE")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        conn.execute("BEGIN")
+        for statement in _CREATE_TABLE_STATEMENTS:
+            conn.execute(statement)
+        for table_name, columns in TABLE_COLUMNS.items():
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})",
+                builder.iter_rows(table_name),
+            )
+        for statement in _CREATE_INDEX_STATEMENTS:
+            conn.execute(statement)
+        conn.execute("COMMIT")
+
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    logger.info(f"SQLite生成完了: {output_path.stat().st_size:,} bytes")
+    return output_path
+
+
+def connect_sqlite(database_path: Path) -> sqlite3.Connection:
+    """生成済みSQLiteファイルを `sv` スキーマとしてATTACHした接続を返す.
+
+    `SELECT ... FROM sv.pokemon` のようにSupabaseと同じスキーマ修飾でクエリできる。
+
+    Args:
+        database_path: write_sqlite_database() で生成したファイルのパス
+
+    Returns:
+        読み取り専用でATTACHしたsqlite3.Connection
+
+    Raises:
+        FileNotFoundError: database_pathが存在しない場合
+    """
+    if not database_path.exists():
+        msg = f"SQLiteファイルが存在しません: {database_path}"
+        raise FileNotFoundError(msg)
+
+    conn = sqlite3.connect(":memory:", uri=True)
+    conn.execute(
+        f"ATTACH DATABASE ? AS {SCHEMA_NAME}",
+        (f"{database_path.resolve().as_uri()}?mode=ro",),
+    )
+    return conn
@@ -0,0 +1,379 @@
+"""生成済みCSVの投入前検証.
+
+data/csv_files/ の5テーブル分のCSVを1回ずつ読み、supabase/migrations 適用後の
+sv スキーマの制約（NOT NULL・CHECK・VARCHAR長・SMALLINT範囲・主キー/UNIQUE・外部キー）と、
+派生テーブル（sv.speed_tiers・sv.pokemon_search）の SMALLINT 列が溢れないことを検証します。
+import_to_supabase.sh がデータベースに触れる前に実行し、違反があれば投入を中止します。
+
+CSVの空欄は PostgreSQL の COPY と同じく NULL として扱います。
+
+Usage:
+    uv run python -m app.csv_generator.validator
+    uv run python -m app.csv_generator.validator --csv-dir data/csv_files --max-errors 0
+"""
+
+import argparse
+import csv
+import logging
+import re
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .schema import TABLE_COLUMNS, TABLE_RULES, ColumnRule
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_CSV_DIR = PROJECT_ROOT / "data" / "csv_files"
+DEFAULT_MAX_ERRORS = 20
+
+SMALLINT_RANGE = (-32_768, 32_767)
+INTEGER_RANGE = (-2_147_483_648, 2_147_483_647)
+
+# PostgreSQL の boolean 入力として受け付ける値（大文字小文字は区別しない）
+_BOOLEAN_LITERALS: dict[str, bool] = {
+    "t": True,
+    "true": True,
+    "y": True,
+    "yes": True,
+    "on": True,
+    "1": True,
+    "f": False,
+    "false": False,
+    "n": False,
+    "no": False,
+    "off": False,
+    "0": False,
+}
+_INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+
+# sv.speed_tiers の最大の補正（fastest_scarf: 個体値31・努力値252・性格1.1倍・スカーフ1.5倍）
+_MAX_SPEED_PRESET = (31, 252, 11, 15)
+
+# 型変換・カラム単位の制約に違反したセル（テーブル単位の検証から除外する）
+_INVALID: Any = object()
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+    """制約違反1件.
+
+    Attributes:
+        table: テーブル名
+        line: CSVの行番号（ヘッダーが1行目。ファイル単位の違反は0）
+        column: カラム名（行・ファイル単位の違反は空文字列）
+        message: 違反の内容
+        value: 違反した値
+    """
+
+    table: str
+    line: int
+    column: str
+    message: str
+    value: str | None = None
+
+    def __str__(self) -> str:
+        """`pokemon.csv:12 type_primary: ...` 形式の1行."""
+        location = f"{self.table}.csv:{self.line}"
+        if self.column:
+            location += f" {self.column}"
+        text = f"{location}: {self.message}"
+        if self.value is not None:
+            text += f" (値: {self.value!r})"
+        return text
+
+
+@dataclass(slots=True)
+class ValidationResult:
+    """検証結果.
+
+    Attributes:
+        row_counts: テーブル名 -> 検証した行数
+        violations: 違反（max_errors 件に達した時点で打ち切る）
+        truncated: 違反が max_errors 件に達して検証を打ち切ったか
+    """
+
+    row_counts: dict[str, int] = field(default_factory=dict)
+    violations: list[Violation] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """違反がないか."""
+        return not self.violations
+
+
+# 外部キー（関連テーブル -> (カラム番号, 参照先テーブル)）
+FOREIGN_KEYS: dict[str, tuple[tuple[int, str], ...]] = {
+    "pokemon_abilities": ((0, "pokemon"), (1, "abilities")),
+    "pokemon_moves": ((0, "pokemon"), (1, "moves")),
+}
+
+
+class _TooManyViolations(Exception):
+    """違反が上限に達したことを知らせる（検証の打ち切り用）."""
+
+
+class CSVValidator:
+    """5テーブル分のCSVを1回ずつ読んで検証する.
+
+    マスタテーブル（abilities・moves・pokemon）を先に読み、主キーの集合を保持したまま
+    関連テーブルを読むことで、外部キーも同じ1回の読み込みで検証する。
+    """
+
+    def __init__(self, csv_dir: Path, max_errors: int = DEFAULT_MAX_ERRORS) -> None:
+        """初期化.
+
+        Args:
+            csv_dir: CSVファイルのディレクトリ
+            max_errors: この件数の違反が見つかった時点で打ち切る（0 で全件検証）
+        """
+        self.csv_dir = csv_dir
+        self.max_errors = max_errors
+        self.result = ValidationResult()
+        # マスタテーブル名 -> 主キー -> 行番号（外部キーの検証に使う）
+        self._primary_keys: dict[str, dict[int, int]] = {}
+
+    def validate(self) -> ValidationResult:
+        """全テーブルを検証する.
+
+        Returns:
+            検証結果
+        """
+        try:
+            for table_name in TABLE_COLUMNS:
+                self._validate_table(table_name)
+        except _TooManyViolations:
+            self.result.truncated = True
+        return self.result
+
+    def _report(
+        self, table: str, line: int, column: str, message: str, value: str | None = None
+    ) -> None:
+        """違反を記録する（上限に達したら打ち切る）."""
+        self.result.violations.append(Violation(table, line, column, message, value))
+        if self.max_errors and len(self.result.violations) >= self.max_errors:
+            raise _TooManyViolations
+
+    def _validate_table(self, table_name: str) -> None:
+        """テーブル1つ分のCSVを検証する."""
+        path = self.csv_dir / f"{table_name}.csv"
+        if not path.exists():
+            self._report(table_name, 0, "", f"ファイルが存在しません: {path}")
+            return
+
+        rules = TABLE_RULES[table_name]
+        check_row = self._row_checker(table_name)
+        count = 0
+        with path.open(encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None or tuple(header) != TABLE_COLUMNS[table_name]:
+                self._report(
+                    table_name,
+                    1,
+                    "",
+                    f"ヘッダーが一致しません (期待: {','.join(TABLE_COLUMNS[table_name])})",
+                    ",".join(header or []),
+                )
+                return
+
+            line = reader.line_num + 1
+            for row in reader:
+                count += 1
+                if len(row) != len(rules):
+                    self._report(
+                        table_name, line, "", f"カラム数が{len(row)}です (期待: {len(rules)})"
+                    )
+                else:
+                    values = [
+                        self._parse(table_name, line, rule, raw)
+                        for rule, raw in zip(rules, row, strict=True)
+                    ]
+                    check_row(line, values)
+                line = reader.line_num + 1
+
+        self.result.row_counts[table_name] = count
+
+    def _parse(self, table: str, line: int, rule: ColumnRule, raw: str) -> Any:
+        """1セルを型変換し、カラム単位の制約を検証する（違反時は _INVALID）."""
+        if raw == "":
+            if not rule.nullable:
+                self._report(table, line, rule.name, "NOT NULL 制約違反（空欄）")
+                return _INVALID
+            return None
+
+        if rule.kind in ("integer", "smallint"):
+            text = raw.strip()
+            if not _INTEGER_PATTERN.fullmatch(text):
+                self._report(table, line, rule.name, "整数ではありません", raw)
+                return _INVALID
+            value = int(text)
+            low, high = SMALLINT_RANGE if rule.kind == "smallint" else INTEGER_RANGE
+            if not low <= value <= high:
+                self._report(table, line, rule.name, f"{rule.kind.upper()} の範囲外です", raw)
+                return _INVALID
+            return value
+
+        if rule.kind == "boolean":
+            boolean = _BOOLEAN_LITERALS.get(raw.strip().lower())
+            if boolean is None:
+                self._report(table, line, rule.name, "真偽値ではありません", raw)
+                return _INVALID
+            return boolean
+
+        if rule.max_length is not None and len(raw) > rule.max_length:
+            self._report(table, line, rule.name, f"VARCHAR({rule.max_length}) を超えています", raw)
+            return _INVALID
+        if rule.choices is not None and raw not in rule.choices:
+            self._report(table, line, rule.name, "CHECK 制約で許可されていない値です", raw)
+            return _INVALID
+        return raw
+
+    def _row_checker(self, table_name: str) -> Callable[[int, list[Any]], None]:
+        """テーブル単位の制約（主キー・UNIQUE・外部キー・派生列）を検証する関数を返す."""
+        if table_name in FOREIGN_KEYS:
+            return self._relation_checker(table_name)
+
+        primary_keys: dict[int, int] = self._primary_keys.setdefault(table_name, {})
+        names: dict[str, int] = {}
+        name_index = TABLE_COLUMNS[table_name].index("name_ja")
+        is_pokemon = table_name == "pokemon"
+
+        def check(line: int, values: list[Any]) -> None:
+            self._check_unique(table_name, line, "id", values[0], primary_keys)
+            self._check_unique(table_name, line, "name_ja", values[name_index], names)
+            if is_pokemon:
+                self._check_pokemon_derived(line, values)
+
+        return check
+
+    def _relation_checker(self, table_name: str) -> Callable[[int, list[Any]], None]:
+        """関連テーブルの主キー・外部キーを検証する関数を返す."""
+        columns = TABLE_COLUMNS[table_name]
+        foreign_keys = [
+            (index, columns[index], target, self._primary_keys.get(target, {}))
+            for index, target in FOREIGN_KEYS[table_name]
+        ]
+        pairs: dict[tuple[int, int], int] = {}
+
+        def check(line: int, values: list[Any]) -> None:
+            for index, column, target, keys in foreign_keys:
+                value = values[index]
+                if value is not _INVALID and value not in keys:
+                    self._report(
+                        table_name,
+                        line,
+                        column,
+                        f"外部キー違反（{target}.csv に id がありません）",
+                        str(value),
+                    )
+            pair = (values[0], values[1])
+            if _INVALID not in pair:
+                self._check_unique(table_name, line, f"({columns[0]}, {columns[1]})", pair, pairs)
+
+        return check
+
+    def _check_unique(
+        self, table: str, line: int, column: str, value: Any, seen: dict[Any, int]
+    ) -> None:
+        """値の重複を検証する（最初に現れた行番号を記録する）."""
+        if value is _INVALID:
+            return
+        first_line = seen.setdefault(value, line)
+        if first_line != line:
+            self._report(
+                table, line, column, f"重複しています（{first_line}行目と同じ値）", str(value)
+            )
+
+    def _check_pokemon_derived(self, line: int, values: list[Any]) -> None:
+        """派生テーブルで SMALLINT に変換する値が溢れないかを検証する."""
+        stats = values[12:18]
+        if _INVALID in stats:
+            return
+        base_total = sum(stats)
+        if base_total > SMALLINT_RANGE[1]:
+            self._report(
+                "pokemon",
+                line,
+                "base_*",
+                "種族値合計が SMALLINT の範囲外です（sv.pokemon_search.base_total）",
+                str(base_total),
+            )
+        iv, ev, nature_tenths, item_tenths = _MAX_SPEED_PRESET
+        speed = ((2 * stats[5] + iv + ev // 4) * 50 // 100 + 5) * nature_tenths // 10
+        speed = speed * item_tenths // 10
+        if speed > SMALLINT_RANGE[1]:
+            self._report(
+                "pokemon",
+                line,
+                "base_spe",
+                "素早さ実数値が SMALLINT の範囲外です（sv.speed_tiers.speed）",
+                str(stats[5]),
+            )
+
+
+def validate_csv_dir(csv_dir: Path, max_errors: int = DEFAULT_MAX_ERRORS) -> ValidationResult:
+    """CSVディレクトリを検証する.
+
+    Args:
+        csv_dir: CSVファイルのディレクトリ
+        max_errors: この件数の違反が見つかった時点で打ち切る（0 で全件検証）
+
+    Returns:
+        検証結果
+    """
+    return CSVValidator(csv_dir, max_errors).validate()
+
+
+def main(csv_dir: Path = DEFAULT_CSV_DIR, max_errors: int = DEFAULT_MAX_ERRORS) -> int:
+    """メイン処理.
+
+    Args:
+        csv_dir: CSVファイルのディレクトリ
+        max_errors: この件数の違反が見つかった時点で打ち切る（0 で全件検証）
+
+    Returns:
+        終了コード（違反があれば1）
+    """
+    logger.info(f"CSV事前検証: {csv_dir}")
+    result = validate_csv_dir(csv_dir, max_errors)
+
+    for table_name, count in result.row_counts.items():
+        logger.info(f"  - {table_name}: {count:,}件")
+
+    if result.ok:
+        logger.info("制約違反はありません")
+        return 0
+
+    for violation in result.violations:
+        logger.error(str(violation))
+    suffix = f"（{max_errors}件で打ち切り）" if result.truncated else ""
+    logger.error(f"制約違反が{len(result.violations)}件見つかりました{suffix}")
+    return 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(
+        description="生成済みCSVがsvスキーマの制約を満たすかを投入前に検証する.",
+    )
+    parser.add_argument(
+        "--csv-dir",
+        type=Path,
+        default=DEFAULT_CSV_DIR,
+        help="CSVファイルのディレクトリ (既定: data/csv_files)。",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=DEFAULT_MAX_ERRORS,
+        help=f"この件数の違反で検証を打ち切ります (既定: {DEFAULT_MAX_ERRORS}、0 で全件)。",
+    )
+
+    parsed = parser.parse_args()
+    sys.exit(main(csv_dir=parsed.csv_dir, max_errors=max(parsed.max_errors, 0)))
@@ -0,0 +1,5 @@
+"""Pipeline orchestrator for scrape -> JSON -> CSV -> Supabase.
+
+各ステージの入力の内容ハッシュを記録し、変更のあったステージだけを依存関係の順に
+（独立したステージは並列に）実行する。
+"""
@@ -0,0 +1,320 @@
+"""入力ハッシュ付きのステージDAG.
+
+各ステージの入力・出力ファイルの内容ハッシュを状態ファイルに記録し、前回の成功時から
+入力が変わっておらず出力も残っているステージは実行を省略します。依存関係のない
+ステージはスレッドプールで並列に実行します（CPU を使う処理はステージ側で
+サブプロセス・子プロセスに任せ、スレッドは完了を待つだけにします）。
+
+Example:
+    pipeline = Pipeline([
+        Stage("csv", run_csv, inputs=(json_dir,), outputs=(csv_dir,)),
+        Stage("import", run_import, inputs=(csv_dir,), deps=("csv",)),
+    ], state_path=Path("data/pipeline/state.json"))
+    results = pipeline.run()
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 実行結果の状態
+STATUS_RUN = "run"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_BLOCKED = "blocked"
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    """パイプラインの1ステージ.
+
+    Attributes:
+        name: ステージ名
+        run: 処理本体（例外の送出で失敗とみなす）
+        inputs: 入力ファイル・ディレクトリ（ディレクトリは配下の全ファイル）
+        outputs: 出力ファイル・ディレクトリ（空の場合は出力の検証を行わない）
+        deps: 先に完了している必要があるステージ名
+        params: 処理の設定値（入力ハッシュと状態のキーに含める）
+    """
+
+    name: str
+    run: Callable[[], None]
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    deps: tuple[str, ...] = ()
+    params: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def state_key(self) -> str:
+        """状態ファイルのキー（設定値ごとに別の状態を持つ）."""
+        if not self.params:
+            return self.name
+        suffix = ",".join(f"{key}={value}" for key, value in sorted(self.params.items()))
+        return f"{self.name}@{suffix}"
+
+
+@dataclass(slots=True)
+class StageResult:
+    """ステージの実行結果.
+
+    Attributes:
+        name: ステージ名
+        status: run / skipped / failed / blocked（依存先の失敗で未実行）
+        seconds: 実行時間（秒。入力ハッシュの計算を含む）
+        error: 失敗時のエラーメッセージ
+    """
+
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def hash_paths(paths: Iterable[Path], root: Path | None = None) -> str:
+    """ファイル・ディレクトリの内容ハッシュを計算する.
+
+    ディレクトリは配下の全ファイルをパス順に、相対パスと内容を連結してハッシュする。
+    存在しないパスは「存在しない」ことをハッシュに含める。
+
+    Args:
+        paths: 対象のファイル・ディレクトリ
+        root: 相対パスの基準（省略時は各パスの親ディレクトリ）
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        base = root if root is not None else path.parent
+        if not path.exists():
+            digest.update(f"missing:{path.relative_to(base)}\n".encode())
+            continue
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file_path in files:
+            if "__pycache__" in file_path.parts:
+                continue
+            with file_path.open("rb") as f:
+                file_digest = hashlib.file_digest(f, "sha256").hexdigest()
+            digest.update(f"{file_path.relative_to(base)}:{file_digest}\n".encode())
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """ステージのDAGを実行する."""
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        state_path: Path,
+        root: Path | None = None,
+        max_workers: int = 4,
+    ) -> None:
+        """初期化.
+
+        Args:
+            stages: ステージ
+            state_path: 状態ファイルのパス
+            root: ハッシュに含める相対パスの基準（プロジェクトルート）
+            max_workers: 並列に実行するステージ数の上限
+
+        Raises:
+            ValueError: ステージ名の重複・未知の依存先・循環依存がある場合
+        """
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                msg = f"ステージ名が重複しています: {stage.name}"
+                raise ValueError(msg)
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            unknown = [dep for dep in stage.deps if dep not in self.stages]
+            if unknown:
+                msg = f"ステージ {stage.name} の依存先が存在しません: {unknown}"
+                raise ValueError(msg)
+        self.order = self._topological_order()
+        self.state_path = state_path
+        self.root = root
+        self.max_workers = max_workers
+        self._state_lock = threading.Lock()
+
+    def _topological_order(self) -> list[str]:
+        """依存関係を満たす順にステージ名を並べる（循環があればValueError）."""
+        order: list[str] = []
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                msg = f"ステージが循環依存しています: {' -> '.join((*path, name))}"
+                raise ValueError(msg)
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep, (*path, name))
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    def select(self, targets: Iterable[str]) -> list[str]:
+        """指定したステージと、その依存先すべてのステージ名を実行順に返す.
+
+        Raises:
+            KeyError: 未知のステージ名が指定された場合
+        """
+        selected: set[str] = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                msg = f"未知のステージです: {name}"
+                raise KeyError(msg)
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.order if name in selected]
+
+    def run(
+        self, targets: Iterable[str] | None = None, force: Iterable[str] = ()
+    ) -> list[StageResult]:
+        """ステージを実行する.
+
+        依存先がすべて完了（実行または省略）したステージから順に、最大 max_workers 個を
+        並列に実行する。失敗したステージに依存するステージは実行しない。
+
+        Args:
+            targets: 実行するステージ名（依存先も含めて実行する。省略時は全ステージ）
+            force: 入力が変わっていなくても実行するステージ名
+
+        Returns:
+            実行順に並べたステージの実行結果
+        """
+        names = self.select(targets) if targets is not None else list(self.order)
+        forced = set(force)
+        state = self._load_state()
+        results: dict[str, StageResult] = {}
+        running: dict[Future[StageResult], str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(results) < len(names):
+                for name in names:
+                    if name in results or name in running.values():
+                        continue
+                    deps = self.stages[name].deps
+                    if any(results.get(dep, _PENDING).status in _BLOCKING for dep in deps):
+                        results[name] = StageResult(name, STATUS_BLOCKED)
+                        logger.warning(f"[{name}] 依存先が失敗したため実行しません")
+                    elif all(dep in results or dep not in names for dep in deps):
+                        future = executor.submit(self._run_stage, name, state, name in forced)
+                        running[future] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results[running.pop(future)] = future.result()
+
+        return [results[name] for name in names]
+
+    def _run_stage(self, name: str, state: dict[str, Any], force: bool) -> StageResult:
+        """ステージ1つを（必要であれば）実行する."""
+        stage = self.stages[name]
+        started = time.perf_counter()
+        input_hash = self._input_hash(stage)
+        previous = state.get(stage.state_key)
+
+        if (
+            not force
+            and previous is not None
+            and previous.get("inputs") == input_hash
+            and previous.get("outputs") == self._output_hash(stage)
+        ):
+            logger.info(f"[{name}] 入力に変更がないため省略します")
+            return StageResult(name, STATUS_SKIPPED, time.perf_counter() - started)
+
+        logger.info(f"[{name}] 実行開始")
+        try:
+            stage.run()
+        except Exception as error:
+            logger.exception(f"[{name}] 失敗しました")
+            return StageResult(name, STATUS_FAILED, time.perf_counter() - started, str(error))
+
+        seconds = time.perf_counter() - started
+        with self._state_lock:
+            state[stage.state_key] = {
+                "inputs": input_hash,
+                "outputs": self._output_hash(stage),
+                "finished_at": datetime.now(UTC).isoformat(timespec="seconds"),
+                "seconds": round(seconds, 3),
+            }
+            self._save_state(state)
+        logger.info(f"[{name}] 完了: {seconds:.2f}秒")
+        return StageResult(name, STATUS_RUN, seconds)
+
+    def _input_hash(self, stage: Stage) -> str:
+        """入力ファイルと設定値のハッシュ."""
+        digest = hashlib.sha256(hash_paths(stage.inputs, self.root).encode())
+        digest.update(json.dumps(dict(stage.params), sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _output_hash(self, stage: Stage) -> str | None:
+        """出力ファイルのハッシュ（出力のないステージはNone）."""
+        return hash_paths(stage.outputs, self.root) if stage.outputs else None
+
+    def _load_state(self) -> dict[str, Any]:
+        """状態ファイルを読み込む（存在しない・壊れている場合は空）."""
+        if not self.state_path.exists():
+            return {}
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            logger.warning(
+                f"状態ファイルを読み込めないため全ステージを実行します: {self.state_path}"
+            )
+            return {}
+
+    def _save_state(self, state: dict[str, Any]) -> None:
+        """状態ファイルを保存する（一時ファイル経由で置き換える）."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+        temp_path.replace(self.state_path)
+
+
+# 依存先がこの状態の場合は実行しない
+_BLOCKING = frozenset({STATUS_FAILED, STATUS_BLOCKED})
+
+# 未完了の依存先（results.get の既定値）
+_PENDING = StageResult("", "")
+
+
+def format_report(results: Iterable[StageResult], total_seconds: float) -> list[str]:
+    """実行結果を表形式の行に整形する."""
+    labels = {
+        STATUS_RUN: "実行",
+        STATUS_SKIPPED: "省略",
+        STATUS_FAILED: "失敗",
+        STATUS_BLOCKED: "未実行",
+    }
+    lines = [f"{'ステージ':<16} {'結果':<6} {'秒':>9}"]
+    for result in results:
+        line = f"{result.name:<16} {labels[result.status]:<6} {result.seconds:>9.2f}"
+        if result.error:
+            line += f"  {result.error}"
+        lines.append(line)
+    lines.append(f"{'合計（経過時間）':<16} {'':<6} {total_seconds:>9.2f}")
+    return lines
@@ -0,0 +1,349 @@
+"""データパイプラインのメインエントリポイント.
+
+スクレイピング → JSON → CSV（→ SQLite・タイプ相性・素早さ順表）→ Supabase投入を
+1コマンドで実行します。各ステージの入力ファイルの内容ハッシュを
+data/pipeline/state.json に記録し、前回から入力が変わっていないステージは省略します。
+
+Usage:
+    # CSV生成とローカル環境への投入（JSONに変更がなければ何もしない）
+    uv run python -m app.pipeline.main
+
+    # スクレイピングから本番環境への差分同期まで
+    uv run python -m app.pipeline.main --scrape --remote --mode sync
+
+    # 派生ファイルも生成（type_defenses・speed_tiers は要 uv sync --extra analysis）
+    uv run python -m app.pipeline.main --stages csv sqlite shards type_defenses speed_tiers import
+
+    # 入力が変わっていなくても CSV 生成からやり直す
+    uv run python -m app.pipeline.main --force csv import
+"""
+
+import argparse
+import logging
+import multiprocessing
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .dag import STATUS_BLOCKED, STATUS_FAILED, Pipeline, Stage, format_report
+
+# ロギング設定
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+JSON_DIR = PROJECT_ROOT / "data" / "pokemon"
+CSV_DIR = PROJECT_ROOT / "data" / "csv_files"
+SQLITE_PATH = PROJECT_ROOT / "data" / "pokemon.sqlite3"
+SHARD_DIR = PROJECT_ROOT / "data" / "shards"
+STATE_PATH = PROJECT_ROOT / "data" / "pipeline" / "state.json"
+IMPORT_SCRIPT = PROJECT_ROOT / "scripts" / "import_to_supabase.sh"
+
+# CSV生成ツールが出力する（import_to_supabase.sh が投入する）テーブルのCSV
+TABLE_CSVS: tuple[Path, ...] = tuple(
+    CSV_DIR / f"{table}.csv"
+    for table in ("abilities", "moves", "pokemon", "pokemon_abilities", "pokemon_moves")
+)
+# CSV生成ツールが出力する技・特性の効果タグ（import_to_supabase.sh が effect_tags へ反映する）
+EFFECT_TAGS_PATH = CSV_DIR / "effect_tags.csv"
+# CSV生成ツールが出力する learnset の正規化レイアウト（import_to_supabase.sh が投入する）
+LEARNSET_CSVS: tuple[Path, ...] = tuple(
+    CSV_DIR / f"{table}.csv" for table in ("learnsets", "learnset_moves", "pokemon_learnsets")
+)
+
+# 投入モード（import_to_supabase.sh のオプション）
+IMPORT_MODES: dict[str, list[str]] = {"full": [], "sync": ["--sync"], "bulk": ["--bulk"]}
+
+DEFAULT_STAGES: tuple[str, ...] = ("csv", "import")
+ALL_STAGES: tuple[str, ...] = (
+    "scrape",
+    "csv",
+    "sqlite",
+    "shards",
+    "type_defenses",
+    "speed_tiers",
+    "import",
+)
+
+
+def _run_module(module: str, *args: str) -> None:
+    """プロジェクトルートで python -m <module> を実行する（失敗時はCalledProcessError）."""
+    subprocess.run([sys.executable, "-m", module, *args], check=True, cwd=PROJECT_ROOT)
+
+
+def _in_process(function: Callable[[], None]) -> Callable[[], None]:
+    """関数を別プロセスで実行するステージ処理を返す.
+
+    DAG のステージはスレッドで実行されるため、CPU を使う Python の処理をそのまま実行すると
+    GIL により直列化される。モジュールレベルの関数を spawn した子プロセスで実行し、
+    他のステージと実際に並列に処理する（例外は呼び出し元へ送出される）。
+
+    Args:
+        function: 引数なしのモジュールレベルの関数
+
+    Returns:
+        子プロセスで function を実行して完了を待つ関数
+    """
+
+    def run() -> None:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            executor.submit(function).result()
+
+    return run
+
+
+def _build_sqlite() -> None:
+    """JSONからSQLiteファイルを生成する（CSV生成と並列に別プロセスで実行される）."""
+    from app.csv_generator.csv_builder import CSVBuilder
+    from app.csv_generator.json_loader import PokemonDataLoader
+    from app.csv_generator.sqlite_builder import write_sqlite_database
+
+    builder = CSVBuilder()
+    builder.collect_data(PokemonDataLoader(JSON_DIR).load_all_json_files())
+    write_sqlite_database(builder, SQLITE_PATH)
+
+
+def _build_shards() -> None:
+    """JSONから静的配信用のJSONシャードを生成する（変更のあったシャードのみ書き直す）."""
+    from app.csv_generator.csv_builder import CSVBuilder
+    from app.csv_generator.json_loader import PokemonDataLoader
+    from app.csv_generator.shards import write_shards
+
+    builder = CSVBuilder()
+    builder.collect_data(PokemonDataLoader(JSON_DIR).load_all_json_files())
+    write_shards(builder, SHARD_DIR)
+
+
+def _build_type_defenses() -> None:
+    """CSVからタイプ相性表・防御相性CSVを生成する."""
+    try:
+        from app.battle.type_chart import DefenseProfiles, generate_type_csvs
+    except ImportError as error:
+        msg = "タイプ相性CSVの生成には numpy が必要です: uv sync --extra analysis"
+        raise ImportError(msg) from error
+
+    generate_type_csvs(DefenseProfiles.from_csv_dir(CSV_DIR), CSV_DIR)
+
+
+def _build_speed_tiers() -> None:
+    """CSVから素早さ順表CSVを生成する."""
+    try:
+        from app.battle.speed_tiers import SpeedTierTable, write_speed_tiers_csv
+    except ImportError as error:
+        msg = "素早さ順表CSVの生成には numpy が必要です: uv sync --extra analysis"
+        raise ImportError(msg) from error
+
+    write_speed_tiers_csv(SpeedTierTable.from_csv_dir(CSV_DIR), CSV_DIR / "speed_tiers.csv")
+
+
+def build_stages(
+    scrape: bool = False,
+    remote: bool = False,
+    mode: str = "full",
+    sleep_seconds: float = 1.0,
+) -> list[Stage]:
+    """パイプラインのステージを組み立てる.
+
+    csv・sqlite・shards はどれもJSONだけに依存するため並列に、type_defenses・speed_tiers・
+    import はどれもテーブルのCSVだけに依存するため並列に実行される。DAG はステージを
+    スレッドで実行するため、CPU を使う処理はすべて別プロセス（csv・scrape・import は
+    サブプロセス、それ以外は _in_process）で実行し、GIL で直列化されないようにする。
+    別プロセスのためJSONの読み込みは csv・sqlite・shards がそれぞれ行う。
+    各ステージの入力には処理を行うソースコードも含めるため、コードを変更した場合も
+    再実行される。
+
+    Args:
+        scrape: Trueの場合はJSON生成の前にスクレイピング（--batch）を行う
+        remote: Trueの場合は本番環境へ投入する
+        mode: 投入モード（full / sync / bulk）
+        sleep_seconds: スクレイピング時のポケモン間待機秒数
+
+    Returns:
+        ステージのリスト
+    """
+    app_dir = PROJECT_ROOT / "app"
+    json_deps = ("scrape",) if scrape else ()
+    stages: list[Stage] = []
+
+    if scrape:
+        stages.append(
+            Stage(
+                "scrape",
+                lambda: _run_module("app.scraper.main", "--batch", "--sleep", str(sleep_seconds)),
+                inputs=(app_dir / "scraper",),
+                outputs=(JSON_DIR,),
+            )
+        )
+
+    stages += [
+        Stage(
+            "csv",
+            lambda: _run_module("app.csv_generator.main"),
+            inputs=(JSON_DIR, app_dir / "csv_generator"),
+            outputs=(*TABLE_CSVS, EFFECT_TAGS_PATH, *LEARNSET_CSVS),
+            deps=json_deps,
+        ),
+        Stage(
+            "sqlite",
+            _in_process(_build_sqlite),
+            inputs=(JSON_DIR, app_dir / "csv_generator"),
+            outputs=(SQLITE_PATH,),
+            deps=json_deps,
+        ),
+        Stage(
+            "shards",
+            _in_process(_build_shards),
+            inputs=(JSON_DIR, app_dir / "csv_generator"),
+            outputs=(SHARD_DIR,),
+            deps=json_deps,
+        ),
+        Stage(
+            "type_defenses",
+            _in_process(_build_type_defenses),
+            inputs=(*TABLE_CSVS, app_dir / "battle" / "type_chart.py"),
+            outputs=(CSV_DIR / "type_chart.csv", CSV_DIR / "pokemon_type_defenses.csv"),
+            deps=("csv",),
+        ),
+        Stage(
+            "speed_tiers",
+            _in_process(_build_speed_tiers),
+            inputs=(*TABLE_CSVS, app_dir / "battle" / "speed_tiers.py"),
+            outputs=(CSV_DIR / "speed_tiers.csv",),
+            deps=("csv",),
+        ),
+        # 投入先のデータベースはファイルとして検証できないため、出力は持たない
+        # （投入先・モードごとに別の状態を記録する）
+        Stage(
+            "import",
+            lambda: subprocess.run(
+                [str(IMPORT_SCRIPT), *(["--remote"] if remote else []), *IMPORT_MODES[mode]],
+                check=True,
+                cwd=PROJECT_ROOT,
+            ),
+            inputs=(*TABLE_CSVS, EFFECT_TAGS_PATH, *LEARNSET_CSVS, IMPORT_SCRIPT),
+            deps=("csv",),
+            params={"target": "remote" if remote else "local", "mode": mode},
+        ),
+    ]
+    return stages
+
+
+def main(
+    stages: list[str] | None = None,
+    scrape: bool = False,
+    remote: bool = False,
+    mode: str = "full",
+    force: list[str] | None = None,
+    sleep_seconds: float = 1.0,
+    max_workers: int = 4,
+    state_path: Path = STATE_PATH,
+) -> int:
+    """メイン処理.
+
+    Args:
+        stages: 実行するステージ名（依存先のステージも実行する。省略時は csv と import）
+        scrape: Trueの場合はスクレイピングから実行する
+        remote: Trueの場合は本番環境へ投入する
+        mode: 投入モード（full / sync / bulk）
+        force: 入力が変わっていなくても実行するステージ名（"all" で全ステージ）
+        sleep_seconds: スクレイピング時のポケモン間待機秒数
+        max_workers: 並列に実行するステージ数の上限
+        state_path: 状態ファイルのパス
+
+    Returns:
+        終了コード（失敗したステージがあれば1）
+    """
+    logger.info("=" * 60)
+    logger.info("ポケモンデータベース パイプライン")
+    logger.info("=" * 60)
+
+    targets = list(stages or DEFAULT_STAGES)
+    scrape = scrape or "scrape" in targets
+    if scrape and "scrape" not in targets:
+        targets.append("scrape")
+    pipeline = Pipeline(
+        build_stages(scrape=scrape, remote=remote, mode=mode, sleep_seconds=sleep_seconds),
+        state_path=state_path,
+        root=PROJECT_ROOT,
+        max_workers=max_workers,
+    )
+    forced = list(pipeline.stages) if force and "all" in force else list(force or [])
+    # スクレイピングの本当の入力は外部サイトで、入力ハッシュでは変更を検知できないため、
+    # 指定された場合は常に実行する（JSONが変わらなければ後続のステージは省略される）
+    if scrape and "scrape" not in forced:
+        forced.append("scrape")
+
+    logger.info(f"実行対象: {', '.join(pipeline.select(targets))}")
+    started = time.perf_counter()
+    results = pipeline.run(targets, force=forced)
+    total_seconds = time.perf_counter() - started
+
+    logger.info("")
+    for line in format_report(results, total_seconds):
+        logger.info(line)
+
+    failed = [r.name for r in results if r.status in (STATUS_FAILED, STATUS_BLOCKED)]
+    logger.info("\n" + "=" * 60)
+    logger.info(f"失敗: {', '.join(failed)}" if failed else "処理完了")
+    logger.info("=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="スクレイピング・CSV生成・Supabase投入を、変更のあったステージだけ実行する.",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=ALL_STAGES,
+        default=None,
+        help="実行するステージ (依存先も実行。既定: csv import)。",
+    )
+    parser.add_argument(
+        "--scrape",
+        action="store_true",
+        help="pokemon_urls.json の一覧のスクレイピング (--batch) から実行します。",
+    )
+    parser.add_argument("--remote", action="store_true", help="本番環境へ投入します。")
+    parser.add_argument(
+        "--mode",
+        choices=sorted(IMPORT_MODES),
+        default="full",
+        help="投入モード (full: 全件投入, sync: 差分同期, bulk: 一括投入。既定: full)。",
+    )
+    parser.add_argument(
+        "--force",
+        nargs="+",
+        choices=(*ALL_STAGES, "all"),
+        default=None,
+        metavar="STAGE",
+        help="入力に変更がなくても実行するステージ (all で全ステージ)。",
+    )
+    parser.add_argument(
+        "--sleep", type=float, default=1.0, help="スクレイピング時の待機秒数 (既定: 1.0)。"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=4, help="並列に実行するステージ数の上限 (既定: 4)。"
+    )
+
+    parsed = parser.parse_args()
+    sys.exit(
+        main(
+            stages=parsed.stages,
+            scrape=parsed.scrape,
+            remote=parsed.remote,
+            mode=parsed.mode,
+            force=parsed.force,
+            sleep_seconds=max(parsed.sleep, 0.0),
+            max_workers=max(parsed.jobs, 1),
+        )
+    )
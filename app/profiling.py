@@ -0,0 +1,315 @@
+"""処理段階ごとのプロファイリング.
+
+CSV生成ツール・スクレイピングツールの --profile で使います（ベンチマークなど他のパッケージに
+依存しないため、本番用のツールからも読み込めます）。処理を段階（stage）ごとの
+区間で囲み、区間の経過時間と cProfile の関数別統計を段階ごとに集計して、次のファイルを
+出力します。
+
+- <段階名>.pstats: cProfile の統計（python -m pstats や snakeviz で閲覧）
+- trace.json: Chrome Trace Event 形式のトレース（chrome://tracing・Perfetto・speedscope で閲覧）
+
+Example:
+    profiler = StageProfiler()
+    with profiler.stage("load_json"):
+        data = loader.load_all_json_files()
+    profiler.export(Path("data/profile/csv_generator"))
+"""
+
+import cProfile
+import json
+import pstats
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PROFILE_DIR = PROJECT_ROOT / "data" / "profile"
+
+# cProfile の関数キー (ファイル名, 行番号, 関数名)
+FunctionKey = tuple[str, int, str]
+
+# トレースのプロセスID（実際の時系列 / 段階ごとの関数の集計）
+_TIMELINE_PID = 1
+_FLAME_PID = 2
+
+# 関数の集計に含める最小の幅（段階の経過時間に対する割合）と深さ
+_MIN_FLAME_RATIO = 0.002
+_MAX_FLAME_DEPTH = 40
+
+
+@dataclass(slots=True)
+class StageStats:
+    """段階ごとの集計.
+
+    Attributes:
+        name: 段階名
+        calls: 区間に入った回数
+        seconds: 経過時間の合計（秒）
+        profile: cProfile の統計（入れ子の区間では None）
+    """
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    profile: cProfile.Profile | None = None
+
+
+@dataclass(slots=True)
+class _Span:
+    """トレースに出力する1区間."""
+
+    name: str
+    start_us: float
+    duration_us: float
+
+
+@dataclass(slots=True)
+class StageProfiler:
+    """段階ごとの経過時間と cProfile の統計を集める.
+
+    同じ名前の段階に複数回入った場合（スクレイピングのポケモンごとの取得など）は、
+    経過時間と関数別統計を合算する。cProfile は同時に1つしか有効にできないため、
+    関数別統計は一番外側の段階でのみ取得し、入れ子の段階は経過時間のみ記録する。
+
+    Attributes:
+        enabled: False の場合は stage() が何もしない（計測なしの通常実行用）
+        stages: 段階名 -> 集計（最初に入った順）
+    """
+
+    enabled: bool = True
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    _spans: list[_Span] = field(default_factory=list, init=False, repr=False)
+    _depth: int = field(default=0, init=False, repr=False)
+    _origin: float = field(default_factory=time.perf_counter, init=False, repr=False)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """段階を計測する.
+
+        Args:
+            name: 段階名（出力ファイル名にも使う）
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        profile = None
+        if self._depth == 0:
+            profile = stats.profile = stats.profile or cProfile.Profile()
+
+        self._depth += 1
+        started = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            seconds = time.perf_counter() - started
+            self._depth -= 1
+            stats.calls += 1
+            stats.seconds += seconds
+            self._spans.append(_Span(name, (started - self._origin) * 1e6, seconds * 1e6))
+
+    def summary_lines(self, top: int = 10) -> list[str]:
+        """段階ごとの経過時間と、自己時間の長い関数を表形式の行で返す.
+
+        Args:
+            top: 段階ごとに表示する関数の数
+
+        Returns:
+            表示用の行
+        """
+        lines = [f"{'段階':<20} {'回数':>6} {'秒':>9}"]
+        for stats in self.stages.values():
+            lines.append(f"{stats.name:<20} {stats.calls:>6,} {stats.seconds:>9.3f}")
+        for stats in self.stages.values():
+            if stats.profile is None:
+                continue
+            lines.append("")
+            lines.append(f"[{stats.name}] 自己時間の上位{top}関数")
+            lines.append(f"  {'自己秒':>9} {'累積秒':>9} {'呼出回数':>10}  関数")
+            entries = pstats.Stats(stats.profile).stats
+            ranked = sorted(
+                ((function, entry) for function, entry in entries.items() if not _is_own(function)),
+                key=lambda item: item[1][2],
+                reverse=True,
+            )
+            for function, (_, calls, self_time, total_time, _) in ranked[:top]:
+                lines.append(
+                    f"  {self_time:>9.3f} {total_time:>9.3f} {calls:>10,}  {_label(function)}"
+                )
+        return lines
+
+    def export(self, output_dir: Path) -> dict[str, Path]:
+        """段階ごとの pstats ファイルとトレースファイルを出力する.
+
+        Args:
+            output_dir: 出力ディレクトリ
+
+        Returns:
+            出力したファイルのパス辞書（段階名 または "trace" -> パス）
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        files: dict[str, Path] = {}
+        for stats in self.stages.values():
+            if stats.profile is not None:
+                path = output_dir / f"{_safe_file_name(stats.name)}.pstats"
+                stats.profile.dump_stats(path)
+                files[stats.name] = path
+
+        trace_path = output_dir / "trace.json"
+        trace_path.write_text(
+            json.dumps({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}),
+            encoding="utf-8",
+        )
+        files["trace"] = trace_path
+        return files
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """Chrome Trace Event 形式のイベントを作る.
+
+        プロセス1には段階の区間を実際の時系列で、プロセス2には段階ごとに合算した
+        関数の呼び出し階層（cProfile の呼び出し元・呼び出し先ごとの累積時間から推定した
+        フレームグラフ）を、段階を順に並べて出力する。
+
+        Returns:
+            traceEvents の要素
+        """
+        events: list[dict[str, Any]] = [
+            _metadata(_TIMELINE_PID, "段階（時系列）"),
+            _metadata(_FLAME_PID, "関数（段階ごとに合算・推定）"),
+        ]
+        for span in self._spans:
+            events.append(
+                _complete_event(span.name, "stage", span.start_us, span.duration_us, _TIMELINE_PID)
+            )
+
+        offset_us = 0.0
+        for stats in self.stages.values():
+            if stats.profile is None:
+                continue
+            total_us = stats.seconds * 1e6
+            events.append(_complete_event(stats.name, "stage", offset_us, total_us, _FLAME_PID))
+            events.extend(_flame_events(pstats.Stats(stats.profile).stats, offset_us, total_us))
+            offset_us += total_us
+        return events
+
+
+def default_output_dir(tool: str) -> Path:
+    """プロファイル結果の既定の出力先（data/profile/<ツール名>_<日時>/）."""
+    return PROFILE_DIR / f"{tool}_{datetime.now():%Y%m%d_%H%M%S}"
+
+
+def _flame_events(
+    entries: dict[FunctionKey, tuple[Any, ...]], start_us: float, total_us: float
+) -> list[dict[str, Any]]:
+    """cProfile の統計から、段階1つ分のフレームグラフのイベントを作る.
+
+    cProfile は呼び出し元・呼び出し先の組ごとの累積時間しか持たないため、各関数の時間を
+    呼び出し先の累積時間の比で子に配分する（同じ関数が複数の経路から呼ばれる場合は近似）。
+    段階の経過時間に対して小さすぎる関数と、再帰呼び出しは省略する。
+    """
+    callees: dict[FunctionKey, list[tuple[FunctionKey, float]]] = defaultdict(list)
+    roots: list[tuple[FunctionKey, float]] = []
+    for function, (_, _, _, total_time, callers) in entries.items():
+        if _is_own(function):
+            continue
+        if not any(caller in entries for caller in callers):
+            roots.append((function, total_time * 1e6))
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3] * 1e6))
+    for children in callees.values():
+        children.sort(key=lambda child: child[1], reverse=True)
+    roots.sort(key=lambda root: root[1], reverse=True)
+
+    events: list[dict[str, Any]] = []
+    min_us = total_us * _MIN_FLAME_RATIO
+
+    def place(
+        children: list[tuple[FunctionKey, float]],
+        start: float,
+        budget: float,
+        path: frozenset[FunctionKey],
+    ) -> None:
+        if len(path) >= _MAX_FLAME_DEPTH:
+            return
+        requested = sum(duration for _, duration in children)
+        scale = min(1.0, budget / requested) if requested > 0 else 1.0
+        cursor = start
+        for function, duration in children:
+            width = duration * scale
+            if width < min_us or function in path:
+                continue
+            events.append(
+                _complete_event(
+                    _label(function),
+                    "function",
+                    cursor,
+                    width,
+                    _FLAME_PID,
+                    {"file": function[0], "line": function[1]},
+                )
+            )
+            place(callees.get(function, []), cursor, width, path | {function})
+            cursor += width
+
+    place(roots, start_us, total_us, frozenset())
+    return events
+
+
+def _complete_event(
+    name: str,
+    category: str,
+    start_us: float,
+    duration_us: float,
+    pid: int,
+    args: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Chrome Trace Event 形式の完了イベント（ph: X）."""
+    event: dict[str, Any] = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": round(start_us, 3),
+        "dur": round(duration_us, 3),
+        "pid": pid,
+        "tid": 1,
+    }
+    if args:
+        event["args"] = args
+    return event
+
+
+def _metadata(pid: int, name: str) -> dict[str, Any]:
+    """プロセス名のメタデータイベント."""
+    return {"name": "process_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": name}}
+
+
+def _is_own(function: FunctionKey) -> bool:
+    """計測処理自体（stage() の出入り・cProfile の停止）の関数か."""
+    return (
+        function[0] == __file__ or function[2] == "<method 'disable' of '_lsprof.Profiler' objects>"
+    )
+
+
+def _label(function: FunctionKey) -> str:
+    """関数キーの表示名（組み込み関数は名前のみ）."""
+    file_name, line, name = function
+    if file_name == "~":
+        return name
+    return f"{name} ({Path(file_name).name}:{line})"
+
+
+def _safe_file_name(name: str) -> str:
+    """段階名をファイル名に使える文字列にする."""
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in name)
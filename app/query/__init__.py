@@ -0,0 +1,4 @@
+"""Query module for generated Pokemon data.
+
+生成済みデータをDBを介さずにプロセス内で検索するためのモジュール群。
+"""
@@ -0,0 +1,381 @@
+"""列指向のインメモリ検索エンジン.
+
+5テーブルをNumPy配列に展開し、種族値・タイプ・技・特性による絞り込みをベクトル演算で
+行います。各フィルタはポケモン数と同じ長さの真偽値配列（マスク）を返すため、
+`&` (AND)・`|` (OR)・`~` (NOT) で自由に組み合わせられます。
+
+Example:
+    engine = PokemonQueryEngine.from_csv_dir(Path("data/csv_files"))
+    mask = engine.learns("ねこだまし") & engine.stat("base_spe", min_value=102)
+    engine.names(mask)
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+
+from .tables import Tables, load_tables_from_builder, load_tables_from_csv
+
+# タイプ名（ビット位置の順。supabase/migrations のCHECK制約と同じ並び）
+TYPE_NAMES: tuple[str, ...] = (
+    "ノーマル",
+    "ほのお",
+    "みず",
+    "でんき",
+    "くさ",
+    "こおり",
+    "かくとう",
+    "どく",
+    "じめん",
+    "ひこう",
+    "エスパー",
+    "むし",
+    "いわ",
+    "ゴースト",
+    "ドラゴン",
+    "あく",
+    "はがね",
+    "フェアリー",
+)
+TYPE_BITS: dict[str, int] = {type_name: 1 << i for i, type_name in enumerate(TYPE_NAMES)}
+
+# 絞り込み可能な数値カラム（base_total は6種族値の合計）
+STAT_COLUMNS: tuple[str, ...] = (
+    "base_hp",
+    "base_atk",
+    "base_def",
+    "base_spa",
+    "base_spd",
+    "base_spe",
+)
+NUMERIC_COLUMNS: tuple[str, ...] = (
+    "pokedex_no",
+    *STAT_COLUMNS,
+    "base_total",
+    "height_dm",
+    "weight_hg",
+)
+
+_MATCH_MODES = ("any", "all")
+
+
+class PokemonQueryEngine:
+    """ポケモン検索エンジン.
+
+    ポケモン1件を配列の1要素（行インデックス）として扱う。技・特性の逆引きは
+    技ID/特性IDでソートした行インデックス配列（CSR形式）で保持する。
+    """
+
+    def __init__(self, tables: Tables) -> None:
+        """初期化.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（カラム順は TABLE_COLUMNS に従う）
+        """
+        pokemon_rows = tables["pokemon"]
+        column_index = {column: i for i, column in enumerate(TABLE_COLUMNS["pokemon"])}
+
+        def column(name: str) -> list[Any]:
+            i = column_index[name]
+            return [row[i] for row in pokemon_rows]
+
+        self.size = len(pokemon_rows)
+        self.records: list[dict[str, Any]] = [
+            dict(zip(TABLE_COLUMNS["pokemon"], row, strict=True)) for row in pokemon_rows
+        ]
+        self.ids = np.array(column("id"), dtype=np.int32)
+        self.name_list: list[str] = column("name_ja")
+
+        self.columns: dict[str, np.ndarray] = {
+            name: np.array(column(name), dtype=np.int16) for name in STAT_COLUMNS
+        }
+        self.columns["pokedex_no"] = np.array(column("pokedex_no"), dtype=np.int32)
+        self.columns["base_total"] = sum(
+            (self.columns[name].astype(np.int32) for name in STAT_COLUMNS),
+            start=np.zeros(self.size, dtype=np.int32),
+        )
+        # 高さ・重さはNULLを許容するため、NULLは-1として保持し、NULLでない行のマスクを別に持つ
+        # （範囲指定の絞り込みではSQLと同様にNULLの行を除外する）
+        self.not_null: dict[str, np.ndarray] = {}
+        for name in ("height_dm", "weight_hg"):
+            values = column(name)
+            self.columns[name] = np.array(
+                [-1 if value is None else value for value in values], dtype=np.int32
+            )
+            self.not_null[name] = np.array([value is not None for value in values], dtype=bool)
+
+        self.type_mask = np.array(
+            [
+                _type_bits(primary, secondary)
+                for primary, secondary in zip(
+                    column("type_primary"), column("type_secondary"), strict=True
+                )
+            ],
+            dtype=np.uint32,
+        )
+        self.is_legendary = np.array(column("is_legendary"), dtype=bool)
+        self.is_mythical = np.array(column("is_mythical"), dtype=bool)
+
+        # ポケモンID -> 行インデックス
+        max_id = int(self.ids.max()) if self.size else 0
+        self._id_to_index = np.full(max_id + 1, -1, dtype=np.int32)
+        self._id_to_index[self.ids] = np.arange(self.size, dtype=np.int32)
+
+        self.move_name_to_id: dict[str, int] = {row[1]: row[0] for row in tables["moves"]}
+        self.ability_name_to_id: dict[str, int] = {row[1]: row[0] for row in tables["abilities"]}
+
+        pokemon_moves = np.array(tables["pokemon_moves"], dtype=np.int32).reshape(-1, 2)
+        self._move_keys, self._move_learners = self._build_reverse_index(
+            pokemon_moves[:, 1], pokemon_moves[:, 0]
+        )
+
+        pokemon_abilities = tables["pokemon_abilities"]
+        ability_pairs = np.array(
+            [(pokemon_id, ability_id) for pokemon_id, ability_id, _ in pokemon_abilities],
+            dtype=np.int32,
+        ).reshape(-1, 2)
+        hidden_flags = np.array([row[2] for row in pokemon_abilities], dtype=bool)
+        order = np.argsort(ability_pairs[:, 1], kind="stable")
+        self._ability_keys = ability_pairs[order, 1]
+        self._ability_holders = self._id_to_index[ability_pairs[order, 0]]
+        self._ability_hidden = hidden_flags[order]
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path) -> "PokemonQueryEngine":
+        """CSV生成ツールの出力ディレクトリから構築する.
+
+        Args:
+            csv_dir: CSVファイルが格納されているディレクトリ
+
+        Returns:
+            PokemonQueryEngine
+        """
+        return cls(load_tables_from_csv(csv_dir))
+
+    @classmethod
+    def from_builder(cls, builder: CSVBuilder) -> "PokemonQueryEngine":
+        """collect_data() 済みのCSVBuilderから構築する.
+
+        Args:
+            builder: collect_data() 済みのCSVBuilder
+
+        Returns:
+            PokemonQueryEngine
+        """
+        return cls(load_tables_from_builder(builder))
+
+    # ========================================
+    # フィルタ（真偽値マスクを返す）
+    # ========================================
+
+    def everything(self) -> np.ndarray:
+        """全ポケモンを選択するマスクを返す."""
+        return np.ones(self.size, dtype=bool)
+
+    def stat(
+        self,
+        column: str,
+        min_value: int | None = None,
+        max_value: int | None = None,
+    ) -> np.ndarray:
+        """数値カラムの範囲で絞り込む（両端を含む）.
+
+        NULLを許容するカラム（高さ・重さ）で範囲を指定した場合、NULLの行は含めない。
+
+        Args:
+            column: NUMERIC_COLUMNS のいずれか（例: "base_spe", "base_total"）
+            min_value: 下限値
+            max_value: 上限値
+
+        Returns:
+            条件を満たすポケモンのマスク
+
+        Raises:
+            KeyError: 未知のカラムが指定された場合
+        """
+        if column not in self.columns:
+            msg = f"絞り込みできないカラムです: {column} (対応カラム: {', '.join(NUMERIC_COLUMNS)})"
+            raise KeyError(msg)
+
+        values = self.columns[column]
+        mask = self.everything()
+        if min_value is not None:
+            mask &= values >= min_value
+        if max_value is not None:
+            mask &= values <= max_value
+        if column in self.not_null and (min_value is not None or max_value is not None):
+            mask &= self.not_null[column]
+        return mask
+
+    def has_type(self, *type_names: str, match: str = "any") -> np.ndarray:
+        """タイプで絞り込む.
+
+        Args:
+            *type_names: タイプ名
+            match: "any" はいずれかのタイプを持つ、"all" は全てのタイプを持つ
+
+        Returns:
+            条件を満たすポケモンのマスク
+
+        Raises:
+            KeyError: 未知のタイプ名が指定された場合
+        """
+        _check_match_mode(match)
+        bits = 0
+        for type_name in type_names:
+            if type_name not in TYPE_BITS:
+                msg = f"未知のタイプです: {type_name}"
+                raise KeyError(msg)
+            bits |= TYPE_BITS[type_name]
+
+        if match == "all":
+            return (self.type_mask & bits) == bits
+        return (self.type_mask & bits) != 0
+
+    def learns(self, *move_names: str, match: str = "any") -> np.ndarray:
+        """覚える技で絞り込む.
+
+        Args:
+            *move_names: 技名
+            match: "any" はいずれかの技を覚える、"all" は全ての技を覚える
+
+        Returns:
+            条件を満たすポケモンのマスク
+
+        Raises:
+            KeyError: 未知の技名が指定された場合
+        """
+        _check_match_mode(match)
+        move_ids = [_lookup(self.move_name_to_id, name, "技") for name in move_names]
+        return self._combine(
+            (self._slice(self._move_keys, self._move_learners, move_id) for move_id in move_ids),
+            match,
+        )
+
+    def has_ability(
+        self,
+        *ability_names: str,
+        hidden: bool | None = None,
+        match: str = "any",
+    ) -> np.ndarray:
+        """特性で絞り込む.
+
+        Args:
+            *ability_names: 特性名
+            hidden: Trueなら夢特性のみ、Falseなら通常特性のみ、Noneなら区別しない
+            match: "any" はいずれかの特性を持つ、"all" は全ての特性を持つ
+
+        Returns:
+            条件を満たすポケモンのマスク
+
+        Raises:
+            KeyError: 未知の特性名が指定された場合
+        """
+        _check_match_mode(match)
+        ability_ids = [_lookup(self.ability_name_to_id, name, "特性") for name in ability_names]
+
+        def holders(ability_id: int) -> np.ndarray:
+            start, end = _key_range(self._ability_keys, ability_id)
+            indexes = self._ability_holders[start:end]
+            if hidden is not None:
+                indexes = indexes[self._ability_hidden[start:end] == hidden]
+            return indexes
+
+        return self._combine((holders(ability_id) for ability_id in ability_ids), match)
+
+    def legendary(self) -> np.ndarray:
+        """伝説のポケモンのマスクを返す."""
+        return self.is_legendary.copy()
+
+    def mythical(self) -> np.ndarray:
+        """幻のポケモンのマスクを返す."""
+        return self.is_mythical.copy()
+
+    # ========================================
+    # 結果の取り出し
+    # ========================================
+
+    def indexes(self, mask: np.ndarray) -> np.ndarray:
+        """マスクに該当する行インデックスを返す."""
+        return np.flatnonzero(mask)
+
+    def count(self, mask: np.ndarray) -> int:
+        """マスクに該当する件数を返す."""
+        return int(np.count_nonzero(mask))
+
+    def pokemon_ids(self, mask: np.ndarray) -> list[int]:
+        """マスクに該当するポケモンIDを返す."""
+        return self.ids[mask].tolist()
+
+    def names(self, mask: np.ndarray) -> list[str]:
+        """マスクに該当するポケモン名を返す."""
+        return [self.name_list[i] for i in np.flatnonzero(mask)]
+
+    def rows(self, mask: np.ndarray) -> list[dict[str, Any]]:
+        """マスクに該当するポケモンの全カラムを辞書で返す."""
+        return [self.records[i] for i in np.flatnonzero(mask)]
+
+    # ========================================
+    # 内部処理
+    # ========================================
+
+    def _build_reverse_index(
+        self, keys: np.ndarray, pokemon_ids: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """キー（技IDなど）でソートした (キー配列, 行インデックス配列) を構築する."""
+        order = np.argsort(keys, kind="stable")
+        return keys[order], self._id_to_index[pokemon_ids[order]]
+
+    def _slice(self, keys: np.ndarray, values: np.ndarray, key: int) -> np.ndarray:
+        """逆引きインデックスからキーに対応する行インデックスを取り出す."""
+        start, end = _key_range(keys, key)
+        return values[start:end]
+
+    def _combine(self, index_groups: Iterable[np.ndarray], match: str) -> np.ndarray:
+        """行インデックスの集合をAND/ORで結合してマスクにする."""
+        if match == "all":
+            mask = self.everything()
+            for indexes in index_groups:
+                group_mask = np.zeros(self.size, dtype=bool)
+                group_mask[indexes] = True
+                mask &= group_mask
+            return mask
+
+        mask = np.zeros(self.size, dtype=bool)
+        for indexes in index_groups:
+            mask[indexes] = True
+        return mask
+
+
+def _type_bits(type_primary: str, type_secondary: str | None) -> int:
+    """タイプ1・タイプ2をビットマスクに変換する."""
+    bits = TYPE_BITS[type_primary]
+    if type_secondary is not None:
+        bits |= TYPE_BITS[type_secondary]
+    return bits
+
+
+def _key_range(keys: np.ndarray, key: int) -> tuple[int, int]:
+    """ソート済みキー配列におけるキーの範囲 [start, end) を返す."""
+    start = int(np.searchsorted(keys, key, side="left"))
+    end = int(np.searchsorted(keys, key, side="right"))
+    return start, end
+
+
+def _lookup(name_to_id: dict[str, int], name: str, label: str) -> int:
+    """名前からIDを引く. 未知の名前の場合はKeyErrorを送出する."""
+    if name not in name_to_id:
+        msg = f"未知の{label}です: {name}"
+        raise KeyError(msg)
+    return name_to_id[name]
+
+
+def _check_match_mode(match: str) -> None:
+    """match引数の値を検証する."""
+    if match not in _MATCH_MODES:
+        msg = f"match には {' / '.join(_MATCH_MODES)} を指定してください: {match}"
+        raise ValueError(msg)
@@ -0,0 +1,248 @@
+"""ビットマップによる習得技インデックス.
+
+技ごとに「その技を覚えるポケモンID」の集合を整数ビットマップ（ビット位置 = ポケモンID）で
+保持します。複数の技を条件にした検索は、技の数だけの多重JOINではなくビット演算
+（AND/OR/NOT）とポップカウントで求まります。
+
+Example:
+    index = LearnsetIndex.from_builder(builder)
+    bitmap = index.all_of("トリックルーム", "まもる", "ねこだまし")
+    index.count(bitmap), index.names(bitmap)
+"""
+
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+
+from .tables import Tables, load_tables_from_csv
+
+
+class LearnsetIndex:
+    """習得技のビットマップインデックス.
+
+    Python の int は任意長のため、ポケモン数に上限なくビットマップとして扱える。
+    ポケモン1000件でも1技あたり約128バイトで、AND/ORは数十ワードの演算で済む。
+    """
+
+    def __init__(
+        self,
+        pokemon_ids: Mapping[str, int],
+        move_ids: Mapping[str, int],
+        pairs: Iterable[tuple[int, int]],
+        with_pokemon_bitmaps: bool = False,
+    ) -> None:
+        """初期化.
+
+        Args:
+            pokemon_ids: ポケモン名 -> ポケモンID
+            move_ids: 技名 -> 技ID
+            pairs: (ポケモンID, 技ID) の組
+            with_pokemon_bitmaps: ポケモンごとの習得技ビットマップ（ビット位置 = 技ID）も構築するか
+        """
+        self.pokemon_name_to_id: dict[str, int] = dict(pokemon_ids)
+        self.move_name_to_id: dict[str, int] = dict(move_ids)
+        self._pokemon_names: dict[int, str] = {
+            pokemon_id: name for name, pokemon_id in self.pokemon_name_to_id.items()
+        }
+        self._move_names: dict[int, str] = {
+            move_id: name for name, move_id in self.move_name_to_id.items()
+        }
+
+        # 全ポケモンの集合（NOTの基準）
+        self.universe = _to_bitmap(self.pokemon_name_to_id.values())
+
+        # 技ID -> 習得ポケモンのビットマップ
+        # ビットの追加は1ビットずつ行うと毎回int全体を作り直すため、ID集合を集めてから一度に作る
+        learners: dict[int, list[int]] = {move_id: [] for move_id in self.move_name_to_id.values()}
+        known_moves: dict[int, list[int]] | None = (
+            {pokemon_id: [] for pokemon_id in self.pokemon_name_to_id.values()}
+            if with_pokemon_bitmaps
+            else None
+        )
+        for pokemon_id, move_id in pairs:
+            learners[move_id].append(pokemon_id)
+            if known_moves is not None:
+                known_moves[pokemon_id].append(move_id)
+
+        self._move_bitmaps: dict[int, int] = {
+            move_id: _to_bitmap(pokemon_ids_) for move_id, pokemon_ids_ in learners.items()
+        }
+        self._pokemon_bitmaps: dict[int, int] | None = (
+            {pokemon_id: _to_bitmap(move_ids_) for pokemon_id, move_ids_ in known_moves.items()}
+            if known_moves is not None
+            else None
+        )
+
+    @classmethod
+    def from_builder(
+        cls, builder: CSVBuilder, with_pokemon_bitmaps: bool = False
+    ) -> "LearnsetIndex":
+        """collect_data() 済みのCSVBuilderから構築する.
+
+        CSVBuilder のポケモン-技関連（内部番号の配列）を iter_rows() で直接走査し、
+        IDはCSVと同じものを使う。
+
+        Args:
+            builder: collect_data() 済みのCSVBuilder
+            with_pokemon_bitmaps: ポケモンごとの習得技ビットマップも構築するか
+
+        Returns:
+            LearnsetIndex
+        """
+        builder.ensure_id_mappings()
+        return cls(
+            builder.pokemon_name_to_id,
+            builder.move_name_to_id,
+            builder.iter_rows("pokemon_moves"),
+            with_pokemon_bitmaps=with_pokemon_bitmaps,
+        )
+
+    @classmethod
+    def from_tables(cls, tables: Tables, with_pokemon_bitmaps: bool = False) -> "LearnsetIndex":
+        """テーブルの行から構築する.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（tables.py の形式）
+            with_pokemon_bitmaps: ポケモンごとの習得技ビットマップも構築するか
+
+        Returns:
+            LearnsetIndex
+        """
+        pokemon_name = TABLE_COLUMNS["pokemon"].index("name_ja")
+        move_name = TABLE_COLUMNS["moves"].index("name_ja")
+        return cls(
+            {row[pokemon_name]: row[0] for row in tables["pokemon"]},
+            {row[move_name]: row[0] for row in tables["moves"]},
+            tables["pokemon_moves"],
+            with_pokemon_bitmaps=with_pokemon_bitmaps,
+        )
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path, with_pokemon_bitmaps: bool = False) -> "LearnsetIndex":
+        """CSV生成ツールの出力ディレクトリから構築する.
+
+        Args:
+            csv_dir: CSVファイルが格納されているディレクトリ
+            with_pokemon_bitmaps: ポケモンごとの習得技ビットマップも構築するか
+
+        Returns:
+            LearnsetIndex
+        """
+        return cls.from_tables(load_tables_from_csv(csv_dir), with_pokemon_bitmaps)
+
+    # ========================================
+    # 集合演算（ポケモンIDのビットマップを返す）
+    # ========================================
+
+    def learners(self, move_name: str) -> int:
+        """技を覚えるポケモンのビットマップを返す.
+
+        Raises:
+            KeyError: 未知の技名が指定された場合
+        """
+        return self._move_bitmaps[_lookup(self.move_name_to_id, move_name, "技")]
+
+    def all_of(self, *move_names: str) -> int:
+        """指定した技を全て覚えるポケモンのビットマップを返す（AND）.
+
+        習得ポケモンの少ない技から順に積を取り、空集合になった時点で打ち切る。
+        技を指定しない場合は全ポケモンを返す。
+        """
+        bitmaps = sorted((self.learners(name) for name in move_names), key=int.bit_count)
+        result = self.universe
+        for bitmap in bitmaps:
+            result &= bitmap
+            if not result:
+                break
+        return result
+
+    def any_of(self, *move_names: str) -> int:
+        """指定した技のいずれかを覚えるポケモンのビットマップを返す（OR）."""
+        result = 0
+        for name in move_names:
+            result |= self.learners(name)
+        return result
+
+    def none_of(self, *move_names: str) -> int:
+        """指定した技をいずれも覚えないポケモンのビットマップを返す（NOT OR）."""
+        return self.complement(self.any_of(*move_names))
+
+    def complement(self, bitmap: int) -> int:
+        """ビットマップの補集合（全ポケモンに対するNOT）を返す."""
+        return self.universe & ~bitmap
+
+    def from_pokemon_ids(self, pokemon_ids: Iterable[int]) -> int:
+        """ポケモンIDの集合をビットマップに変換する（他の検索結果との組み合わせ用）."""
+        return _to_bitmap(pokemon_ids) & self.universe
+
+    # ========================================
+    # ポケモンごとの習得技
+    # ========================================
+
+    def learnset(self, pokemon_name: str) -> int:
+        """ポケモンが覚える技のビットマップ（ビット位置 = 技ID）を返す.
+
+        Raises:
+            KeyError: 未知のポケモン名が指定された場合
+            ValueError: with_pokemon_bitmaps=False で構築した場合
+        """
+        if self._pokemon_bitmaps is None:
+            msg = "ポケモンごとの習得技は with_pokemon_bitmaps=True で構築した場合のみ利用できます"
+            raise ValueError(msg)
+        return self._pokemon_bitmaps[_lookup(self.pokemon_name_to_id, pokemon_name, "ポケモン")]
+
+    def common_moves(self, *pokemon_names: str) -> list[str]:
+        """指定したポケモンが共通して覚える技名を返す."""
+        result = -1
+        for name in pokemon_names:
+            result &= self.learnset(name)
+        if result == -1:
+            return []
+        return self.move_names(result)
+
+    # ========================================
+    # 結果の取り出し
+    # ========================================
+
+    def count(self, bitmap: int) -> int:
+        """ビットマップに含まれる件数を返す."""
+        return bitmap.bit_count()
+
+    def pokemon_ids(self, bitmap: int) -> list[int]:
+        """ビットマップに含まれるポケモンIDを昇順で返す."""
+        return list(_iter_bits(bitmap))
+
+    def names(self, bitmap: int) -> list[str]:
+        """ビットマップに含まれるポケモン名をID順で返す."""
+        return [self._pokemon_names[pokemon_id] for pokemon_id in _iter_bits(bitmap)]
+
+    def move_names(self, bitmap: int) -> list[str]:
+        """技IDのビットマップ（learnset() の戻り値）を技名に変換する."""
+        return [self._move_names[move_id] for move_id in _iter_bits(bitmap)]
+
+
+def _to_bitmap(ids: Iterable[int]) -> int:
+    """IDの集合をビットマップに変換する."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    # 最大IDまでのビット列を bytearray で作ってから一度に int 化する
+    buffer = bytearray((max(ids) >> 3) + 1)
+    for i in ids:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _iter_bits(bitmap: int) -> Iterable[int]:
+    """ビットマップの立っているビット位置を昇順で返す."""
+    bits = bin(bitmap)[:1:-1]
+    return (i for i, bit in enumerate(bits) if bit == "1")
+
+
+def _lookup(name_to_id: dict[str, int], name: str, label: str) -> int:
+    """名前からIDを引く. 未知の名前の場合はKeyErrorを送出する."""
+    if name not in name_to_id:
+        msg = f"未知の{label}です: {name}"
+        raise KeyError(msg)
+    return name_to_id[name]
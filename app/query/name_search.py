@@ -0,0 +1,313 @@
+"""名前のあいまい検索インデックス.
+
+ポケモン名（日本語・英語）・技名・特性名を、ひらがな/カタカナ・全角/半角の違いを
+吸収した正規化キーのバイグラム転置インデックスで保持します。入力補完向けの
+前方一致検索と、入力ミスを許容するあいまい検索（Dice係数でランク付け）ができます。
+
+Example:
+    index = NameIndex.from_csv_dir(Path("data/csv_files"))
+    index.prefix("がぶ")  # ガブリアス など
+    index.search("ｶﾞﾌﾞﾘﾔｽ")  # 入力ミスでも ガブリアス が先頭
+    index.search("りゅうのまい", kinds=("move",))
+"""
+
+import heapq
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+
+from app.csv_generator.csv_builder import TABLE_COLUMNS, CSVBuilder
+
+from .tables import Tables, load_tables_from_builder, load_tables_from_csv
+
+# 名前の種類
+NAME_KINDS: tuple[str, ...] = ("pokemon", "move", "ability")
+
+# ひらがな（ぁ〜ゖ）をカタカナに変換する表
+_HIRAGANA_TO_KATAKANA = {code: code + 0x60 for code in range(0x3041, 0x3097)}
+
+# 正規化時に取り除く区切り文字（空白は別途除去する）
+_SEPARATORS = frozenset("・･-‐－_.'’")
+
+# バイグラムの先頭・末尾に付ける目印（前方一致・後方一致のキーを重く扱う）
+_START = "\x02"
+_END = "\x03"
+
+# 前方一致の範囲の上端（どの文字よりも大きい文字）
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def normalize(text: str) -> str:
+    """検索用に名前を正規化する.
+
+    - NFKC正規化（半角カナ → 全角カナ、全角英数 → 半角英数）
+    - 英字は小文字に統一
+    - ひらがなはカタカナに統一
+    - 空白と区切り文字（・ - など）は除去
+
+    Args:
+        text: 名前または検索文字列
+
+    Returns:
+        正規化したキー
+    """
+    text = unicodedata.normalize("NFKC", text).casefold().translate(_HIRAGANA_TO_KATAKANA)
+    return "".join(char for char in text if not char.isspace() and char not in _SEPARATORS)
+
+
+def _bigrams(key: str) -> frozenset[str]:
+    """正規化キーのバイグラム集合（先頭・末尾の目印付き）を返す."""
+    padded = f"{_START}{key}{_END}"
+    return frozenset(padded[i : i + 2] for i in range(len(padded) - 1))
+
+
+@dataclass(frozen=True, slots=True)
+class NameEntry:
+    """検索対象の名前1件.
+
+    Attributes:
+        kind: 名前の種類（pokemon / move / ability）
+        id: CSVと同じID
+        name: 日本語名
+        aliases: 日本語名以外の検索キー（ポケモンの英語名など）
+    """
+
+    kind: str
+    id: int
+    name: str
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class NameMatch:
+    """検索結果1件.
+
+    Attributes:
+        entry: 一致した名前
+        matched: 一致したキー（日本語名または別名）
+        score: 一致度（0〜1。完全一致は1）
+    """
+
+    entry: NameEntry
+    matched: str
+    score: float
+
+
+class NameIndex:
+    """名前のバイグラム転置インデックス.
+
+    1つの名前は日本語名と別名のそれぞれを正規化キーとして登録する。
+    検索結果は名前単位でまとめ、最も一致度の高いキーを採用する。
+    """
+
+    def __init__(self, entries: Iterable[NameEntry]) -> None:
+        """初期化.
+
+        Args:
+            entries: 検索対象の名前
+        """
+        self.entries: list[NameEntry] = list(entries)
+
+        # キー番号 -> (正規化キー, 名前の位置, 元の文字列)
+        keys: list[tuple[str, int, str]] = []
+        for position, entry in enumerate(self.entries):
+            for text in (entry.name, *entry.aliases):
+                key = normalize(text)
+                if key:
+                    keys.append((key, position, text))
+        keys.sort()
+        self._keys = [key for key, _, _ in keys]
+        self._key_entries = [position for _, position, _ in keys]
+        self._key_texts = [text for _, _, text in keys]
+        self._key_kinds = [self.entries[position].kind for _, position, _ in keys]
+        self._key_gram_counts: list[int] = []
+
+        # バイグラム -> キー番号のリスト
+        self._postings: dict[str, list[int]] = {}
+        for key_no, key in enumerate(self._keys):
+            grams = _bigrams(key)
+            self._key_gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(key_no)
+
+    @classmethod
+    def from_tables(cls, tables: Tables) -> "NameIndex":
+        """テーブルの行から構築する.
+
+        Args:
+            tables: テーブル名 -> 行タプルのリスト（tables.py の形式）
+
+        Returns:
+            NameIndex
+        """
+        pokemon_columns = TABLE_COLUMNS["pokemon"]
+        pokemon_name = pokemon_columns.index("name_ja")
+        pokemon_name_en = pokemon_columns.index("name_en")
+        move_name = TABLE_COLUMNS["moves"].index("name_ja")
+        ability_name = TABLE_COLUMNS["abilities"].index("name_ja")
+
+        entries = [
+            NameEntry(
+                "pokemon",
+                row[0],
+                row[pokemon_name],
+                (row[pokemon_name_en],) if row[pokemon_name_en] else (),
+            )
+            for row in tables["pokemon"]
+        ]
+        entries.extend(NameEntry("move", row[0], row[move_name]) for row in tables["moves"])
+        entries.extend(
+            NameEntry("ability", row[0], row[ability_name]) for row in tables["abilities"]
+        )
+        return cls(entries)
+
+    @classmethod
+    def from_csv_dir(cls, csv_dir: Path) -> "NameIndex":
+        """CSV生成ツールの出力ディレクトリから構築する."""
+        return cls.from_tables(load_tables_from_csv(csv_dir))
+
+    @classmethod
+    def from_builder(cls, builder: CSVBuilder) -> "NameIndex":
+        """collect_data() 済みのCSVBuilderから構築する."""
+        return cls.from_tables(load_tables_from_builder(builder))
+
+    def __len__(self) -> int:
+        """登録されている名前の数を返す."""
+        return len(self.entries)
+
+    def exact(self, query: str, kinds: Iterable[str] | None = None) -> list[NameEntry]:
+        """正規化キーが完全一致する名前を返す（表記ゆれのみ許容）.
+
+        Args:
+            query: 検索文字列
+            kinds: 対象とする名前の種類（省略時はすべて）
+
+        Returns:
+            一致した名前のリスト
+        """
+        key = normalize(query)
+        allowed = _allowed_kinds(kinds)
+        results: list[NameEntry] = []
+        for key_no in range(bisect_left(self._keys, key), len(self._keys)):
+            if self._keys[key_no] != key:
+                break
+            entry = self.entries[self._key_entries[key_no]]
+            if (allowed is None or entry.kind in allowed) and entry not in results:
+                results.append(entry)
+        return results
+
+    def prefix(
+        self, query: str, kinds: Iterable[str] | None = None, limit: int = 10
+    ) -> list[NameMatch]:
+        """前方一致する名前を短い順に返す（入力補完用）.
+
+        正規化キーのソート済みリストを二分探索するため、件数に依存せず高速に求まる。
+
+        Args:
+            query: 入力途中の文字列
+            kinds: 対象とする名前の種類（省略時はすべて）
+            limit: 最大件数
+
+        Returns:
+            一致度（入力文字数 / キーの文字数）の高い順の検索結果
+        """
+        key = normalize(query)
+        if not key:
+            return []
+        allowed = _allowed_kinds(kinds)
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + _MAX_CHAR, start)
+        best: dict[int, tuple[float, int]] = {}
+        for key_no in range(start, end):
+            self._keep_best(best, key_no, len(key) / len(self._keys[key_no]), allowed)
+        return self._ranked(best, limit)
+
+    def search(
+        self,
+        query: str,
+        kinds: Iterable[str] | None = None,
+        limit: int = 10,
+        min_score: float = 0.3,
+    ) -> list[NameMatch]:
+        """あいまい検索の結果を一致度の高い順に返す.
+
+        一致度はバイグラム集合のDice係数（2 × 共通数 / (検索語のバイグラム数 + キーの
+        バイグラム数)）。前方一致するキーは 0.5 以上に引き上げるため、入力途中の文字列でも
+        補完候補が上位に来る。
+
+        Args:
+            query: 検索文字列
+            kinds: 対象とする名前の種類（省略時はすべて）
+            limit: 最大件数
+            min_score: 結果に含める一致度の下限
+
+        Returns:
+            一致度の高い順の検索結果
+        """
+        key = normalize(query)
+        if not key:
+            return []
+        allowed = _allowed_kinds(kinds)
+        grams = _bigrams(key)
+
+        # キー番号 -> 共通バイグラム数
+        common = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+
+        best: dict[int, tuple[float, int]] = {}
+        for key_no, count in common.items():
+            score = 2 * count / (len(grams) + self._key_gram_counts[key_no])
+            if self._keys[key_no].startswith(key):
+                score = max(score, 0.5 + 0.5 * len(key) / len(self._keys[key_no]))
+            if score >= min_score:
+                self._keep_best(best, key_no, score, allowed)
+        return self._ranked(best, limit)
+
+    def _keep_best(
+        self,
+        best: dict[int, tuple[float, int]],
+        key_no: int,
+        score: float,
+        allowed: set[str] | None,
+    ) -> None:
+        """名前の位置 -> (一致度, キー番号) に、名前ごとに最も一致度の高いキーを残す."""
+        if allowed is not None and self._key_kinds[key_no] not in allowed:
+            return
+        position = self._key_entries[key_no]
+        current = best.get(position)
+        if current is None or score > current[0]:
+            best[position] = (score, key_no)
+
+    def _ranked(self, best: dict[int, tuple[float, int]], limit: int) -> list[NameMatch]:
+        """一致度の降順（同点はキーの短い順・ID順）に上位を選び、検索結果に変換する.
+
+        NameMatch の生成は上位 limit 件だけに留める。
+        """
+        top = heapq.nsmallest(
+            limit,
+            best.items(),
+            key=lambda item: (-item[1][0], len(self._keys[item[1][1]]), item[0]),
+        )
+        return [
+            NameMatch(self.entries[position], self._key_texts[key_no], score)
+            for position, (score, key_no) in top
+        ]
+
+
+def _allowed_kinds(kinds: Iterable[str] | None) -> set[str] | None:
+    """名前の種類の指定を検証して集合に変換する.
+
+    Raises:
+        ValueError: 未知の種類が指定された場合
+    """
+    if kinds is None:
+        return None
+    allowed = set(kinds)
+    unknown = allowed.difference(NAME_KINDS)
+    if unknown:
+        msg = f"未知の名前の種類です: {sorted(unknown)}"
+        raise ValueError(msg)
+    return allowed
@@ -0,0 +1,131 @@
+"""生成済みデータの読み込みモジュール.
+
+CSVファイル・バイナリスナップショット・CSVBuilderから、各テーブルの行をCSVと同じID・カラム順で読み込みます。
+"""
+
+import csv
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.csv_generator.binary_snapshot import DatasetSnapshot
+from app.csv_generator.schema import TABLE_COLUMNS
+
+if TYPE_CHECKING:
+    from app.csv_generator.csv_builder import CSVBuilder
+
+# テーブル名 -> 行タプルのリスト（カラム順は TABLE_COLUMNS に従う）
+Tables = dict[str, list[tuple[Any, ...]]]
+
+_INT_COLUMNS = frozenset(
+    {
+        "id",
+        "pokedex_no",
+        "power",
+        "accuracy",
+        "pp",
+        "priority",
+        "height_dm",
+        "weight_hg",
+        "low_kick_power",
+        "base_hp",
+        "base_atk",
+        "base_def",
+        "base_spa",
+        "base_spd",
+        "base_spe",
+        "pokemon_id",
+        "ability_id",
+        "move_id",
+    }
+)
+_BOOL_COLUMNS = frozenset({"is_legendary", "is_mythical", "is_hidden"})
+
+
+def load_tables_from_csv(csv_dir: Path) -> Tables:
+    """CSVファイルから全テーブルを読み込む.
+
+    空文字列は `None`、整数・真偽値カラムはそれぞれ `int` / `bool` に変換する。
+
+    Args:
+        csv_dir: CSV生成ツールの出力ディレクトリ
+
+    Returns:
+        テーブル名 -> 行タプルのリスト
+
+    Raises:
+        FileNotFoundError: CSVファイルが存在しない場合
+    """
+    tables: Tables = {}
+    for table_name, columns in TABLE_COLUMNS.items():
+        csv_path = csv_dir / f"{table_name}.csv"
+        if not csv_path.exists():
+            msg = f"CSVファイルが存在しません: {csv_path}"
+            raise FileNotFoundError(msg)
+
+        converters = [_converter_for(column) for column in columns]
+        with csv_path.open(encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            if tuple(header) != columns:
+                msg = f"CSVヘッダーが想定と異なります: {csv_path.name} {header}"
+                raise ValueError(msg)
+            tables[table_name] = [
+                tuple(convert(value) for convert, value in zip(converters, row, strict=True))
+                for row in reader
+            ]
+    return tables
+
+
+def load_tables_from_snapshot(snapshot_path: Path) -> Tables:
+    """バイナリスナップショット（binary_snapshot.py）から全テーブルを読み込む.
+
+    CSVの解析が不要なため load_tables_from_csv() より速い。行タプルを作らずに参照する場合は
+    DatasetSnapshot を直接使う。
+
+    Args:
+        snapshot_path: CSV生成ツールの --snapshot で出力したファイル
+
+    Returns:
+        テーブル名 -> 行タプルのリスト
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+    """
+    with DatasetSnapshot.open(snapshot_path) as snapshot:
+        return {table_name: list(snapshot.iter_rows(table_name)) for table_name in TABLE_COLUMNS}
+
+
+def load_tables_from_builder(builder: "CSVBuilder") -> Tables:
+    """collect_data() 済みのCSVBuilderから全テーブルを取得する.
+
+    Args:
+        builder: collect_data() 済みのCSVBuilder
+
+    Returns:
+        テーブル名 -> 行タプルのリスト
+    """
+    return {table_name: list(builder.iter_rows(table_name)) for table_name in TABLE_COLUMNS}
+
+
+def _converter_for(column: str) -> Any:
+    """カラム名に応じたCSV値の変換関数を返す."""
+    if column in _INT_COLUMNS:
+        return _to_optional_int
+    if column in _BOOL_COLUMNS:
+        return _to_bool
+    return _to_optional_str
+
+
+def _to_optional_int(value: str) -> int | None:
+    """空文字列をNoneとして整数に変換する."""
+    return int(value) if value != "" else None
+
+
+def _to_bool(value: str) -> bool:
+    """CSVの真偽値表記 (True/False) を変換する."""
+    return value.strip().lower() in {"true", "t", "1"}
+
+
+def _to_optional_str(value: str) -> str | None:
+    """空文字列をNoneに変換する."""
+    return value if value != "" else None
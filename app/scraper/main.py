@@ -1,4 +1,15 @@
-"""スクレイピングのメイン実行モジュール."""
+"""スクレイピングのメイン実行モジュール.
+
+Usage:
+    # 1匹分を取得
+    uv run python -m app.scraper.main https://yakkun.com/sv/zukan/n642
+
+    # pokemon_urls.json の一覧を順次取得
+    uv run python -m app.scraper.main --batch
+
+    # 段階（取得・解析・保存）ごとの処理時間・関数別統計を data/profile/ に出力
+    uv run python -m app.scraper.main --batch --profile
+"""
 
 from __future__ import annotations
 
@@ -11,6 +22,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from app.profiling import StageProfiler, default_output_dir
 from app.scraper.http_client import NonSvPageError, fetch_pokemon_soup
 from app.scraper.output import save_pokemon_json
 from app.scraper.pokemon_abilities import scrape_pokemon_abilities
@@ -31,25 +43,33 @@ class PokemonTarget:
     url: str
 
 
-def scrape_and_save(url: str, output_dir: str = "data/pokemon") -> None:
+def scrape_and_save(
+    url: str, output_dir: str = "data/pokemon", profiler: StageProfiler | None = None
+) -> None:
     """指定されたURLからポケモンデータを取得してJSONに保存する.
 
     Args:
         url: ポケモン図鑑ページのURL
         output_dir: 出力ディレクトリ
+        profiler: 指定時は取得・解析・保存の段階ごとに処理時間と関数別統計を記録する
     """
+    profiler = profiler or StageProfiler(enabled=False)
     print(f"スクレイピング開始: {url}")
 
     try:
-        soup = fetch_pokemon_soup(url)
+        with profiler.stage("fetch"):
+            soup = fetch_pokemon_soup(url)
     except NonSvPageError as error:
         print("ポケモンSV図鑑以外のページへ遷移したため、スクレイピングを中止しました。")
         print(f"最終URL: {error.final_url}")
         return
 
-    pokemon_data = scrape_pokemon_basic(soup)
-    abilities = scrape_pokemon_abilities(soup)
-    moves = scrape_pokemon_moves(soup)
+    with profiler.stage("parse_basic"):
+        pokemon_data = scrape_pokemon_basic(soup)
+    with profiler.stage("parse_abilities"):
+        abilities = scrape_pokemon_abilities(soup)
+    with profiler.stage("parse_moves"):
+        moves = scrape_pokemon_moves(soup)
 
     bundle: dict[str, Any] = {
         "pokemon": pokemon_data,
@@ -64,7 +84,8 @@ def scrape_and_save(url: str, output_dir: str = "data/pokemon") -> None:
     print(f"技件数: {len(moves)}")
     print("-" * 80)
 
-    output_path = save_pokemon_json(bundle, output_dir)
+    with profiler.stage("save_json"):
+        output_path = save_pokemon_json(bundle, output_dir)
 
     print(f"\nJSONファイルを保存しました: {output_path}")
 
@@ -96,13 +117,16 @@ def run_batch(
     *,
     pokemon_targets: list[PokemonTarget],
     sleep_seconds: float = DEFAULT_SLEEP_SECONDS,
+    profiler: StageProfiler | None = None,
 ) -> None:
     """ポケモン一覧を順次スクレイピングし進捗を保存する.
 
     Args:
         pokemon_targets: スクレイピング対象リスト
         sleep_seconds: ポケモン処理間で待機する秒数
+        profiler: 指定時は段階ごとに処理時間と関数別統計を記録する（全ポケモン分を合算）
     """
+    profiler = profiler or StageProfiler(enabled=False)
     total = len(pokemon_targets)
     if total == 0:
         print("ポケモンURLリストが空です。")
@@ -136,7 +160,7 @@ def run_batch(
                 f"\n[{current_count}/{total}] No.{target.dex_no} {target.pokemon_name} を処理中...",
             )
             try:
-                scrape_and_save(target.url)
+                scrape_and_save(target.url, profiler=profiler)
             except Exception as error:  # noqa: BLE001
                 print(
                     f"エラーが発生しました (No.{target.dex_no} {target.pokemon_name}): {error}",
@@ -165,7 +189,8 @@ def run_batch(
 
             if remaining > 0:
                 try:
-                    time.sleep(sleep_seconds)
+                    with profiler.stage("sleep"):
+                        time.sleep(sleep_seconds)
                 except InterruptedError:
                     stop_requested = True
                     print(
@@ -207,10 +232,37 @@ if __name__ == "__main__":
         help="バッチ実行時のポケモン間待機秒数 (デフォルト: 1.0 秒)。",
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="段階ごとの処理時間と cProfile の統計・トレースを data/profile/ に出力します。",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        default=None,
+        help=(
+            "--profile の出力先 (既定: data/profile/scraper_<日時>/)。"
+            "指定時は --profile を含みます。"
+        ),
+    )
+
     parsed = parser.parse_args()
+    # --profile-dir の指定は --profile を含む
+    profile = parsed.profile or parsed.profile_dir is not None
+    profiler = StageProfiler(enabled=profile)
 
     if parsed.batch:
         targets = load_pokemon_targets(POKEMON_URLS_PATH)
-        run_batch(pokemon_targets=targets, sleep_seconds=max(parsed.sleep, 0.0))
+        run_batch(pokemon_targets=targets, sleep_seconds=max(parsed.sleep, 0.0), profiler=profiler)
     else:
-        scrape_and_save(parsed.target_url)
+        scrape_and_save(parsed.target_url, profiler=profiler)
+
+    if profile:
+        profile_dir = parsed.profile_dir or default_output_dir("scraper")
+        print("\nプロファイル:")
+        for line in profiler.summary_lines():
+            print(line)
+        files = profiler.export(profile_dir)
+        print(f"\nプロファイル結果を保存しました: {profile_dir}")
+        print(f"  トレース（chrome://tracing・speedscope で表示）: {files['trace'].name}")
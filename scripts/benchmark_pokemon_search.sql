@@ -0,0 +1,93 @@
+-- ========================================
+-- 代表クエリの比較（JOIN版 / sv.pokemon_search版）
+-- ========================================
+--
+-- docs/DB設計書.md の代表クエリについて、従来のJOIN版と sv.pokemon_search 版の
+-- 実行計画・実行時間・バッファ使用量を比較します。
+--
+-- 使用方法:
+--   ローカル環境:
+--     PGPASSWORD=postgres psql -h 127.0.0.1 -p 54322 -U postgres -d postgres \
+--         -f scripts/benchmark_pokemon_search.sql
+--
+-- 各クエリは1回実行してキャッシュを温めた後に EXPLAIN (ANALYZE, BUFFERS) を取ります。
+-- ========================================
+
+\set QUIET on
+\pset pager off
+\o /dev/null
+
+-- キャッシュを温める
+SELECT COUNT(*) FROM sv.pokemon;
+SELECT COUNT(*) FROM sv.pokemon_moves;
+SELECT COUNT(*) FROM sv.pokemon_abilities;
+SELECT COUNT(*) FROM sv.pokemon_search;
+
+\o
+
+\echo '========================================'
+\echo '6.1 ねこだまし を覚える素早さ102以上 (JOIN版)'
+\echo '========================================'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT p.*
+FROM sv.pokemon p
+JOIN sv.pokemon_moves pm ON p.id = pm.pokemon_id
+JOIN sv.moves m ON pm.move_id = m.id
+WHERE m.name_ja = 'ねこだまし'
+  AND p.base_spe >= 102;
+
+\echo '========================================'
+\echo '6.1 ねこだまし を覚える素早さ102以上 (pokemon_search版)'
+\echo '========================================'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT p.*
+FROM sv.pokemon_search s
+JOIN sv.pokemon p ON p.id = s.pokemon_id
+WHERE s.move_ids @> ARRAY(SELECT id FROM sv.moves WHERE name_ja = 'ねこだまし')
+  AND s.base_spe >= 102;
+
+\echo '========================================'
+\echo '6.2 もらいび を持つほのおタイプ (JOIN版)'
+\echo '========================================'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT p.*
+FROM sv.pokemon p
+JOIN sv.pokemon_abilities pa ON p.id = pa.pokemon_id
+JOIN sv.abilities a ON pa.ability_id = a.id
+WHERE a.name_ja = 'もらいび'
+  AND (p.type_primary = 'ほのお' OR p.type_secondary = 'ほのお');
+
+\echo '========================================'
+\echo '6.2 もらいび を持つほのおタイプ (pokemon_search版)'
+\echo '========================================'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT p.*
+FROM sv.pokemon_search s
+JOIN sv.pokemon p ON p.id = s.pokemon_id
+WHERE s.ability_ids && ARRAY(SELECT id FROM sv.abilities WHERE name_ja = 'もらいび')
+  AND s.types @> ARRAY['ほのお'];
+
+\echo '========================================'
+\echo '6.3 伝説・幻以外のドラゴンタイプで りゅうのまい を覚える (JOIN版)'
+\echo '========================================'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT p.*
+FROM sv.pokemon p
+JOIN sv.pokemon_moves pm ON p.id = pm.pokemon_id
+JOIN sv.moves m ON pm.move_id = m.id
+WHERE (p.type_primary = 'ドラゴン' OR p.type_secondary = 'ドラゴン')
+  AND p.is_legendary = FALSE
+  AND p.is_mythical = FALSE
+  AND m.name_ja = 'りゅうのまい';
+
+\echo '========================================'
+\echo '6.3 伝説・幻以外のドラゴンタイプで りゅうのまい を覚える (pokemon_search版)'
+\echo '========================================'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT p.*
+FROM sv.pokemon_search s
+JOIN sv.pokemon p ON p.id = s.pokemon_id
+WHERE s.types @> ARRAY['ドラゴン']
+  AND s.move_ids @> ARRAY(SELECT id FROM sv.moves WHERE name_ja = 'りゅうのまい')
+  AND NOT s.is_legendary
+  AND NOT s.is_mythical;
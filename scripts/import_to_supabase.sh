@@ -9,13 +9,39 @@
 # 使用方法:
 #   ローカル環境: ./scripts/import_to_supabase.sh
 #   本番環境:     ./scripts/import_to_supabase.sh --remote
+#   差分同期:     ./scripts/import_to_supabase.sh [--remote] --sync
+#   一括投入:     ./scripts/import_to_supabase.sh [--remote] --bulk
+#   確認なしで実行:   上記に --yes を追加（ベンチマーク・CIなど標準入力のない環境向け）
+#
+# 差分同期モード（--sync）:
+#   TRUNCATEせずにCSVを一時ステージングテーブルへ読み込み、name_jaを自然キーとして
+#   sv.*テーブルとの差分（INSERT/UPDATE/DELETE）のみを1トランザクションで適用します。
+#   投入中もテーブルが空になる時間帯がなく、変更のない行やインデックスは書き換えません。
+#   既存行のIDは維持され、新規行には各テーブルのシーケンスから新しいIDが採番されます。
+#
+# 一括投入モード（--bulk）:
+#   全件投入の前にsvスキーマの二次インデックスと外部キー制約を退避・削除し、
+#   マスタテーブル・関連テーブルをそれぞれ並列にCOPYした後、並列メンテナンスワーカーで
+#   インデックスを再作成し、外部キーを再付与してANALYZEを実行します。
+#   途中で失敗した場合も、退避したインデックス・外部キー定義はスクリプト終了時に復元されます。
+#
+# いずれのモードでも、CSVの effect_tags.csv（技・特性の効果タグ）を sv.moves / sv.abilities の
+# effect_tags カラムへ反映し（ファイルがない場合はスキップ）、
+# 投入完了後に派生テーブル（sv.speed_tiers, sv.pokemon_search）を再計算し、
+# sv.dataset_version のバージョンを1進めます（クエリサービスの結果キャッシュの無効化に使用）。
+#
+# learnset の正規化テーブル（sv.learnsets, sv.learnset_moves, sv.pokemon_learnsets）は
+# CSV生成ツールが出力する learnsets.csv などから投入します。全件・一括投入ではCOPYし、
+# 差分同期では move_set_hash を自然キーとして新しい技の組・割り当ての変わったポケモンのみ
+# 書き換えます。CSVがない場合は sv.pokemon_moves から作り直します（docs/DB設計書.md 4.8 参照）。
 #
 # 前提条件:
 #   - Supabase CLIがインストールされていること
 #   - ローカル: supabase startでローカル環境が起動していること
 #   - 本番: .envファイルにSupabase接続情報が設定されていること
-#   - data/csv_files/配下にCSVファイルが生成されていること
+#   - data/csv_files/配下（または環境変数 CSV_DIR のディレクトリ）にCSVファイルが生成されていること
 #   - psqlコマンドが利用可能であること
+#   - uvが利用可能であること（投入前にCSVを app.csv_generator.validator で検証します）
 # ========================================
 
 set -e  # エラー時に即座に終了
@@ -30,11 +56,21 @@ NC='\033[0m' # No Color
 # プロジェクトルートディレクトリ
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
-CSV_DIR="$PROJECT_ROOT/data/csv_files"
+# CSVディレクトリ（環境変数 CSV_DIR で上書き可能。負荷試験の合成データ投入などに使用）
+CSV_DIR="${CSV_DIR:-$PROJECT_ROOT/data/csv_files}"
 
 # 環境変数（デフォルトはローカル）
 ENVIRONMENT="local"
 
+# 投入モード（full: TRUNCATE + 全件投入, sync: 差分同期, bulk: インデックス再構築付き一括投入）
+IMPORT_MODE="full"
+
+# learnset の正規化レイアウトのテーブル（CSVファイル名と同じ。マスタが先）
+LEARNSET_TABLES=("learnsets" "learnset_moves" "pokemon_learnsets")
+
+# 確認プロンプトを省略するか（--yes で有効）
+ASSUME_YES="false"
+
 # コマンドライン引数の解析
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -46,9 +82,21 @@ while [[ $# -gt 0 ]]; do
             ENVIRONMENT="local"
             shift
             ;;
+        --sync)
+            IMPORT_MODE="sync"
+            shift
+            ;;
+        --bulk)
+            IMPORT_MODE="bulk"
+            shift
+            ;;
+        --yes|-y)
+            ASSUME_YES="true"
+            shift
+            ;;
         *)
             echo "不明なオプション: $1"
-            echo "使用方法: $0 [--local|--remote]"
+            echo "使用方法: $0 [--local|--remote] [--sync|--bulk] [--yes]"
             exit 1
             ;;
     esac
@@ -140,6 +188,13 @@ check_prerequisites() {
         fi
     done
 
+    # CSVの事前検証（svスキーマの制約違反があればデータベースに触れる前に中止する）
+    log_info "CSVを事前検証中..."
+    if ! (cd "$PROJECT_ROOT" && uv run python -m app.csv_generator.validator --csv-dir "$CSV_DIR"); then
+        log_error "CSVに制約違反があるため投入を中止します"
+        exit 1
+    fi
+
     log_success "前提条件チェック完了"
 }
 
@@ -189,29 +244,35 @@ check_supabase_status() {
 # ========================================
 # テーブルのクリア
 # ========================================
+# 既存データが残っていると全件・一括投入のCOPYは主キー・一意制約の違反で失敗するため、
+# クリアしない場合は投入も中止する（標準入力が閉じている場合も「いいえ」とみなす）
 clear_tables() {
-    if [ "$ENVIRONMENT" = "remote" ]; then
+    local response=""
+    if [ "$ASSUME_YES" = "true" ]; then
+        log_info "--yes が指定されたため、確認せずにテーブルをクリアします"
+    elif [ "$ENVIRONMENT" = "remote" ]; then
         log_warn "⚠️  本番環境のデータをクリアしようとしています ⚠️"
         log_warn "本当に実行しますか? 'yes' と入力してください: "
-        read -r response
+        read -r response || true
 
         if [ "$response" != "yes" ]; then
-            log_info "データクリアをキャンセルしました"
-            return
+            log_info "データクリアをキャンセルしたため、投入を中止します"
+            exit 0
         fi
     else
         log_warn "既存データをクリアしますか? (y/N): "
-        read -r response
+        read -r response || true
 
         if [[ ! "$response" =~ ^[Yy]$ ]]; then
-            log_info "データクリアをスキップしました"
-            return
+            log_info "データクリアをスキップしたため、投入を中止します（差分同期は --sync）"
+            exit 0
         fi
     fi
 
     log_info "テーブルをクリア中..."
 
     # 関連テーブルから削除（外部キー制約対応）
+    execute_sql "TRUNCATE TABLE sv.learnsets CASCADE;" 2>/dev/null || true
     execute_sql "TRUNCATE TABLE sv.pokemon_moves CASCADE;" 2>/dev/null || true
     execute_sql "TRUNCATE TABLE sv.pokemon_abilities CASCADE;" 2>/dev/null || true
     execute_sql "TRUNCATE TABLE sv.pokemon CASCADE;" 2>/dev/null || true
@@ -230,75 +291,570 @@ import_csv() {
 
     log_info "インポート中: $table_name ← $csv_file"
 
-    # psqlコマンドを使用してCOPYコマンドを実行
-    PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -c "
-        COPY sv.$table_name FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
-    " < "$CSV_DIR/$csv_file" -q
+    # CSVにないカラム（effect_tags など投入後に反映するもの）は既定値のままにするため、
+    # ヘッダー行のカラムを列挙してCOPYする
+    local columns
+    columns=$(head -n 1 "$CSV_DIR/$csv_file" | tr -d '\r')
 
-    # インポート件数を取得
-    local count=$(execute_sql_with_output "SELECT COUNT(*) FROM sv.$table_name;" | tr -d ' ')
+    # psqlコマンドを使用してCOPYコマンドを実行（件数はCOPYの結果タグ "COPY n" から取得）
+    local result
+    result=$(PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -c "
+        COPY sv.$table_name ($columns) FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING 'UTF8');
+    " < "$CSV_DIR/$csv_file")
+    local count=${result##* }
 
     log_success "インポート完了: $table_name ($count 件)"
 }
 
 # ========================================
-# データ整合性チェック
+# 一括投入（インデックス・外部キーの退避と再構築）
 # ========================================
-verify_data() {
-    log_info "データ整合性チェック中..."
+BULK_DDL_FILE=""
+
+prepare_bulk_load() {
+    log_info "二次インデックスと外部キー制約を退避中..."
+
+    BULK_DDL_FILE=$(mktemp)
+    # 途中で失敗しても定義を失わないよう、終了時に必ず復元する
+    trap restore_bulk_ddl EXIT
+
+    # 再作成時は並列メンテナンスワーカーを使用する
+    {
+        echo "SET max_parallel_maintenance_workers = 4;"
+        echo "SET maintenance_work_mem = '256MB';"
+        # 主キー・UNIQUE制約以外のインデックス（部分インデックス・逆引きインデックス等）
+        execute_sql_with_output "
+            SELECT pg_get_indexdef(ix.indexrelid) || ';'
+            FROM pg_index ix
+            JOIN pg_class c ON c.oid = ix.indexrelid
+            WHERE c.relnamespace = 'sv'::regnamespace
+              AND NOT ix.indisprimary
+              AND NOT ix.indisunique
+            ORDER BY c.relname;
+        "
+        # 外部キー制約
+        execute_sql_with_output "
+            SELECT format('ALTER TABLE %s ADD CONSTRAINT %I %s;',
+                          conrelid::regclass, conname, pg_get_constraintdef(oid))
+            FROM pg_constraint
+            WHERE contype = 'f' AND connamespace = 'sv'::regnamespace
+            ORDER BY conname;
+        "
+    } > "$BULK_DDL_FILE"
+
+    local index_count=$(grep -c "CREATE INDEX" "$BULK_DDL_FILE" || true)
+    local fk_count=$(grep -c "FOREIGN KEY" "$BULK_DDL_FILE" || true)
+
+    # 1トランザクションでまとめて削除する
+    PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" \
+        -v ON_ERROR_STOP=1 --single-transaction -q <<'SQL'
+DO $$
+DECLARE
+    r record;
+BEGIN
+    FOR r IN
+        SELECT conrelid::regclass AS table_name, conname
+        FROM pg_constraint
+        WHERE contype = 'f' AND connamespace = 'sv'::regnamespace
+    LOOP
+        EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', r.table_name, r.conname);
+    END LOOP;
+
+    FOR r IN
+        SELECT ix.indexrelid::regclass AS index_name
+        FROM pg_index ix
+        JOIN pg_class c ON c.oid = ix.indexrelid
+        WHERE c.relnamespace = 'sv'::regnamespace
+          AND NOT ix.indisprimary
+          AND NOT ix.indisunique
+    LOOP
+        EXECUTE format('DROP INDEX %s', r.index_name);
+    END LOOP;
+END
+$$;
+SQL
+
+    log_success "退避完了: インデックス ${index_count}件, 外部キー ${fk_count}件"
+}
 
-    # 各テーブルの件数を確認
-    log_info "テーブルレコード数:"
+import_csv_parallel() {
+    local pids=()
+    local table_name
 
-    local abilities_count=$(execute_sql_with_output "SELECT COUNT(*) FROM sv.abilities;" | tr -d ' ')
-    echo "  - abilities: $abilities_count 件"
+    for table_name in "$@"; do
+        import_csv "$table_name" "$table_name.csv" &
+        pids+=($!)
+    done
 
-    local moves_count=$(execute_sql_with_output "SELECT COUNT(*) FROM sv.moves;" | tr -d ' ')
-    echo "  - moves: $moves_count 件"
+    local pid
+    local failed=0
+    for pid in "${pids[@]}"; do
+        wait "$pid" || failed=1
+    done
 
-    local pokemon_count=$(execute_sql_with_output "SELECT COUNT(*) FROM sv.pokemon;" | tr -d ' ')
-    echo "  - pokemon: $pokemon_count 件"
+    if [ "$failed" -ne 0 ]; then
+        log_error "並列インポート中にエラーが発生しました"
+        exit 1
+    fi
+}
 
-    local pokemon_abilities_count=$(execute_sql_with_output "SELECT COUNT(*) FROM sv.pokemon_abilities;" | tr -d ' ')
-    echo "  - pokemon_abilities: $pokemon_abilities_count 件"
+rebuild_bulk_ddl() {
+    log_info "インデックス・外部キーを再構築中（並列メンテナンスワーカー使用）..."
 
-    local pokemon_moves_count=$(execute_sql_with_output "SELECT COUNT(*) FROM sv.pokemon_moves;" | tr -d ' ')
-    echo "  - pokemon_moves: $pokemon_moves_count 件"
+    PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" \
+        -v ON_ERROR_STOP=1 --single-transaction -q -f "$BULK_DDL_FILE"
+
+    rm -f "$BULK_DDL_FILE"
+    BULK_DDL_FILE=""
+    trap - EXIT
+
+    log_info "統計情報を更新中..."
+    execute_sql "ANALYZE sv.abilities, sv.moves, sv.pokemon, sv.pokemon_abilities, sv.pokemon_moves, sv.learnsets, sv.learnset_moves, sv.pokemon_learnsets;"
 
-    # 外部キー制約違反チェック
-    log_info "外部キー制約チェック中..."
+    log_success "インデックス・外部キーの再構築完了"
+}
 
-    # pokemon_abilitiesの整合性チェック
-    local invalid_pa=$(execute_sql_with_output "
-        SELECT COUNT(*)
-        FROM sv.pokemon_abilities pa
-        LEFT JOIN sv.pokemon p ON pa.pokemon_id = p.id
-        LEFT JOIN sv.abilities a ON pa.ability_id = a.id
-        WHERE p.id IS NULL OR a.id IS NULL;
-    " | tr -d ' ')
+restore_bulk_ddl() {
+    if [ -z "$BULK_DDL_FILE" ] || [ ! -f "$BULK_DDL_FILE" ]; then
+        return
+    fi
 
-    if [ "$invalid_pa" -gt 0 ]; then
-        log_error "pokemon_abilitiesに無効な参照が $invalid_pa 件見つかりました"
+    log_warn "一括投入が中断されたため、退避したインデックス・外部キーを復元します"
+    if PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" \
+        -v ON_ERROR_STOP=1 --single-transaction -q -f "$BULK_DDL_FILE"; then
+        rm -f "$BULK_DDL_FILE"
+        log_success "インデックス・外部キーを復元しました"
     else
-        log_success "pokemon_abilities: 整合性OK"
+        log_error "復元に失敗しました。定義ファイルを手動で適用してください: $BULK_DDL_FILE"
     fi
+}
+
+# ========================================
+# 効果タグの反映
+# ========================================
+# effect_tags.csv（table_name, name_ja, tag の縦持ち）を一時テーブルに読み込み、
+# name_ja で突き合わせて sv.moves / sv.abilities の effect_tags 配列を更新する。
+# タグのない行は空配列とし、値が変わる行のみ書き換える。
+effect_tags_sql() {
+    cat <<SQL
+CREATE TEMP TABLE stage_effect_tags (table_name TEXT, name_ja TEXT, tag TEXT) ON COMMIT DROP;
+\copy stage_effect_tags FROM '$CSV_DIR/effect_tags.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+
+UPDATE sv.moves m
+SET effect_tags = t.effect_tags
+FROM (
+    SELECT m2.id,
+           COALESCE(array_agg(s.tag ORDER BY s.tag) FILTER (WHERE s.tag IS NOT NULL), '{}') AS effect_tags
+    FROM sv.moves m2
+    LEFT JOIN stage_effect_tags s ON s.table_name = 'moves' AND s.name_ja = m2.name_ja
+    GROUP BY m2.id
+) t
+WHERE m.id = t.id
+  AND m.effect_tags IS DISTINCT FROM t.effect_tags;
+
+UPDATE sv.abilities a
+SET effect_tags = t.effect_tags
+FROM (
+    SELECT a2.id,
+           COALESCE(array_agg(s.tag ORDER BY s.tag) FILTER (WHERE s.tag IS NOT NULL), '{}') AS effect_tags
+    FROM sv.abilities a2
+    LEFT JOIN stage_effect_tags s ON s.table_name = 'abilities' AND s.name_ja = a2.name_ja
+    GROUP BY a2.id
+) t
+WHERE a.id = t.id
+  AND a.effect_tags IS DISTINCT FROM t.effect_tags;
+SQL
+}
 
-    # pokemon_movesの整合性チェック
-    local invalid_pm=$(execute_sql_with_output "
-        SELECT COUNT(*)
-        FROM sv.pokemon_moves pm
-        LEFT JOIN sv.pokemon p ON pm.pokemon_id = p.id
-        LEFT JOIN sv.moves m ON pm.move_id = m.id
-        WHERE p.id IS NULL OR m.id IS NULL;
-    " | tr -d ' ')
-
-    if [ "$invalid_pm" -gt 0 ]; then
-        log_error "pokemon_movesに無効な参照が $invalid_pm 件見つかりました"
+apply_effect_tags() {
+    if [ ! -f "$CSV_DIR/effect_tags.csv" ]; then
+        log_warn "effect_tags.csv が見つからないため、効果タグの反映をスキップします"
+        return
+    fi
+
+    log_info "効果タグを反映中..."
+
+    effect_tags_sql | PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" \
+        -d "$DB_NAME" -v ON_ERROR_STOP=1 --single-transaction -q
+
+    log_success "効果タグの反映完了"
+}
+
+# ========================================
+# 差分同期（ステージングテーブル経由）
+# ========================================
+sync_tables() {
+    log_info "ステージングテーブル経由で差分同期中..."
+
+    local effect_tags_step="\\echo '（effect_tags.csv がないためスキップ）'"
+    if [ -f "$CSV_DIR/effect_tags.csv" ]; then
+        effect_tags_step=$(effect_tags_sql)
     else
-        log_success "pokemon_moves: 整合性OK"
+        log_warn "effect_tags.csv が見つからないため、効果タグの反映をスキップします"
+    fi
+    local learnsets_step
+    learnsets_step=$(learnsets_sync_sql)
+
+    # ステージングテーブルはセッション内の一時テーブルのため、
+    # 読み込みから差分適用までを1つのpsqlセッション・1トランザクションで実行する
+    PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" \
+        -v ON_ERROR_STOP=1 --single-transaction <<SQL
+\set QUIET on
+
+-- 1. ステージングテーブルへの読み込み
+CREATE TEMP TABLE stage_abilities (LIKE sv.abilities INCLUDING DEFAULTS) ON COMMIT DROP;
+CREATE TEMP TABLE stage_moves (LIKE sv.moves INCLUDING DEFAULTS) ON COMMIT DROP;
+CREATE TEMP TABLE stage_pokemon (LIKE sv.pokemon INCLUDING DEFAULTS) ON COMMIT DROP;
+CREATE TEMP TABLE stage_pokemon_abilities (LIKE sv.pokemon_abilities INCLUDING DEFAULTS) ON COMMIT DROP;
+CREATE TEMP TABLE stage_pokemon_moves (LIKE sv.pokemon_moves INCLUDING DEFAULTS) ON COMMIT DROP;
+-- effect_tags はCSVのカラムではない（手順5で effect_tags.csv から反映する）
+ALTER TABLE stage_abilities DROP COLUMN effect_tags;
+ALTER TABLE stage_moves DROP COLUMN effect_tags;
+
+\copy stage_abilities FROM '$CSV_DIR/abilities.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+\copy stage_moves FROM '$CSV_DIR/moves.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+\copy stage_pokemon FROM '$CSV_DIR/pokemon.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+\copy stage_pokemon_abilities FROM '$CSV_DIR/pokemon_abilities.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+\copy stage_pokemon_moves FROM '$CSV_DIR/pokemon_moves.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+
+CREATE UNIQUE INDEX ON stage_abilities (name_ja);
+CREATE UNIQUE INDEX ON stage_moves (name_ja);
+CREATE UNIQUE INDEX ON stage_pokemon (name_ja);
+ANALYZE stage_abilities, stage_moves, stage_pokemon, stage_pokemon_abilities, stage_pokemon_moves;
+
+-- COPYでIDを明示投入した場合シーケンスが進んでいないため、新規行の採番前に同期する
+\o /dev/null
+SELECT setval(pg_get_serial_sequence('sv.abilities', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM sv.abilities;
+SELECT setval(pg_get_serial_sequence('sv.moves', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM sv.moves;
+SELECT setval(pg_get_serial_sequence('sv.pokemon', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM sv.pokemon;
+\o
+
+\set QUIET off
+
+-- 2. マスタテーブルの更新・追加（name_jaで突き合わせ）
+\echo '[abilities]'
+UPDATE sv.abilities a
+SET effect_text = s.effect_text
+FROM stage_abilities s
+WHERE a.name_ja = s.name_ja
+  AND a.effect_text IS DISTINCT FROM s.effect_text;
+
+INSERT INTO sv.abilities (name_ja, effect_text)
+SELECT s.name_ja, s.effect_text
+FROM stage_abilities s
+WHERE NOT EXISTS (SELECT 1 FROM sv.abilities a WHERE a.name_ja = s.name_ja);
+
+\echo '[moves]'
+UPDATE sv.moves m
+SET type_name = s.type_name,
+    damage_class = s.damage_class,
+    power = s.power,
+    accuracy = s.accuracy,
+    pp = s.pp,
+    priority = s.priority,
+    effect_text = s.effect_text
+FROM stage_moves s
+WHERE m.name_ja = s.name_ja
+  AND (m.type_name, m.damage_class, m.power, m.accuracy, m.pp, m.priority, m.effect_text)
+      IS DISTINCT FROM
+      (s.type_name, s.damage_class, s.power, s.accuracy, s.pp, s.priority, s.effect_text);
+
+INSERT INTO sv.moves (name_ja, type_name, damage_class, power, accuracy, pp, priority, effect_text)
+SELECT s.name_ja, s.type_name, s.damage_class, s.power, s.accuracy, s.pp, s.priority, s.effect_text
+FROM stage_moves s
+WHERE NOT EXISTS (SELECT 1 FROM sv.moves m WHERE m.name_ja = s.name_ja);
+
+\echo '[pokemon]'
+UPDATE sv.pokemon p
+SET pokedex_no = s.pokedex_no,
+    name_en = s.name_en,
+    form_label = s.form_label,
+    type_primary = s.type_primary,
+    type_secondary = s.type_secondary,
+    height_dm = s.height_dm,
+    weight_hg = s.weight_hg,
+    low_kick_power = s.low_kick_power,
+    is_legendary = s.is_legendary,
+    is_mythical = s.is_mythical,
+    base_hp = s.base_hp,
+    base_atk = s.base_atk,
+    base_def = s.base_def,
+    base_spa = s.base_spa,
+    base_spd = s.base_spd,
+    base_spe = s.base_spe,
+    remarks = s.remarks
+FROM stage_pokemon s
+WHERE p.name_ja = s.name_ja
+  AND (p.pokedex_no, p.name_en, p.form_label, p.type_primary, p.type_secondary,
+       p.height_dm, p.weight_hg, p.low_kick_power, p.is_legendary, p.is_mythical,
+       p.base_hp, p.base_atk, p.base_def, p.base_spa, p.base_spd, p.base_spe, p.remarks)
+      IS DISTINCT FROM
+      (s.pokedex_no, s.name_en, s.form_label, s.type_primary, s.type_secondary,
+       s.height_dm, s.weight_hg, s.low_kick_power, s.is_legendary, s.is_mythical,
+       s.base_hp, s.base_atk, s.base_def, s.base_spa, s.base_spd, s.base_spe, s.remarks);
+
+INSERT INTO sv.pokemon (
+    pokedex_no, name_ja, name_en, form_label, type_primary, type_secondary,
+    height_dm, weight_hg, low_kick_power, is_legendary, is_mythical,
+    base_hp, base_atk, base_def, base_spa, base_spd, base_spe, remarks
+)
+SELECT s.pokedex_no, s.name_ja, s.name_en, s.form_label, s.type_primary, s.type_secondary,
+       s.height_dm, s.weight_hg, s.low_kick_power, s.is_legendary, s.is_mythical,
+       s.base_hp, s.base_atk, s.base_def, s.base_spa, s.base_spd, s.base_spe, s.remarks
+FROM stage_pokemon s
+WHERE NOT EXISTS (SELECT 1 FROM sv.pokemon p WHERE p.name_ja = s.name_ja);
+
+-- 3. 関連テーブルの差分適用（CSV上のIDをname_ja経由で本番IDに読み替える）
+\set QUIET on
+CREATE TEMP TABLE live_pokemon_abilities ON COMMIT DROP AS
+SELECT p.id AS pokemon_id, a.id AS ability_id, s.is_hidden
+FROM stage_pokemon_abilities s
+JOIN stage_pokemon sp ON sp.id = s.pokemon_id
+JOIN sv.pokemon p ON p.name_ja = sp.name_ja
+JOIN stage_abilities sa ON sa.id = s.ability_id
+JOIN sv.abilities a ON a.name_ja = sa.name_ja;
+
+CREATE TEMP TABLE live_pokemon_moves ON COMMIT DROP AS
+SELECT p.id AS pokemon_id, m.id AS move_id
+FROM stage_pokemon_moves s
+JOIN stage_pokemon sp ON sp.id = s.pokemon_id
+JOIN sv.pokemon p ON p.name_ja = sp.name_ja
+JOIN stage_moves sm ON sm.id = s.move_id
+JOIN sv.moves m ON m.name_ja = sm.name_ja;
+
+ALTER TABLE live_pokemon_abilities ADD PRIMARY KEY (pokemon_id, ability_id);
+ALTER TABLE live_pokemon_moves ADD PRIMARY KEY (pokemon_id, move_id);
+ANALYZE live_pokemon_abilities, live_pokemon_moves;
+\set QUIET off
+
+\echo '[pokemon_abilities]'
+DELETE FROM sv.pokemon_abilities pa
+WHERE NOT EXISTS (
+    SELECT 1 FROM live_pokemon_abilities l
+    WHERE l.pokemon_id = pa.pokemon_id AND l.ability_id = pa.ability_id
+);
+
+UPDATE sv.pokemon_abilities pa
+SET is_hidden = l.is_hidden
+FROM live_pokemon_abilities l
+WHERE l.pokemon_id = pa.pokemon_id
+  AND l.ability_id = pa.ability_id
+  AND pa.is_hidden IS DISTINCT FROM l.is_hidden;
+
+INSERT INTO sv.pokemon_abilities (pokemon_id, ability_id, is_hidden)
+SELECT l.pokemon_id, l.ability_id, l.is_hidden
+FROM live_pokemon_abilities l
+WHERE NOT EXISTS (
+    SELECT 1 FROM sv.pokemon_abilities pa
+    WHERE pa.pokemon_id = l.pokemon_id AND pa.ability_id = l.ability_id
+);
+
+\echo '[pokemon_moves]'
+DELETE FROM sv.pokemon_moves pm
+WHERE NOT EXISTS (
+    SELECT 1 FROM live_pokemon_moves l
+    WHERE l.pokemon_id = pm.pokemon_id AND l.move_id = pm.move_id
+);
+
+INSERT INTO sv.pokemon_moves (pokemon_id, move_id)
+SELECT l.pokemon_id, l.move_id
+FROM live_pokemon_moves l
+WHERE NOT EXISTS (
+    SELECT 1 FROM sv.pokemon_moves pm
+    WHERE pm.pokemon_id = l.pokemon_id AND pm.move_id = l.move_id
+);
+
+-- 4. スナップショットに存在しないマスタ行の削除（関連行はON DELETE CASCADEで削除）
+\echo '[削除: pokemon / moves / abilities]'
+DELETE FROM sv.pokemon p
+WHERE NOT EXISTS (SELECT 1 FROM stage_pokemon s WHERE s.name_ja = p.name_ja);
+
+DELETE FROM sv.moves m
+WHERE NOT EXISTS (SELECT 1 FROM stage_moves s WHERE s.name_ja = m.name_ja);
+
+DELETE FROM sv.abilities a
+WHERE NOT EXISTS (SELECT 1 FROM stage_abilities s WHERE s.name_ja = a.name_ja);
+
+-- 5. learnset の差分適用（move_set_hash で突き合わせ）
+\echo '[learnsets]'
+$learnsets_step
+
+-- 6. 効果タグの反映
+\echo '[effect_tags]'
+$effect_tags_step
+
+-- 7. 派生テーブルの再計算
+\echo '[再計算: speed_tiers / pokemon_search]'
+REFRESH MATERIALIZED VIEW sv.speed_tiers;
+REFRESH MATERIALIZED VIEW sv.pokemon_search;
+
+-- 8. データセットバージョンの更新（差分と同じトランザクションでコミットする）
+\echo '[データセットバージョン更新]'
+SELECT sv.bump_dataset_version();
+SQL
+
+    log_success "差分同期完了"
+}
+
+# ========================================
+# learnset の投入
+# ========================================
+# learnset のCSV（CSV生成ツールが常に出力する）がすべてあるか
+has_learnset_csvs() {
+    local table_name
+    for table_name in "${LEARNSET_TABLES[@]}"; do
+        [ -f "$CSV_DIR/$table_name.csv" ] || return 1
+    done
+}
+
+# 差分同期用のSQL（sync_tables のセッション内で stage_pokemon / stage_moves を参照する）。
+# 技の組の中身は move_set_hash で決まるため、既存の組は書き換えず、新しい組の追加・
+# ポケモンの割り当ての変更・どのポケモンからも参照されなくなった組の削除のみを行う。
+# CSVがない場合は sv.pokemon_moves から3テーブルを作り直す。
+learnsets_sync_sql() {
+    if ! has_learnset_csvs; then
+        echo "\\echo '（learnset のCSVがないため sv.pokemon_moves から作り直します）'"
+        echo "SELECT sv.refresh_learnsets();"
+        return
+    fi
+
+    cat <<SQL
+\set QUIET on
+CREATE TEMP TABLE stage_learnsets (LIKE sv.learnsets) ON COMMIT DROP;
+CREATE TEMP TABLE stage_learnset_moves (LIKE sv.learnset_moves) ON COMMIT DROP;
+CREATE TEMP TABLE stage_pokemon_learnsets (LIKE sv.pokemon_learnsets) ON COMMIT DROP;
+
+\copy stage_learnsets FROM '$CSV_DIR/learnsets.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+\copy stage_learnset_moves FROM '$CSV_DIR/learnset_moves.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+\copy stage_pokemon_learnsets FROM '$CSV_DIR/pokemon_learnsets.csv' WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')
+
+CREATE UNIQUE INDEX ON stage_learnsets (move_set_hash);
+CREATE INDEX ON stage_learnset_moves (learnset_id);
+ANALYZE stage_learnsets, stage_learnset_moves, stage_pokemon_learnsets;
+
+\o /dev/null
+SELECT setval(pg_get_serial_sequence('sv.learnsets', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM sv.learnsets;
+\o
+\set QUIET off
+
+-- 新しい技の組と、その技（CSV上の技IDを name_ja 経由で本番IDに読み替える）
+WITH added AS (
+    INSERT INTO sv.learnsets (move_set_hash, move_count)
+    SELECT s.move_set_hash, s.move_count
+    FROM stage_learnsets s
+    WHERE NOT EXISTS (SELECT 1 FROM sv.learnsets l WHERE l.move_set_hash = s.move_set_hash)
+    ORDER BY s.id
+    RETURNING id, move_set_hash
+)
+INSERT INTO sv.learnset_moves (learnset_id, move_id)
+SELECT a.id, m.id
+FROM added a
+JOIN stage_learnsets sl ON sl.move_set_hash = a.move_set_hash
+JOIN stage_learnset_moves s ON s.learnset_id = sl.id
+JOIN stage_moves sm ON sm.id = s.move_id
+JOIN sv.moves m ON m.name_ja = sm.name_ja;
+
+\set QUIET on
+CREATE TEMP TABLE live_pokemon_learnsets ON COMMIT DROP AS
+SELECT p.id AS pokemon_id, l.id AS learnset_id
+FROM stage_pokemon_learnsets s
+JOIN stage_pokemon sp ON sp.id = s.pokemon_id
+JOIN sv.pokemon p ON p.name_ja = sp.name_ja
+JOIN stage_learnsets sl ON sl.id = s.learnset_id
+JOIN sv.learnsets l ON l.move_set_hash = sl.move_set_hash;
+
+ALTER TABLE live_pokemon_learnsets ADD PRIMARY KEY (pokemon_id);
+ANALYZE live_pokemon_learnsets;
+\set QUIET off
+
+\echo '[pokemon_learnsets]'
+DELETE FROM sv.pokemon_learnsets pl
+WHERE NOT EXISTS (SELECT 1 FROM live_pokemon_learnsets l WHERE l.pokemon_id = pl.pokemon_id);
+
+UPDATE sv.pokemon_learnsets pl
+SET learnset_id = l.learnset_id
+FROM live_pokemon_learnsets l
+WHERE l.pokemon_id = pl.pokemon_id
+  AND pl.learnset_id <> l.learnset_id;
+
+INSERT INTO sv.pokemon_learnsets (pokemon_id, learnset_id)
+SELECT l.pokemon_id, l.learnset_id
+FROM live_pokemon_learnsets l
+WHERE NOT EXISTS (SELECT 1 FROM sv.pokemon_learnsets pl WHERE pl.pokemon_id = l.pokemon_id);
+
+-- どのポケモンからも参照されなくなった技の組（learnset_moves は ON DELETE CASCADE で削除）
+DELETE FROM sv.learnsets l
+WHERE NOT EXISTS (SELECT 1 FROM sv.pokemon_learnsets pl WHERE pl.learnset_id = l.id);
+SQL
+}
+
+# ========================================
+# 派生テーブルの再計算
+# ========================================
+# sv.pokemon などから算出するマテリアライズドビューを最新化する
+# （差分同期はsync_tables内で再計算）。learnset のCSVがなく投入できなかった場合は、
+# learnset の正規化テーブルを sv.pokemon_moves から作り直す。
+refresh_derived_tables() {
+    log_info "派生テーブルを再計算中..."
+
+    execute_sql "REFRESH MATERIALIZED VIEW sv.speed_tiers;"
+    execute_sql "REFRESH MATERIALIZED VIEW sv.pokemon_search;"
+    if ! has_learnset_csvs; then
+        log_warn "learnset のCSVがないため、sv.pokemon_moves から learnset を作り直します"
+        execute_sql "SELECT sv.refresh_learnsets();"
     fi
+    execute_sql "ANALYZE sv.speed_tiers, sv.pokemon_search, sv.learnsets, sv.learnset_moves, sv.pokemon_learnsets;"
 
-    log_success "データ整合性チェック完了"
+    log_success "派生テーブルの再計算完了"
+}
+
+# ========================================
+# データセットバージョン更新
+# ========================================
+# クエリサービスの結果キャッシュはこのバージョン単位で保持されるため、
+# データ投入の完了後に必ず実行する（差分同期はsync_tables内で更新）
+bump_dataset_version() {
+    log_info "データセットバージョンを更新中..."
+
+    local version
+    version=$(PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" \
+        -A -t -c "SELECT sv.bump_dataset_version();")
+
+    log_success "データセットバージョン: $version"
+}
+
+# ========================================
+# 投入件数の確認
+# ========================================
+# 外部キー・一意制約などの整合性は投入前の事前検証（app.csv_generator.validator）と
+# sv スキーマの制約で保証されるため、ここでは件数のみを確認する。
+verify_data() {
+    log_info "投入件数を確認中..."
+
+    local result
+    result=$(PGPASSWORD="$DB_PASSWORD" psql -h "$DB_HOST" -p "$DB_PORT" -U "$DB_USER" -d "$DB_NAME" -A -t -F '|' -c "
+        SELECT
+            (SELECT COUNT(*) FROM sv.abilities),
+            (SELECT COUNT(*) FROM sv.moves),
+            (SELECT COUNT(*) FROM sv.pokemon),
+            (SELECT COUNT(*) FROM sv.pokemon_abilities),
+            (SELECT COUNT(*) FROM sv.pokemon_moves),
+            (SELECT COUNT(*) FROM sv.learnsets),
+            (SELECT COUNT(*) FROM sv.learnset_moves);
+    ")
+
+    local abilities_count moves_count pokemon_count pokemon_abilities_count pokemon_moves_count
+    local learnsets_count learnset_moves_count
+    IFS='|' read -r abilities_count moves_count pokemon_count pokemon_abilities_count \
+        pokemon_moves_count learnsets_count learnset_moves_count <<< "$result"
+
+    log_info "テーブルレコード数:"
+    echo "  - abilities: $abilities_count 件"
+    echo "  - moves: $moves_count 件"
+    echo "  - pokemon: $pokemon_count 件"
+    echo "  - pokemon_abilities: $pokemon_abilities_count 件"
+    echo "  - pokemon_moves: $pokemon_moves_count 件"
+    echo "  - learnsets: $learnsets_count 件（learnset_moves: $learnset_moves_count 件）"
 }
 
 # ========================================
@@ -313,6 +869,11 @@ main() {
     else
         echo "  環境: ローカル (Local)"
     fi
+    if [ "$IMPORT_MODE" = "sync" ]; then
+        echo "  モード: 差分同期 (Sync)"
+    elif [ "$IMPORT_MODE" = "bulk" ]; then
+        echo "  モード: 一括投入 (Bulk)"
+    fi
     echo "========================================"
     echo ""
 
@@ -320,7 +881,7 @@ main() {
     check_supabase_status
 
     # 本番環境の場合は最終確認
-    if [ "$ENVIRONMENT" = "remote" ]; then
+    if [ "$ENVIRONMENT" = "remote" ] && [ "$ASSUME_YES" != "true" ]; then
         echo ""
         log_warn "========================================="
         log_warn "⚠️  本番環境にデータを投入します ⚠️"
@@ -328,7 +889,8 @@ main() {
         log_warn "投入先: $DB_HOST"
         log_warn ""
         log_warn "続行しますか? 'yes' と入力してください: "
-        read -r final_confirm
+        local final_confirm=""
+        read -r final_confirm || true
 
         if [ "$final_confirm" != "yes" ]; then
             log_info "処理をキャンセルしました"
@@ -337,18 +899,63 @@ main() {
         echo ""
     fi
 
-    clear_tables
+    if [ "$IMPORT_MODE" = "sync" ]; then
+        echo ""
+        sync_tables
+    elif [ "$IMPORT_MODE" = "bulk" ]; then
+        clear_tables
 
-    echo ""
-    log_info "CSVファイルをインポート中..."
-    echo ""
+        echo ""
+        prepare_bulk_load
+
+        echo ""
+        log_info "CSVファイルを並列インポート中..."
+        echo ""
+
+        # 外部キーを外しているため、マスタ同士・関連同士はそれぞれ並列に投入できる
+        if has_learnset_csvs; then
+            import_csv_parallel "abilities" "moves" "pokemon" "learnsets"
+            import_csv_parallel "pokemon_abilities" "pokemon_moves" "learnset_moves" \
+                "pokemon_learnsets"
+        else
+            import_csv_parallel "abilities" "moves" "pokemon"
+            import_csv_parallel "pokemon_abilities" "pokemon_moves"
+        fi
+
+        # GINインデックスの再作成前に反映する
+        echo ""
+        apply_effect_tags
 
-    # マスタテーブルから順番にインポート
-    import_csv "abilities" "abilities.csv"
-    import_csv "moves" "moves.csv"
-    import_csv "pokemon" "pokemon.csv"
-    import_csv "pokemon_abilities" "pokemon_abilities.csv"
-    import_csv "pokemon_moves" "pokemon_moves.csv"
+        echo ""
+        rebuild_bulk_ddl
+    else
+        clear_tables
+
+        echo ""
+        log_info "CSVファイルをインポート中..."
+        echo ""
+
+        # マスタテーブルから順番にインポート
+        import_csv "abilities" "abilities.csv"
+        import_csv "moves" "moves.csv"
+        import_csv "pokemon" "pokemon.csv"
+        import_csv "pokemon_abilities" "pokemon_abilities.csv"
+        import_csv "pokemon_moves" "pokemon_moves.csv"
+        if has_learnset_csvs; then
+            for table_name in "${LEARNSET_TABLES[@]}"; do
+                import_csv "$table_name" "$table_name.csv"
+            done
+        fi
+
+        echo ""
+        apply_effect_tags
+    fi
+
+    if [ "$IMPORT_MODE" != "sync" ]; then
+        echo ""
+        refresh_derived_tables
+        bump_dataset_version
+    fi
 
     echo ""
     verify_data
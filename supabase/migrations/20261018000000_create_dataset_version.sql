@@ -0,0 +1,34 @@
+-- データセットバージョンの管理
+-- import_to_supabase.sh の投入完了ごとにバージョンを進め、
+-- クエリサービス（app/query/service.py）の結果キャッシュを無効化する
+
+CREATE TABLE sv.dataset_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    CONSTRAINT chk_dataset_version_single_row CHECK (id)
+);
+
+INSERT INTO sv.dataset_version DEFAULT VALUES;
+
+-- バージョンを1進め、LISTEN中のクライアントへ新しいバージョンを通知する
+-- （NOTIFYはトランザクションのコミット時に配信される）
+CREATE OR REPLACE FUNCTION sv.bump_dataset_version()
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE sv.dataset_version
+    SET version = version + 1,
+        updated_at = now()
+    RETURNING version INTO new_version;
+
+    PERFORM pg_notify('sv_dataset_version', new_version::text);
+    RETURN new_version;
+END;
+$$;
+
+COMMENT ON TABLE sv.dataset_version IS 'データセットバージョン（データ投入ごとに加算、1行のみ）';
+COMMENT ON FUNCTION sv.bump_dataset_version() IS 'データセットバージョンを進めて sv_dataset_version チャネルへ通知';
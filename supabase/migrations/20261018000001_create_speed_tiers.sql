@@ -0,0 +1,38 @@
+-- 素早さ順（スピードティア）表
+-- レベル50における素早さプリセットごとの実数値を事前計算する
+-- プリセット定義は app/battle/stats.py の SPEED_PRESETS と同じ
+--
+-- 実数値 = floor((floor((2 × 種族値 + 個体値 + floor(努力値 / 4)) × 50 / 100) + 5) × 性格補正)
+-- スカーフ = floor(実数値 × 1.5)
+-- （整数同士の除算は切り捨てのため、補正は10倍した整数で計算する）
+--
+-- sv.pokemon から算出するため、差分同期（ID維持）でもIDの整合性が保たれる。
+-- データ投入後に import_to_supabase.sh が REFRESH する。
+
+CREATE MATERIALIZED VIEW sv.speed_tiers AS
+WITH presets (preset, iv, ev, nature_tenths, item_tenths) AS (
+    VALUES
+        ('fastest', 31, 252, 11, 10),
+        ('max', 31, 252, 10, 10),
+        ('neutral', 31, 0, 10, 10),
+        ('slowest', 0, 0, 9, 10),
+        ('fastest_scarf', 31, 252, 11, 15),
+        ('max_scarf', 31, 252, 10, 15)
+)
+SELECT
+    p.id AS pokemon_id,
+    pr.preset::VARCHAR(16) AS preset,
+    (
+        ((2 * p.base_spe + pr.iv + pr.ev / 4) * 50 / 100 + 5)
+        * pr.nature_tenths / 10
+        * pr.item_tenths / 10
+    )::SMALLINT AS speed
+FROM sv.pokemon p
+CROSS JOIN presets pr;
+
+CREATE UNIQUE INDEX idx_speed_tiers_pokemon_preset ON sv.speed_tiers(pokemon_id, preset);
+
+-- 「プリセットXで素早さN以上」の範囲検索用
+CREATE INDEX idx_speed_tiers_preset_speed ON sv.speed_tiers(preset, speed DESC);
+
+COMMENT ON MATERIALIZED VIEW sv.speed_tiers IS '素早さ順表（レベル50、プリセット別の素早さ実数値）';
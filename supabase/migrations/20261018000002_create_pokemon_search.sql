@@ -0,0 +1,69 @@
+-- ポケモン検索用の非正規化テーブル
+-- タイプ・覚える技・特性を配列カラムにまとめ、GINインデックスで検索する
+-- 「ドラゴンタイプ・伝説以外・りゅうのまい を覚える」のような複合条件を
+-- pokemon_moves / pokemon_abilities とのJOINなしに1回のインデックス走査で絞り込む
+--
+-- データ投入後に import_to_supabase.sh が REFRESH する。
+
+-- ========================================
+-- 1. マテリアライズドビュー作成
+-- ========================================
+CREATE MATERIALIZED VIEW sv.pokemon_search AS
+SELECT
+    p.id AS pokemon_id,
+    p.pokedex_no,
+    p.name_ja,
+    ARRAY_REMOVE(ARRAY[p.type_primary, p.type_secondary], NULL)::TEXT[] AS types,
+    COALESCE(pm.move_ids, '{}') AS move_ids,
+    COALESCE(pa.ability_ids, '{}') AS ability_ids,
+    COALESCE(pa.normal_ability_ids, '{}') AS normal_ability_ids,
+    COALESCE(pa.hidden_ability_ids, '{}') AS hidden_ability_ids,
+    COALESCE(p.is_legendary, FALSE) AS is_legendary,
+    COALESCE(p.is_mythical, FALSE) AS is_mythical,
+    p.height_dm,
+    p.weight_hg,
+    p.base_hp,
+    p.base_atk,
+    p.base_def,
+    p.base_spa,
+    p.base_spd,
+    p.base_spe,
+    (p.base_hp + p.base_atk + p.base_def + p.base_spa + p.base_spd + p.base_spe)::SMALLINT
+        AS base_total
+FROM sv.pokemon p
+LEFT JOIN LATERAL (
+    SELECT ARRAY_AGG(m.move_id ORDER BY m.move_id) AS move_ids
+    FROM sv.pokemon_moves m
+    WHERE m.pokemon_id = p.id
+) pm ON TRUE
+LEFT JOIN LATERAL (
+    SELECT
+        ARRAY_AGG(a.ability_id ORDER BY a.ability_id) AS ability_ids,
+        ARRAY_AGG(a.ability_id ORDER BY a.ability_id) FILTER (WHERE NOT a.is_hidden)
+            AS normal_ability_ids,
+        ARRAY_AGG(a.ability_id ORDER BY a.ability_id) FILTER (WHERE a.is_hidden)
+            AS hidden_ability_ids
+    FROM sv.pokemon_abilities a
+    WHERE a.pokemon_id = p.id
+) pa ON TRUE;
+
+-- ========================================
+-- 2. インデックス作成
+-- ========================================
+
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY に必要な一意インデックス
+CREATE UNIQUE INDEX idx_pokemon_search_pokemon_id ON sv.pokemon_search(pokemon_id);
+
+-- 配列の包含（@>）・重なり（&&）検索用
+CREATE INDEX idx_pokemon_search_types ON sv.pokemon_search USING GIN (types);
+CREATE INDEX idx_pokemon_search_move_ids ON sv.pokemon_search USING GIN (move_ids);
+CREATE INDEX idx_pokemon_search_ability_ids ON sv.pokemon_search USING GIN (ability_ids);
+
+-- 種族値の範囲検索用
+CREATE INDEX idx_pokemon_search_base_spe ON sv.pokemon_search(base_spe);
+CREATE INDEX idx_pokemon_search_base_total ON sv.pokemon_search(base_total);
+
+-- ========================================
+-- 3. コメント追加
+-- ========================================
+COMMENT ON MATERIALIZED VIEW sv.pokemon_search IS 'ポケモン検索用の非正規化ビュー（タイプ・技・特性を配列で保持）';
@@ -0,0 +1,92 @@
+-- 覚える技の組（learnset）の正規化レイアウト
+-- フォーム違い・リージョンフォームは覚える技がまったく同じことが多いため、
+-- 同じ技の組を1つの learnset にまとめ、各ポケモンは learnset を参照する。
+--
+-- learnset は技の名前（name_ja）をコードポイント順に改行で連結した文字列の MD5
+-- （move_set_hash）で識別する。CSV生成ツール（CSVBuilder.generate_learnset_csvs）と
+-- 同じ値になり、差分同期で技のIDが変わっても同じ技の組なら同じハッシュになる。
+--
+-- sv.pokemon_moves はそのまま残し、learnset の3テーブルは import_to_supabase.sh が
+-- CSV生成ツールの learnsets.csv などから投入する（差分同期では move_set_hash で
+-- 突き合わせて差分のみ反映）。CSVがない場合は sv.refresh_learnsets() で作り直す。
+-- sv.learnset_pokemon_moves ビューは sv.pokemon_moves と同じ形（pokemon_id, move_id）を返す。
+
+CREATE TABLE sv.learnsets (
+    id SERIAL PRIMARY KEY,
+    move_set_hash CHAR(32) NOT NULL UNIQUE,
+    move_count SMALLINT NOT NULL
+);
+
+CREATE TABLE sv.learnset_moves (
+    learnset_id INTEGER NOT NULL REFERENCES sv.learnsets(id) ON DELETE CASCADE,
+    move_id INTEGER NOT NULL REFERENCES sv.moves(id) ON DELETE CASCADE,
+    PRIMARY KEY (learnset_id, move_id)
+);
+
+CREATE TABLE sv.pokemon_learnsets (
+    pokemon_id INTEGER PRIMARY KEY REFERENCES sv.pokemon(id) ON DELETE CASCADE,
+    learnset_id INTEGER NOT NULL REFERENCES sv.learnsets(id) ON DELETE CASCADE
+);
+
+-- 「技Xを覚えるポケモン」の逆引き用
+CREATE INDEX idx_learnset_moves_move_id ON sv.learnset_moves(move_id, learnset_id);
+CREATE INDEX idx_pokemon_learnsets_learnset_id ON sv.pokemon_learnsets(learnset_id, pokemon_id);
+
+-- sv.pokemon_moves と同じ形の互換ビュー
+CREATE VIEW sv.learnset_pokemon_moves AS
+SELECT pl.pokemon_id, lm.move_id
+FROM sv.pokemon_learnsets pl
+JOIN sv.learnset_moves lm ON lm.learnset_id = pl.learnset_id;
+
+-- sv.pokemon_moves から learnset の3テーブルを作り直す
+-- （learnset のIDは、その技の組を持つ最小のポケモンIDの順に振る）
+CREATE OR REPLACE FUNCTION sv.refresh_learnsets()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    learnset_count INTEGER;
+BEGIN
+    DROP TABLE IF EXISTS pg_temp.pokemon_move_sets;
+    CREATE TEMP TABLE pokemon_move_sets ON COMMIT DROP AS
+    SELECT
+        pm.pokemon_id,
+        md5(string_agg(m.name_ja, E'\n' ORDER BY m.name_ja COLLATE "C"))::CHAR(32) AS move_set_hash,
+        COUNT(*)::SMALLINT AS move_count
+    FROM sv.pokemon_moves pm
+    JOIN sv.moves m ON m.id = pm.move_id
+    GROUP BY pm.pokemon_id;
+
+    TRUNCATE sv.pokemon_learnsets, sv.learnset_moves, sv.learnsets RESTART IDENTITY;
+
+    INSERT INTO sv.learnsets (move_set_hash, move_count)
+    SELECT move_set_hash, move_count
+    FROM pokemon_move_sets
+    GROUP BY move_set_hash, move_count
+    ORDER BY MIN(pokemon_id);
+    GET DIAGNOSTICS learnset_count = ROW_COUNT;
+
+    INSERT INTO sv.pokemon_learnsets (pokemon_id, learnset_id)
+    SELECT s.pokemon_id, l.id
+    FROM pokemon_move_sets s
+    JOIN sv.learnsets l ON l.move_set_hash = s.move_set_hash;
+
+    -- learnset ごとに代表のポケモン（最小ID）の技を登録する
+    INSERT INTO sv.learnset_moves (learnset_id, move_id)
+    SELECT r.learnset_id, pm.move_id
+    FROM (
+        SELECT learnset_id, MIN(pokemon_id) AS pokemon_id
+        FROM sv.pokemon_learnsets
+        GROUP BY learnset_id
+    ) r
+    JOIN sv.pokemon_moves pm ON pm.pokemon_id = r.pokemon_id;
+
+    RETURN learnset_count;
+END;
+$$;
+
+COMMENT ON TABLE sv.learnsets IS '覚える技の組（技の名前の組のMD5で識別）';
+COMMENT ON TABLE sv.learnset_moves IS 'learnset-技の関連';
+COMMENT ON TABLE sv.pokemon_learnsets IS 'ポケモン-learnsetの関連（1匹につき1つ）';
+COMMENT ON VIEW sv.learnset_pokemon_moves IS 'learnset経由のポケモン-技の関連（sv.pokemon_movesと同じ形）';
+COMMENT ON FUNCTION sv.refresh_learnsets() IS 'sv.pokemon_movesからlearnsetの3テーブルを作り直し、learnset数を返す';
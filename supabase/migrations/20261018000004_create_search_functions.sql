@@ -0,0 +1,356 @@
+-- サーバー側の検索関数
+-- クライアントが sv.pokemon / sv.pokemon_moves / sv.moves への問い合わせを順に発行して
+-- 組み立てていた検索を、1回の呼び出し（Supabase の RPC 1回）で完結させる。
+--
+-- いずれも本体が1つの SELECT の LANGUAGE sql・STABLE・非 STRICT の関数のため、
+-- FROM 句から呼び出すとプランナーが呼び出し元のクエリにインライン展開する。
+-- 引数が定数の場合は未指定の条件（filters ? 'moves' が偽の分岐など）が計画時に消え、
+-- sv.pokemon_search の GIN インデックス・B-tree インデックスがそのまま使われる。
+-- 書き込みを行わないため PARALLEL SAFE とする。
+
+-- ========================================
+-- 1. sv.search_pokemon(filters)
+-- ========================================
+-- filters（すべて省略可能、各条件は AND で結合）:
+--   moves              全て覚える技の名前の配列（未知の技名が含まれる場合は0件）
+--   abilities          いずれかを持つ特性の名前の配列
+--   hidden_ability     true で夢特性のみ、false で通常特性のみ（abilities 指定時のみ有効）
+--   types              全て持つタイプの配列（2つ指定で複合タイプ）
+--   stats              {"base_spe": {"min": 102}, "base_total": {"max": 500}} の形の範囲（両端を含む）
+--                      pokedex_no, base_hp〜base_spe, base_total, height_dm, weight_hg を指定可能
+--   include_legendary  false で伝説のポケモンを除く（既定 true）
+--   include_mythical   false で幻のポケモンを除く（既定 true）
+--   limit              最大件数
+-- 上記以外のキーは無視する。app/query/service.py の PokemonSearch と同じ条件を表す。
+--
+-- 例: SELECT * FROM sv.search_pokemon('{"moves": ["りゅうのまい"], "types": ["ドラゴン"],
+--         "stats": {"base_spe": {"min": 80}}, "include_legendary": false}');
+CREATE OR REPLACE FUNCTION sv.search_pokemon(filters JSONB DEFAULT '{}')
+RETURNS TABLE (
+    id INTEGER,
+    pokedex_no INTEGER,
+    name_ja VARCHAR(64),
+    name_en VARCHAR(64),
+    form_label VARCHAR(64),
+    type_primary VARCHAR(16),
+    type_secondary VARCHAR(16),
+    height_dm SMALLINT,
+    weight_hg SMALLINT,
+    low_kick_power SMALLINT,
+    is_legendary BOOLEAN,
+    is_mythical BOOLEAN,
+    base_hp SMALLINT,
+    base_atk SMALLINT,
+    base_def SMALLINT,
+    base_spa SMALLINT,
+    base_spd SMALLINT,
+    base_spe SMALLINT,
+    base_total SMALLINT,
+    abilities TEXT[],
+    hidden_abilities TEXT[]
+)
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$
+SELECT
+    p.id,
+    p.pokedex_no,
+    p.name_ja,
+    p.name_en,
+    p.form_label,
+    p.type_primary,
+    p.type_secondary,
+    p.height_dm,
+    p.weight_hg,
+    p.low_kick_power,
+    s.is_legendary,
+    s.is_mythical,
+    p.base_hp,
+    p.base_atk,
+    p.base_def,
+    p.base_spa,
+    p.base_spd,
+    p.base_spe,
+    s.base_total,
+    ARRAY(
+        SELECT a.name_ja::TEXT
+        FROM sv.abilities a
+        WHERE a.id = ANY(s.normal_ability_ids)
+        ORDER BY a.id
+    ),
+    ARRAY(
+        SELECT a.name_ja::TEXT
+        FROM sv.abilities a
+        WHERE a.id = ANY(s.hidden_ability_ids)
+        ORDER BY a.id
+    )
+FROM sv.pokemon_search s
+JOIN sv.pokemon p ON p.id = s.pokemon_id
+WHERE
+    (
+        NOT filters ? 'moves'
+        OR (
+            s.move_ids @> ARRAY(
+                SELECT m.id
+                FROM sv.moves m
+                WHERE m.name_ja = ANY(ARRAY(SELECT jsonb_array_elements_text(filters -> 'moves')))
+            )
+            -- 未知の技名が含まれる場合は0件にするため、解決できた技の数も照合する
+            AND (
+                SELECT COUNT(*)
+                FROM sv.moves m
+                WHERE m.name_ja = ANY(ARRAY(SELECT jsonb_array_elements_text(filters -> 'moves')))
+            ) = (
+                SELECT COUNT(DISTINCT name)
+                FROM jsonb_array_elements_text(filters -> 'moves') AS name
+            )
+        )
+    )
+    AND (
+        NOT filters ? 'abilities'
+        OR (
+            -- GINインデックスは ability_ids にのみあるため、夢特性の指定時も併記する
+            s.ability_ids && ARRAY(
+                SELECT a.id
+                FROM sv.abilities a
+                WHERE a.name_ja = ANY(ARRAY(SELECT jsonb_array_elements_text(filters -> 'abilities')))
+            )
+            AND CASE (filters ->> 'hidden_ability')::BOOLEAN
+                WHEN TRUE THEN s.hidden_ability_ids
+                WHEN FALSE THEN s.normal_ability_ids
+                ELSE s.ability_ids
+            END && ARRAY(
+                SELECT a.id
+                FROM sv.abilities a
+                WHERE a.name_ja = ANY(ARRAY(SELECT jsonb_array_elements_text(filters -> 'abilities')))
+            )
+        )
+    )
+    AND (
+        NOT filters ? 'types'
+        OR s.types @> ARRAY(SELECT jsonb_array_elements_text(filters -> 'types'))
+    )
+    AND (filters #> '{stats,pokedex_no,min}' IS NULL
+        OR s.pokedex_no >= (filters #>> '{stats,pokedex_no,min}')::INTEGER)
+    AND (filters #> '{stats,pokedex_no,max}' IS NULL
+        OR s.pokedex_no <= (filters #>> '{stats,pokedex_no,max}')::INTEGER)
+    AND (filters #> '{stats,base_hp,min}' IS NULL
+        OR s.base_hp >= (filters #>> '{stats,base_hp,min}')::INTEGER)
+    AND (filters #> '{stats,base_hp,max}' IS NULL
+        OR s.base_hp <= (filters #>> '{stats,base_hp,max}')::INTEGER)
+    AND (filters #> '{stats,base_atk,min}' IS NULL
+        OR s.base_atk >= (filters #>> '{stats,base_atk,min}')::INTEGER)
+    AND (filters #> '{stats,base_atk,max}' IS NULL
+        OR s.base_atk <= (filters #>> '{stats,base_atk,max}')::INTEGER)
+    AND (filters #> '{stats,base_def,min}' IS NULL
+        OR s.base_def >= (filters #>> '{stats,base_def,min}')::INTEGER)
+    AND (filters #> '{stats,base_def,max}' IS NULL
+        OR s.base_def <= (filters #>> '{stats,base_def,max}')::INTEGER)
+    AND (filters #> '{stats,base_spa,min}' IS NULL
+        OR s.base_spa >= (filters #>> '{stats,base_spa,min}')::INTEGER)
+    AND (filters #> '{stats,base_spa,max}' IS NULL
+        OR s.base_spa <= (filters #>> '{stats,base_spa,max}')::INTEGER)
+    AND (filters #> '{stats,base_spd,min}' IS NULL
+        OR s.base_spd >= (filters #>> '{stats,base_spd,min}')::INTEGER)
+    AND (filters #> '{stats,base_spd,max}' IS NULL
+        OR s.base_spd <= (filters #>> '{stats,base_spd,max}')::INTEGER)
+    AND (filters #> '{stats,base_spe,min}' IS NULL
+        OR s.base_spe >= (filters #>> '{stats,base_spe,min}')::INTEGER)
+    AND (filters #> '{stats,base_spe,max}' IS NULL
+        OR s.base_spe <= (filters #>> '{stats,base_spe,max}')::INTEGER)
+    AND (filters #> '{stats,base_total,min}' IS NULL
+        OR s.base_total >= (filters #>> '{stats,base_total,min}')::INTEGER)
+    AND (filters #> '{stats,base_total,max}' IS NULL
+        OR s.base_total <= (filters #>> '{stats,base_total,max}')::INTEGER)
+    AND (filters #> '{stats,height_dm,min}' IS NULL
+        OR s.height_dm >= (filters #>> '{stats,height_dm,min}')::INTEGER)
+    AND (filters #> '{stats,height_dm,max}' IS NULL
+        OR s.height_dm <= (filters #>> '{stats,height_dm,max}')::INTEGER)
+    AND (filters #> '{stats,weight_hg,min}' IS NULL
+        OR s.weight_hg >= (filters #>> '{stats,weight_hg,min}')::INTEGER)
+    AND (filters #> '{stats,weight_hg,max}' IS NULL
+        OR s.weight_hg <= (filters #>> '{stats,weight_hg,max}')::INTEGER)
+    AND (COALESCE((filters ->> 'include_legendary')::BOOLEAN, TRUE) OR NOT s.is_legendary)
+    AND (COALESCE((filters ->> 'include_mythical')::BOOLEAN, TRUE) OR NOT s.is_mythical)
+ORDER BY p.id
+LIMIT (filters ->> 'limit')::INTEGER
+$$;
+
+-- ========================================
+-- 2. sv.learners(move_names, match_all)
+-- ========================================
+-- 技を覚えるポケモンと、指定した技のうち覚えるもの（learned_moves）を返す。
+-- match_all が true（既定）の場合は全ての技を覚えるポケモン（未知の技名が含まれる場合は0件）、
+-- false の場合はいずれかの技を覚えるポケモン。
+--
+-- 例: SELECT * FROM sv.learners(ARRAY['トリックルーム', 'ねこだまし']);
+CREATE OR REPLACE FUNCTION sv.learners(move_names TEXT[], match_all BOOLEAN DEFAULT TRUE)
+RETURNS TABLE (
+    id INTEGER,
+    pokedex_no INTEGER,
+    name_ja VARCHAR(64),
+    form_label VARCHAR(64),
+    type_primary VARCHAR(16),
+    type_secondary VARCHAR(16),
+    is_legendary BOOLEAN,
+    is_mythical BOOLEAN,
+    base_hp SMALLINT,
+    base_atk SMALLINT,
+    base_def SMALLINT,
+    base_spa SMALLINT,
+    base_spd SMALLINT,
+    base_spe SMALLINT,
+    base_total SMALLINT,
+    learned_moves TEXT[]
+)
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$
+WITH requested AS (
+    SELECT m.id, m.name_ja
+    FROM sv.moves m
+    WHERE m.name_ja = ANY(move_names)
+)
+SELECT
+    p.id,
+    p.pokedex_no,
+    p.name_ja,
+    p.form_label,
+    p.type_primary,
+    p.type_secondary,
+    s.is_legendary,
+    s.is_mythical,
+    p.base_hp,
+    p.base_atk,
+    p.base_def,
+    p.base_spa,
+    p.base_spd,
+    p.base_spe,
+    s.base_total,
+    ARRAY(
+        SELECT r.name_ja::TEXT
+        FROM requested r
+        WHERE r.id = ANY(s.move_ids)
+        ORDER BY r.id
+    )
+FROM sv.pokemon_search s
+JOIN sv.pokemon p ON p.id = s.pokemon_id
+WHERE
+    (
+        match_all
+        AND cardinality(move_names) > 0
+        AND s.move_ids @> ARRAY(SELECT r.id FROM requested r)
+        AND (SELECT COUNT(*) FROM requested) = (
+            SELECT COUNT(DISTINCT name) FROM unnest(move_names) AS name
+        )
+    )
+    OR (
+        NOT match_all
+        AND s.move_ids && ARRAY(SELECT r.id FROM requested r)
+    )
+ORDER BY p.id
+$$;
+
+-- ========================================
+-- 3. sv.pokemon_detail(pokemon_name)
+-- ========================================
+-- ポケモン1匹の全カラムと、特性（効果・夢特性フラグ付き）・覚える技（タイプ・威力など付き）を
+-- JSONB 配列として1行で返す（ポケモン・特性・技の3回の問い合わせの代わり）。
+--
+-- 例: SELECT * FROM sv.pokemon_detail('ガブリアス');
+CREATE OR REPLACE FUNCTION sv.pokemon_detail(pokemon_name TEXT)
+RETURNS TABLE (
+    id INTEGER,
+    pokedex_no INTEGER,
+    name_ja VARCHAR(64),
+    name_en VARCHAR(64),
+    form_label VARCHAR(64),
+    type_primary VARCHAR(16),
+    type_secondary VARCHAR(16),
+    height_dm SMALLINT,
+    weight_hg SMALLINT,
+    low_kick_power SMALLINT,
+    is_legendary BOOLEAN,
+    is_mythical BOOLEAN,
+    base_hp SMALLINT,
+    base_atk SMALLINT,
+    base_def SMALLINT,
+    base_spa SMALLINT,
+    base_spd SMALLINT,
+    base_spe SMALLINT,
+    remarks TEXT,
+    abilities JSONB,
+    moves JSONB
+)
+LANGUAGE sql
+STABLE
+PARALLEL SAFE
+AS $$
+SELECT
+    p.id,
+    p.pokedex_no,
+    p.name_ja,
+    p.name_en,
+    p.form_label,
+    p.type_primary,
+    p.type_secondary,
+    p.height_dm,
+    p.weight_hg,
+    p.low_kick_power,
+    p.is_legendary,
+    p.is_mythical,
+    p.base_hp,
+    p.base_atk,
+    p.base_def,
+    p.base_spa,
+    p.base_spd,
+    p.base_spe,
+    p.remarks,
+    COALESCE(
+        (
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'name_ja', a.name_ja,
+                    'is_hidden', pa.is_hidden,
+                    'effect_text', a.effect_text
+                )
+                ORDER BY pa.is_hidden, a.id
+            )
+            FROM sv.pokemon_abilities pa
+            JOIN sv.abilities a ON a.id = pa.ability_id
+            WHERE pa.pokemon_id = p.id
+        ),
+        '[]'
+    ),
+    COALESCE(
+        (
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'name_ja', m.name_ja,
+                    'type_name', m.type_name,
+                    'damage_class', m.damage_class,
+                    'power', m.power,
+                    'accuracy', m.accuracy,
+                    'pp', m.pp,
+                    'priority', m.priority
+                )
+                ORDER BY m.id
+            )
+            FROM sv.pokemon_moves pm
+            JOIN sv.moves m ON m.id = pm.move_id
+            WHERE pm.pokemon_id = p.id
+        ),
+        '[]'
+    )
+FROM sv.pokemon p
+WHERE p.name_ja = pokemon_name
+$$;
+
+-- ========================================
+-- 4. コメント追加
+-- ========================================
+COMMENT ON FUNCTION sv.search_pokemon(JSONB) IS 'JSONBの条件でポケモンを検索し、特性名を含む行を返す（1回の呼び出しで完結）';
+COMMENT ON FUNCTION sv.learners(TEXT[], BOOLEAN) IS '技を全て（match_all=false でいずれかを）覚えるポケモンと覚える技';
+COMMENT ON FUNCTION sv.pokemon_detail(TEXT) IS 'ポケモン1匹の全カラムと特性・覚える技（JSONB配列）';
@@ -0,0 +1,34 @@
+-- 技・特性の効果説明（effect_text）の検索用インデックス
+--
+-- 1. 部分一致検索: pg_trgm のトライグラム GIN インデックス
+--    effect_text LIKE '%防御を%' のような部分一致（LIKE / ILIKE / 正規表現）を
+--    逐次走査ではなくインデックスで引く。日本語は単語の区切りがないため形態素解析を
+--    前提とする全文検索（to_tsvector）は使わず、文字単位のトライグラムで照合する。
+--    トライグラムは3文字単位のため、検索語が3文字以上の場合にインデックスが効く
+--    （1〜2文字の検索語はインデックス全体の走査になる）。
+--    日本語の文字をトライグラムの対象にするには、データベースの LC_CTYPE が
+--    UTF-8 のロケール（C.UTF-8 など）である必要がある。
+--
+-- 2. 構造化タグ: effect_tags 配列の GIN インデックス
+--    CSV生成ツール（app.csv_generator.effect_tags）が効果説明と優先度から抽出した
+--    「先制」「反動」「相手の防御ダウン」「まひ」などのタグを保持する。
+--    データ投入後に import_to_supabase.sh が effect_tags.csv から反映する。
+--    「相手の防御を下げる先制技」は effect_tags @> ARRAY['先制', '相手の防御ダウン'] で引ける。
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA extensions;
+
+ALTER TABLE sv.moves ADD COLUMN effect_tags TEXT[] NOT NULL DEFAULT '{}';
+ALTER TABLE sv.abilities ADD COLUMN effect_tags TEXT[] NOT NULL DEFAULT '{}';
+
+-- 効果説明の部分一致検索用
+CREATE INDEX idx_moves_effect_text_trgm
+    ON sv.moves USING gin (effect_text extensions.gin_trgm_ops);
+CREATE INDEX idx_abilities_effect_text_trgm
+    ON sv.abilities USING gin (effect_text extensions.gin_trgm_ops);
+
+-- 効果タグの包含検索（@>）・重なり検索（&&）用
+CREATE INDEX idx_moves_effect_tags ON sv.moves USING gin (effect_tags);
+CREATE INDEX idx_abilities_effect_tags ON sv.abilities USING gin (effect_tags);
+
+COMMENT ON COLUMN sv.moves.effect_tags IS '効果説明・優先度から抽出した効果タグ（先制・反動・相手の防御ダウンなど）';
+COMMENT ON COLUMN sv.abilities.effect_tags IS '効果説明から抽出した効果タグ（相手の攻撃ダウンなど）';
@@ -0,0 +1,18 @@
+-- sv.learnset_pokemon_moves の未投入時のフォールバック
+--
+-- learnset の3テーブルが空（learnset のCSVを投入する前のデータベースなど）の間は、
+-- 互換ビューが黙って0件を返さないよう sv.pokemon_moves をそのまま返す。
+-- 判定はテーブル全体に対する EXISTS のため実行計画では1回だけ評価され
+-- （One-Time Filter）、投入済みの場合に sv.pokemon_moves は走査されない。
+
+CREATE OR REPLACE VIEW sv.learnset_pokemon_moves AS
+SELECT pl.pokemon_id, lm.move_id
+FROM sv.pokemon_learnsets pl
+JOIN sv.learnset_moves lm ON lm.learnset_id = pl.learnset_id
+UNION ALL
+SELECT pm.pokemon_id, pm.move_id
+FROM sv.pokemon_moves pm
+WHERE NOT EXISTS (SELECT 1 FROM sv.pokemon_learnsets);
+
+COMMENT ON VIEW sv.learnset_pokemon_moves IS
+    'sv.pokemon_moves と同じ形 (pokemon_id, move_id)。learnset が未投入の間は sv.pokemon_moves を返す';
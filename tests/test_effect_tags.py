@@ -0,0 +1,89 @@
+"""app.csv_generator.effect_tags の効果タグ抽出のテスト.
+
+効果説明はポケモン徹底攻略（yakkun.com）の技・特性ページの表記に合わせる。
+
+Usage:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from app.csv_generator.effect_tags import extract_effect_tags
+
+# (効果説明, 優先度, 期待するタグ)
+CASES: tuple[tuple[str | None, int | None, tuple[str, ...]], ...] = (
+    # 優先度
+    ("優先度:+1の先制技。", 1, ("先制",)),
+    ("優先度:+2。必ず先制できる。", 2, ("先制",)),
+    ("優先度:-6。相手を交代させる。", -6, ("後攻",)),
+    (None, 1, ("先制",)),
+    ("通常攻撃。", 0, ()),
+    ("急所に当たりやすい。", 0, ()),
+    # 能力変化（『』で囲んだひらがな表記）
+    ("相手の『ぼうぎょ』ランクを1段階下げる。", 0, ("相手の防御ダウン",)),
+    (
+        "自分の『こうげき』『すばやさ』ランクが1段階ずつ上がる。",
+        0,
+        ("自分の攻撃アップ", "自分の素早さアップ"),
+    ),
+    (
+        "自分の『こうげき』と『ぼうぎょ』ランクが1段階ずつ下がる。",
+        0,
+        ("自分の攻撃ダウン", "自分の防御ダウン"),
+    ),
+    ("自分の『とくこう』ランクが2段階下がる。", 0, ("自分の特攻ダウン",)),
+    ("相手の『とくぼう』ランクを2段階下げる。", 0, ("相手の特防ダウン",)),
+    ("相手の『めいちゅうりつ』ランクを1段階下げる。", 0, ("相手の命中率ダウン",)),
+    ("自分の『かいひりつ』ランクを1段階上げる。", 0, ("自分の回避率アップ",)),
+    ("『こうげき』ランクを2段階上げる。", 0, ("自分の攻撃アップ",)),
+    ("優先度:+1。相手の『ぼうぎょ』ランクを1段階下げる。", 1, ("先制", "相手の防御ダウン")),
+    # 能力変化（漢字表記）と対象の引き継ぎ
+    ("自分の攻撃と防御を1段階下げる", 0, ("自分の攻撃ダウン", "自分の防御ダウン")),
+    ("攻撃・特攻を2段階上げる", 0, ("自分の攻撃アップ", "自分の特攻アップ")),
+    (
+        "自分の攻撃と防御を上げるが、素早さを下げる",
+        0,
+        ("自分の攻撃アップ", "自分の防御アップ", "自分の素早さダウン"),
+    ),
+    (
+        "自分の『こうげき』ランクを2段階上げるが、『ぼうぎょ』ランクを1段階下げる。",
+        0,
+        ("自分の攻撃アップ", "自分の防御ダウン"),
+    ),
+    # 状態異常
+    ("10%の確率で相手を『まひ』状態にする。", 0, ("まひ",)),
+    ("10%の確率で相手を『やけど』状態にする。", 0, ("やけど",)),
+    ("30%の確率で相手を『どく』状態にする。", 0, ("どく",)),
+    ("相手を『もうどく』状態にする。", 0, ("もうどく",)),
+    ("相手を『ねむり』状態にする。", 0, ("ねむり",)),
+    ("10%の確率で相手を『こおり』状態にする。", 0, ("こおり",)),
+    ("相手を『こんらん』状態にする。", 0, ("こんらん",)),
+    ("相手をまひ状態にする", 0, ("まひ",)),
+    # ひるみ・反動・吸収・回復
+    ("30%の確率で相手をひるませる。", 0, ("ひるみ",)),
+    ("与えたダメージの1/3を自分も受ける。", 0, ("反動",)),
+    ("反動ダメージを受ける", 0, ("反動",)),
+    ("与えたダメージの半分だけHPを回復する。", 0, ("吸収",)),
+    ("自分の最大HPの半分だけHPを回復する。", 0, ("回復",)),
+    # 特性
+    ("戦闘に出た時、相手の『こうげき』ランクを1段階下げる。", None, ("相手の攻撃ダウン",)),
+    (
+        "物理技を受けると『ぼうぎょ』ランクが1段階下がり、『すばやさ』ランクが2段階上がる。",
+        None,
+        ("自分の防御ダウン", "自分の素早さアップ"),
+    ),
+)
+
+
+class ExtractEffectTagsTest(unittest.TestCase):
+    """extract_effect_tags() のテスト."""
+
+    def test_cases(self) -> None:
+        """効果説明の表記ごとに期待するタグを返す."""
+        for effect_text, priority, expected in CASES:
+            with self.subTest(effect_text=effect_text, priority=priority):
+                self.assertEqual(extract_effect_tags(effect_text, priority), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""app.battle.team_search のチーム探索のテスト.
+
+合成データ（app.benchmark.synthetic）から組み立てたテーブルで探索する。
+
+Usage:
+    python -m unittest discover tests
+"""
+
+import importlib.util
+import time
+import unittest
+from typing import Any
+
+from app.benchmark.synthetic import SyntheticSpec, iter_bundles
+
+# TeamSearch は numpy（uv sync --extra analysis）が必要
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+# 1,500匹・全ポケモンを脅威とする k=3 の探索時間の上限（秒）
+TIME_LIMIT = 10.0
+
+
+def synthetic_tables(pokemon: int, seed: int = 1) -> dict[str, list[tuple[Any, ...]]]:
+    """合成データを tables.py の形式（テーブル名 -> 行タプルのリスト）にする."""
+    pokemon_rows: list[tuple[Any, ...]] = []
+    move_rows: dict[str, tuple[Any, ...]] = {}
+    pokemon_moves: list[tuple[int, int]] = []
+    for pokemon_id, bundle in enumerate(iter_bundles(SyntheticSpec(pokemon, seed=seed)), 1):
+        row = bundle["pokemon"]
+        pokemon_rows.append(
+            (
+                pokemon_id,
+                row["pokedex_no"],
+                row["name_ja"],
+                row["name_en"],
+                row["form_label"],
+                row["type_primary"],
+                row["type_secondary"],
+                row["height_dm"],
+                row["weight_hg"],
+                row["low_kick_power"],
+                row["is_legendary"],
+                row["is_mythical"],
+                row["base_hp"],
+                row["base_atk"],
+                row["base_def"],
+                row["base_spa"],
+                row["base_spd"],
+                row["base_spe"],
+                row["remarks"],
+            )
+        )
+        for move in bundle["moves"]:
+            if move["name_ja"] not in move_rows:
+                move_rows[move["name_ja"]] = (
+                    len(move_rows) + 1,
+                    move["name_ja"],
+                    move["type_name"],
+                    move["damage_class"],
+                    move["power"],
+                    move["accuracy"],
+                    move["pp"],
+                    move["priority"],
+                    move["effect_text"],
+                )
+            pokemon_moves.append((pokemon_id, move_rows[move["name_ja"]][0]))
+    return {
+        "abilities": [],
+        "moves": list(move_rows.values()),
+        "pokemon": pokemon_rows,
+        "pokemon_abilities": [],
+        "pokemon_moves": pokemon_moves,
+    }
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy がインストールされていません")
+class BestTeamsTest(unittest.TestCase):
+    """best_teams() の上位 k 件の探索."""
+
+    def test_top_three_teams_within_time_limit(self) -> None:
+        """全ポケモンを脅威とする k=3 の探索が時間内に異なる3チームを返す."""
+        from app.battle.team_search import ANSWER, TeamSearch
+
+        search = TeamSearch(synthetic_tables(1500))
+
+        started = time.perf_counter()
+        teams = search.best_teams(k=3, coverage=ANSWER)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, TIME_LIMIT)
+        self.assertEqual(len(teams), 3)
+        self.assertEqual(len({frozenset(team.members) for team in teams}), 3)
+        self.assertEqual(
+            [team.covered for team in teams], sorted((team.covered for team in teams), reverse=True)
+        )
+        # 最良のチームの対応数は k=1 の探索と同じ
+        self.assertEqual(teams[0].covered, search.best_teams(k=1, coverage=ANSWER)[0].covered)
+
+    def test_parallel_search_matches_serial(self) -> None:
+        """複数プロセスの探索は1プロセスと同じチームを返す."""
+        from app.battle.team_search import ANSWER, TeamSearch
+
+        tables = synthetic_tables(200)
+        threats = [row[2] for row in tables["pokemon"][:60]]
+        search = TeamSearch(tables, threats=threats)
+
+        serial = search.best_teams(k=5, team_size=3, coverage=ANSWER)
+        parallel = search.best_teams(k=5, team_size=3, coverage=ANSWER, workers=2)
+
+        self.assertEqual(len(serial), 5)
+        self.assertEqual(parallel, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()